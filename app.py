@@ -1,16 +1,40 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from jira import JIRA
-import re
+from plotly.subplots import make_subplots
 from datetime import datetime
-from fpdf import FPDF
 import base64
+import os
+import sys
+import threading
+
+# Módulos compartilhados com a API (backend/)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+from normalize import SOURCE_COLUMN, normalize_issues
+from sources import fetch_sources, sources_from_config
+from issue_table import compact_issue_table
+from filter_index import FilterIndex
+from periods import ALL_TIME, CUSTOM_PERIOD, PERIOD_PRESETS, period_days, period_range
+from flow_cube import FlowCube, burnup_points, monthly_velocity
+from sort_index import SortIndex
+from export import EXPORT_MEDIA_TYPES, REPORT_COLUMNS, WRITERS, cached_export, export_path, write_pdf
+from jobs import JobQueue
+from snapshot import snapshot_path, save_snapshot, load_snapshot
+from transitions import compact_transitions, status_transitions
+from tab_metrics import assignee_load, delay_matrix, sidebar_masks, status_grid, with_derived_columns
+from status_flow import chart_days, cumulative_flow, flow_window, status_intervals, time_in_status
+from render_profiler import RenderProfiler
 
 # --- Configuração da Página ---
 st.set_page_config(page_title="Gestão de Projetos & Eficiência", layout="wide", page_icon="📈")
 
+# Perfil de renderização (opcional): ?profile=1 na URL ou DASHBOARD_PROFILE=1 no ambiente
+perfil = RenderProfiler(
+    st.query_params.get('profile') in ('1', 'true') or os.environ.get('DASHBOARD_PROFILE') == '1'
+)
+
 # --- Custom CSS (Modern Enterprise SaaS Theme) ---
 st.markdown("""
 <!-- Tailwind CDN & Config -->
@@ -159,11 +183,20 @@ st.markdown("""
 # --- Configurações do Jira ---
 # Credenciais movidas para .streamlit/secrets.toml
 
+# Snapshot local (Arrow) usado para partidas rápidas após restart/deploy
+SNAPSHOT_PATH = snapshot_path("streamlit_issues")
+# Transições de status (fontes com `changelog = true`), gravadas junto com o snapshot
+TRANSICOES_PATH = snapshot_path("streamlit_transitions")
+
+# Projetos por figura na grade "Status Detalhado por Projeto" (páginas de 10 linhas x 2 colunas)
+PROJETOS_POR_PAGINA = 20
+
 # --- Função de Carregamento de Dados do Jira ---
 @st.cache_data(ttl=3600) # Cache de 1 hora
 def load_data_jira():
     try:
-        jira = JIRA(server=st.secrets["jira"]["url"], basic_auth=(st.secrets["jira"]["username"], st.secrets["jira"]["token"]))
+        # Fontes Jira ([jira] ou [[jira_sources]] nos secrets), cada uma com seu cliente assíncrono compartilhado
+        fontes = sources_from_config(st.secrets.to_dict())
         
         # JQL Query: Busca tickets ABERTOS (sem limite de data) e FECHADOS (últimos 2 anos)
         jql = 'statusCategory != Done OR created >= -730d ORDER BY created DESC'
@@ -171,77 +204,121 @@ def load_data_jira():
         # Adicionado campos extras para o novo dashboard
         fields = "summary,assignee,status,created,project,customfield_10031,customfield_10020,duedate,priority,issuetype,resolutiondate,updated,timeoriginalestimate,timespent,components,labels"
         
-        # maxResults=0 garante retorno de TODOS os tickets (bypass paginação padrão)
-        issues = jira.search_issues(jql, maxResults=0, fields=fields)
+        # Busca paginada concorrente de todas as fontes ao mesmo tempo (tempo total = fonte mais lenta)
+        resultados = fetch_sources(fontes, lambda fonte: jql, fields)
+        falhas = {nome: erro for nome, erro in resultados.items() if isinstance(erro, Exception)}
+        if len(falhas) == len(fontes):
+            raise next(iter(falhas.values()))
+        for nome, erro in falhas.items():
+            print(f"Erro ao buscar a fonte {nome}: {erro}")
         
-        data = []
-        for issue in issues:
-            # Extração segura de campos
-            assignee = issue.fields.assignee.displayName if issue.fields.assignee else 'Não Atribuído'
-            story_points = getattr(issue.fields, 'customfield_10031', 0)
-            if story_points is None: story_points = 0
-            
-            # Parsing de Sprint
-            sprint_raw = getattr(issue.fields, 'customfield_10020', None)
-            sprint_name = 'Backlog' # Default
-            if sprint_raw:
-                try:
-                    sprint_data = sprint_raw[0]
-                    if hasattr(sprint_data, 'name'):
-                        sprint_name = sprint_data.name
-                    else:
-                        match = re.search(r'name=([^,]+)', str(sprint_data))
-                        if match:
-                            sprint_name = match.group(1)
-                except Exception:
-                    pass
-            
-            # Tratamento de datas
-            created = pd.to_datetime(issue.fields.created).replace(tzinfo=None) if issue.fields.created else None
-            duedate = pd.to_datetime(issue.fields.duedate).replace(tzinfo=None) if issue.fields.duedate else None
-            resolutiondate = pd.to_datetime(issue.fields.resolutiondate).replace(tzinfo=None) if issue.fields.resolutiondate else None
-            updated = pd.to_datetime(issue.fields.updated).replace(tzinfo=None) if issue.fields.updated else None
-
-            # Campos adicionais
-            estimate = issue.fields.timeoriginalestimate if hasattr(issue.fields, 'timeoriginalestimate') and issue.fields.timeoriginalestimate else 0
-            spent = issue.fields.timespent if hasattr(issue.fields, 'timespent') and issue.fields.timespent else 0
-            
-            components = [c.name for c in issue.fields.components] if hasattr(issue.fields, 'components') and issue.fields.components else []
-            module = components[0] if components else 'Geral'
-            
-            labels = issue.fields.labels if hasattr(issue.fields, 'labels') and issue.fields.labels else []
-            client_tag = next((l for l in labels if l.startswith('CLI_')), 'Interno') # Exemplo de tag de cliente
-
-            data.append({
-                'Chave': issue.key,
-                'Resumo': issue.fields.summary,
-                'Responsável': assignee,
-                'Status': issue.fields.status.name,
-                'Tipo': issue.fields.issuetype.name,
-                'Prioridade': issue.fields.priority.name if hasattr(issue.fields, 'priority') and issue.fields.priority else 'Medium',
-                'Projeto': issue.fields.project.name,
-                'Criado': created,
-                'Resolvido': resolutiondate,
-                'Data Entrega': duedate,
-                'Atualizado': updated,
-                'Story Points': story_points,
-                'Sprint': sprint_name,
-                'Estimativa (s)': estimate,
-                'Tempo Gasto (s)': spent,
-                'Módulo': module,
-                'Cliente': client_tag,
-                'Labels': labels
-            })
-            
-        return pd.DataFrame(data)
+        # Normalização em lote direto do JSON (datas convertidas uma vez por coluna), com o mapeamento de campos de cada fonte
+        df = pd.concat([
+            normalize_issues(resultados[fonte['name']], field_map=fonte['fields']).assign(**{SOURCE_COLUMN: fonte['name']})
+            for fonte in fontes if fonte['name'] not in falhas
+        ], ignore_index=True).sort_values('Criado', ascending=False, ignore_index=True)
+        # Dimensões como categóricas (códigos inteiros): menos memória e filtros mais rápidos
+        df = compact_issue_table(df)
+        df.attrs['versao'] = datetime.now().isoformat()
+        
+        # Histórico de status (expand=changelog) das fontes que o ingerem: tabela compacta de transições
+        transicoes = [status_transitions(resultados[fonte['name']], fonte['name'])
+                      for fonte in fontes if fonte['changelog'] and fonte['name'] not in falhas]
+        try:
+            save_snapshot(df, SNAPSHOT_PATH, last_sync=datetime.now())
+            if transicoes:
+                save_snapshot(compact_transitions(pd.concat(transicoes, ignore_index=True)), TRANSICOES_PATH,
+                              last_sync=datetime.now())
+            elif os.path.exists(TRANSICOES_PATH):
+                os.remove(TRANSICOES_PATH)  # Nenhuma fonte com changelog: histórico antigo não vale mais
+        except Exception as e:
+            print(f"Erro ao salvar snapshot: {e}")
+        return df
         
     except Exception as e:
         st.error(f"Erro ao conectar ao Jira: {e}")
         return pd.DataFrame()
 
+@st.cache_resource
+def iniciar_atualizacao_background():
+    # Executado uma vez por processo: busca o Jira (e aquece o cache) sem bloquear a primeira renderização
+    thread = threading.Thread(target=load_data_jira, daemon=True)
+    thread.start()
+    return thread
+
+@st.cache_resource(max_entries=1)
+def ler_snapshot(caminho, mtime):
+    # Decodificado uma vez por arquivo gravado (mtime), não a cada rerun enquanto a thread consulta o Jira
+    snapshot = load_snapshot(caminho)
+    if snapshot is not None:
+        snapshot['data'].attrs['versao'] = snapshot['last_sync'].isoformat()
+    return snapshot
+
+def carregar_dados():
+    atualizacao = iniciar_atualizacao_background()
+    if atualizacao.is_alive():
+        # Warm start: enquanto o Jira é consultado, servir o último snapshot salvo em disco
+        snapshot = ler_snapshot(SNAPSHOT_PATH, os.path.getmtime(SNAPSHOT_PATH)) if os.path.exists(SNAPSHOT_PATH) else None
+        if snapshot is not None:
+            st.toast(f"Exibindo snapshot de {snapshot['last_sync'].strftime('%d/%m %H:%M')} — atualizando em segundo plano")
+            return snapshot['data']
+        # Cold start sem snapshot: esperar a busca em andamento em vez de abrir uma segunda no Jira;
+        # o load_data_jira() abaixo então só lê o cache que a thread acabou de aquecer
+        atualizacao.join()
+    ler_snapshot.clear()  # Dados atualizados no cache: o snapshot decodificado não é mais servido
+    return load_data_jira()
+
+@st.cache_resource(max_entries=2)
+def obter_indice_filtros(_df, versao):
+    # `_df` não entra no hash do cache: a chave é a versão dos dados
+    return FilterIndex(_df)
+
+@st.cache_resource(max_entries=2)
+def obter_indice_ordenacao(_df, versao):
+    # Ordens de linhas pré-calculadas para a tabela paginada (Dados Detalhados)
+    return SortIndex(_df)
+
+@st.cache_resource
+def fila_relatorios():
+    # Um worker por processo para relatórios PDF; pedidos repetidos da mesma chave compartilham o job
+    return JobQueue(max_workers=1, name="relatorio-pdf")
+
+@st.cache_resource(max_entries=2)
+def obter_cubo_fluxo(_df, versao):
+    # Cubo diário (criados/entregues por Projeto x Tipo x Categoria), um por versão dos dados
+    return FlowCube(_df, status_concluidos)
+
+@st.cache_resource(max_entries=2)
+def obter_intervalos_status(_df, versao):
+    # Passagens por status (changelog) das issues das fontes com histórico; None se nenhuma fonte o ingere
+    snapshot = load_snapshot(TRANSICOES_PATH)
+    if snapshot is None:
+        return None
+    transicoes = snapshot['data']
+    intervalos = status_intervals(_df, transicoes, status_concluidos)
+    com_historico = _df[SOURCE_COLUMN].isin(transicoes[SOURCE_COLUMN].cat.categories).to_numpy()
+    return intervalos[com_historico[intervalos['issue'].to_numpy()]]
+
+@st.cache_resource(max_entries=8)
+def resultados_abas(versao, chave_filtros):
+    # Agregações e figuras das abas, preenchidas sob demanda, por versão dos dados + filtros
+    return {}
+
+def memo_aba(nome, calcular, *chave):
+    # calcular() só na primeira vez que a seção aparece com estes filtros (e `chave` extra, ex.: sprints escolhidas)
+    resultados = resultados_abas(df.attrs.get('versao'), chave_filtros)
+    if (nome, chave) not in resultados:
+        resultados[(nome, chave)] = calcular()
+    return resultados[(nome, chave)]
+
+def plotar(nome, fig, **kwargs):
+    # st.plotly_chart medido pelo perfil: montagem da figura, envio e tamanho do JSON
+    perfil.figure(nome, fig, lambda: st.plotly_chart(fig, **kwargs))
+
 # --- Carregamento Inicial ---
 with st.spinner('Conectando ao Jira e analisando dados...'):
-    df = load_data_jira()
+    df = carregar_dados()
+perfil.checkpoint("carregar_dados")
 
 if df.empty:
     st.warning("Nenhum dado encontrado ou erro na conexão.")
@@ -251,19 +328,12 @@ if df.empty:
 today = pd.to_datetime('today').normalize()
 status_concluidos = ['Concluído', 'Done', 'Finalizado', 'Closed', 'Resolvido']
 
-# 1. Identificar Atrasos
-def verificar_atraso(row):
-    if row['Status'] in status_concluidos:
-        return False
-    if pd.notnull(row['Data Entrega']) and row['Data Entrega'] < today:
-        return True
-    return False
-
-df['Atrasado'] = df.apply(verificar_atraso, axis=1)
+# 1. Atrasos e 2. Lead Time (dias corridos, 0 se aberta): backend/tab_metrics.py, medido pelos benchmarks
+df = with_derived_columns(df, status_concluidos, today)
 
-# 2. Calcular Lead Time (Dias Corridos)
-df['Lead Time'] = (df['Resolvido'] - df['Criado']).dt.days
-df['Lead Time'] = df['Lead Time'].fillna(0) # Para não quebrar cálculos, mas filtrar depois
+# Índice de filtros (bitmaps) construído uma vez por versão dos dados
+indice = obter_indice_filtros(df, df.attrs.get('versao'))
+perfil.checkpoint("colunas_derivadas")
 
 # --- Sidebar (Filtros Avançados) ---
 st.sidebar.image("https://upload.wikimedia.org/wikipedia/commons/thumb/8/8a/Jira_Logo.svg/1200px-Jira_Logo.svg.png", width=100)
@@ -271,27 +341,17 @@ st.sidebar.markdown("### 🔍 Filtros Avançados")
 
 # 1. Filtro de Tempo (Presets)
 with st.sidebar.expander("📅 Período de Análise", expanded=True):
-    periodo_opcao = st.selectbox("Preset de Tempo", ["Tudo", "Este Mês", "Mês Passado", "Último Trimestre", "Este Ano", "Personalizado"])
-    
-    today = datetime.today()
-    if periodo_opcao == "Este Mês":
-        start_date = today.replace(day=1)
-        end_date = today
-    elif periodo_opcao == "Mês Passado":
-        first = today.replace(day=1) - pd.DateOffset(months=1)
-        start_date = first
-        end_date = first + pd.DateOffset(months=1) - pd.DateOffset(days=1)
-    elif periodo_opcao == "Último Trimestre":
-        start_date = today - pd.DateOffset(months=3)
-        end_date = today
-    elif periodo_opcao == "Este Ano":
-        start_date = today.replace(month=1, day=1)
-        end_date = today
-    else:
+    periodo_opcao = st.selectbox("Preset de Tempo", PERIOD_PRESETS)
+    
+    # Mesmos presets da API (backend/periods.py); "Tudo" e "Personalizado" partem do intervalo dos dados
+    if periodo_opcao in (ALL_TIME, CUSTOM_PERIOD):
+        today = datetime.today()
         start_date = df['Criado'].min().date() if not df.empty else today.date()
         end_date = df['Criado'].max().date() if not df.empty else today.date()
+    else:
+        start_date, end_date = period_days(periodo_opcao)
     
-    if periodo_opcao == "Personalizado":
+    if periodo_opcao == CUSTOM_PERIOD:
         date_range = st.date_input("Intervalo de Datas", [start_date, end_date])
         if len(date_range) == 2:
             start_date, end_date = date_range
@@ -300,17 +360,21 @@ with st.sidebar.expander("📅 Período de Análise", expanded=True):
 
 # 2. Filtros Hierárquicos (Cliente -> Projeto -> Módulo)
 with st.sidebar.expander("🏢 Estrutura Organizacional", expanded=True):
+    # Fonte Jira (só aparece com mais de uma instância configurada)
+    fontes = sorted(df[SOURCE_COLUMN].unique()) if SOURCE_COLUMN in df.columns else []
+    sel_fontes = st.multiselect("Fonte Jira", fontes, default=fontes) if len(fontes) > 1 else fontes
+    
     # Cliente
     clientes = sorted(df['Cliente'].unique()) if 'Cliente' in df.columns else ['Interno']
     sel_clientes = st.multiselect("Cliente", clientes, default=clientes)
     
-    # Projeto (Filtrado por Cliente)
-    df_l1 = df[df['Cliente'].isin(sel_clientes)] if 'Cliente' in df.columns else df
+    # Projeto (Filtrado por Fonte e Cliente)
+    df_l1 = df[indice.mask({SOURCE_COLUMN: sel_fontes, 'Cliente': sel_clientes})]
     projetos = sorted(df_l1['Projeto'].unique())
     sel_projetos = st.multiselect("Projetos", projetos, default=projetos)
     
     # Módulo (Filtrado por Projeto)
-    df_l2 = df_l1[df_l1['Projeto'].isin(sel_projetos)]
+    df_l2 = df[indice.mask({SOURCE_COLUMN: sel_fontes, 'Cliente': sel_clientes, 'Projeto': sel_projetos})]
     modulos = sorted(df_l2['Módulo'].unique()) if 'Módulo' in df_l2.columns else ['Geral']
     sel_modulos = st.multiselect("Módulo/Componente", modulos, default=modulos)
 
@@ -327,26 +391,70 @@ with st.sidebar.expander("⚙️ Filtros Operacionais", expanded=False):
     # Responsável
     responsaveis = sorted(df_l2['Responsável'].unique())
     sel_responsaveis = st.multiselect("Responsável", responsaveis, default=responsaveis)
+    
+    # Labels (por label individual, via bitmaps do índice; nenhuma escolhida = sem restrição)
+    sel_labels = st.multiselect("Labels", sorted(indice.bitmaps.get('Labels', {})))
 
 # Aplicar Filtros ao Dataframe Principal (Com filtro de tempo)
-mask_date = (df['Criado'].dt.date >= pd.to_datetime(start_date).date()) & (df['Criado'].dt.date <= pd.to_datetime(end_date).date())
-mask_hierarchy = (
-    (df['Projeto'].isin(sel_projetos)) &
-    (df['Status'].isin(sel_status)) &
-    (df['Tipo'].isin(sel_tipos)) &
-    (df['Responsável'].isin(sel_responsaveis))
-)
-
-if 'Cliente' in df.columns:
-    mask_hierarchy &= df['Cliente'].isin(sel_clientes)
-if 'Módulo' in df.columns:
-    mask_hierarchy &= df['Módulo'].isin(sel_modulos)
+# Bitmaps pré-calculados por valor (união/interseção) + busca binária nas datas de criação
+inicio_periodo, fim_periodo = period_range(CUSTOM_PERIOD, start=start_date, end=end_date)  # [início, fim + 1 dia)
+selecoes = {
+    'Projeto': sel_projetos,
+    'Status': sel_status,
+    'Tipo': sel_tipos,
+    'Responsável': sel_responsaveis,
+    'Cliente': sel_clientes,
+    'Módulo': sel_modulos,
+    SOURCE_COLUMN: sel_fontes
+}
+if sel_labels:
+    selecoes['Labels'] = sel_labels
+mask_date, mask_hierarchy = sidebar_masks(indice, selecoes, start_date, end_date)
 
 df_final = df[mask_date & mask_hierarchy]
 
 # DataFrame Kanban (Sem filtro de tempo de criação, pois queremos ver o backlog atual completo)
 df_kanban = df[mask_hierarchy]
 
+# Fluxo diário (criados/entregues por dia) para Burnup e Velocity: fatia do cubo quando só
+# Projeto/Tipo estão restritos e nenhuma issue ficou fora do período; senão, agrega df_final
+selecoes_restritas = {dim: sel for dim, sel in selecoes.items() if not indice.selects_all(dim, sel)}
+cubo = obter_cubo_fluxo(df, df.attrs.get('versao'))
+if mask_date.all() and cubo.covers(selecoes_restritas):
+    fluxo = cubo.daily(selecoes_restritas)
+else:
+    fluxo = FlowCube(df_final, status_concluidos).daily()
+
+# Chave dos filtros atuais (abas, exportações e tabela paginada são reaproveitadas por versão + filtros).
+# Inclui o dia: 'Atrasado' e os períodos relativos dependem de `today`, e uma sessão aberta passa da meia-noite
+chave_filtros = (
+    tuple((dim, tuple(sorted(map(str, sel)))) for dim, sel in selecoes.items()),
+    str(start_date), str(end_date), str(today.date())
+)
+perfil.checkpoint("filtros_sidebar")
+
+# Color Map Monocromático (Tons de Azul - Clean & Corporate) - Visão Geral e Painel Sprints
+color_map = {
+    # Concluídos (Azul Escuro/Sólido)
+    'Concluído': '#1E3A8A', 'Done': '#1E3A8A', 'Finalizado': '#1E3A8A', 'Resolvido': '#1E3A8A', 'Closed': '#1E3A8A',
+
+    # Em Andamento (Azul Médio/Vibrante)
+    'Em andamento': '#2563EB', 'In Progress': '#2563EB', 'Doing': '#2563EB', 'Em desenvolvimento': '#2563EB',
+
+    # Pendentes/Backlog (Azul Claro/Suave)
+    'Tarefas pendentes': '#93C5FD', 'To Do': '#93C5FD', 'Backlog': '#BFDBFE', 'Open': '#BFDBFE', 'Aberto': '#BFDBFE',
+
+    # Validação/QA (Azul Acinzentado)
+    'Pronto para QA': '#64748B', 'Test': '#64748B', 'Teste Cury': '#64748B', 'Homologação': '#64748B', 'Homologacao': '#64748B',
+
+    # Atenção/Crítico (Azul Noturno/Profundo - Mantendo a sobriedade)
+    'Escalated': '#0F172A', 'ESCALADO': '#0F172A', 'Blocked': '#0F172A', 'Impedimento': '#0F172A',
+    'Bug Report': '#172554', 'Bug': '#172554',
+
+    # Cancelados/Outros (Cinza Azulado)
+    'Cancelado': '#CBD5E1', 'Não procedente': '#CBD5E1', 'Não Procedente': '#CBD5E1', 
+    'Análise': '#60A5FA', 'Aguardando': '#93C5FD', 'Conta': '#2563EB', 'Aguardando Aprovação': '#93C5FD'
+}
 
 # --- Dashboard Layout (Nova Estrutura Gerencial com Tailwind) ---
 st.markdown(f"""
@@ -379,10 +487,12 @@ tabs = st.tabs([
     "👥 Visão Equipe",
     "⚠️ Análise Riscos",
     "📝 Dados Detalhados"
-])
+], key="aba", on_change="rerun")  # Com estado: `.open` indica a aba visível
+perfil.checkpoint("cabecalho")
 
 # --- TAB 1: VISÃO GERAL DOS PROJETOS ---
-with tabs[0]:
+@st.fragment
+def aba_visao_geral():
     st.markdown("### 🏢 Visão Estratégica do Portfólio")
     
     # KPIs de Projetos
@@ -398,10 +508,8 @@ with tabs[0]:
     c3.metric("Entregas no Prazo", f"{((1 - df_final['Atrasado'].mean()) * 100):.1f}%")
     
     # Velocity Geral (Story Points entregues por Mês)
-    df_done = df_final[df_final['Status'].isin(status_concluidos)].copy()
-    if not df_done.empty:
-        df_done['Mes_Resolvido'] = df_done['Resolvido'].dt.to_period('M').astype(str)
-        velocity = df_done.groupby('Mes_Resolvido')['Story Points'].sum().mean()
+    if not fluxo.empty and fluxo['delivered'].sum() > 0:
+        velocity = monthly_velocity(fluxo)
         c4.metric("Velocity Médio (SP/Mês)", f"{velocity:.1f}")
     else:
         c4.metric("Velocity Médio", "0")
@@ -414,139 +522,112 @@ with tabs[0]:
         st.subheader("📌 Status Detalhado por Projeto")
         
         if not df_kanban.empty:
-            # Color Map Monocromático (Tons de Azul - Clean & Corporate)
-            color_map = {
-                # Concluídos (Azul Escuro/Sólido)
-                'Concluído': '#1E3A8A', 'Done': '#1E3A8A', 'Finalizado': '#1E3A8A', 'Resolvido': '#1E3A8A', 'Closed': '#1E3A8A',
-                
-                # Em Andamento (Azul Médio/Vibrante)
-                'Em andamento': '#2563EB', 'In Progress': '#2563EB', 'Doing': '#2563EB', 'Em desenvolvimento': '#2563EB',
-                
-                # Pendentes/Backlog (Azul Claro/Suave)
-                'Tarefas pendentes': '#93C5FD', 'To Do': '#93C5FD', 'Backlog': '#BFDBFE', 'Open': '#BFDBFE', 'Aberto': '#BFDBFE',
-                
-                # Validação/QA (Azul Acinzentado)
-                'Pronto para QA': '#64748B', 'Test': '#64748B', 'Teste Cury': '#64748B', 'Homologação': '#64748B', 'Homologacao': '#64748B',
+            # Uma contagem agrupada (Usar df_kanban para ver TODO o backlog) e uma figura por página de projetos
+            s_counts = memo_aba("status_projetos", lambda: status_grid(df_kanban))
+            projs = s_counts['Projeto'].unique()
+            total_paginas = max(1, -(-len(projs) // PROJETOS_POR_PAGINA))
+            pagina = st.number_input(f"Página de projetos (de {total_paginas})", min_value=1, max_value=total_paginas,
+                                     value=1) if total_paginas > 1 else 1
+            
+            def grade_status(pagina):
+                projs_pagina = projs[(pagina - 1) * PROJETOS_POR_PAGINA:pagina * PROJETOS_POR_PAGINA]
+                linhas = -(-len(projs_pagina) // 2)  # Grid de 2 colunas
                 
-                # Atenção/Crítico (Azul Noturno/Profundo - Mantendo a sobriedade)
-                'Escalated': '#0F172A', 'ESCALADO': '#0F172A', 'Blocked': '#0F172A', 'Impedimento': '#0F172A',
-                'Bug Report': '#172554', 'Bug': '#172554',
+                # Gráfico em grade - um subplot por projeto, mesmo visual dos gráficos individuais
+                fig_p = make_subplots(
+                    rows=linhas, cols=2,
+                    subplot_titles=[f"📁 {proj}" for proj in projs_pagina],
+                    horizontal_spacing=0.25,
+                    vertical_spacing=60 / (220 * linhas)
+                )
                 
-                # Cancelados/Outros (Cinza Azulado)
-                'Cancelado': '#CBD5E1', 'Não procedente': '#CBD5E1', 'Não Procedente': '#CBD5E1', 
-                'Análise': '#60A5FA', 'Aguardando': '#93C5FD', 'Conta': '#2563EB', 'Aguardando Aprovação': '#93C5FD'
-            }
-
-            projs = sorted(df_kanban['Projeto'].unique())
-            cols = st.columns(2)  # Grid de 2 colunas
-            
-            for i, proj in enumerate(projs):
-                with cols[i % 2]:
-                    # Filtrar dados do projeto (Usar df_kanban para ver TODO o backlog)
-                    d_p = df_kanban[df_kanban['Projeto'] == proj]
-                    
-                    if d_p.empty:
-                        continue
-
-                    # Contagem por status
-                    s_counts = d_p['Status'].value_counts().reset_index()
-                    s_counts.columns = ['Status', 'Qtd']
-                    
-                    # Gráfico Individual - Refatorado com Plotly Graph Objects
-                    fig_p = go.Figure()
-                    
+                por_projeto = s_counts[s_counts['Projeto'].isin(projs_pagina)].groupby('Projeto', sort=False)
+                for i, (proj, d_p) in enumerate(por_projeto):
                     # Mapeamento de cores para lista
-                    bar_colors = [color_map.get(s, '#CBD5E1') for s in s_counts['Status']]
+                    bar_colors = [color_map.get(s, '#CBD5E1') for s in d_p['Status']]
                     
                     fig_p.add_trace(go.Bar(
-                        y=s_counts['Status'],
-                        x=s_counts['Qtd'],
+                        y=d_p['Status'],
+                        x=d_p['Qtd'],
                         orientation='h',
-                        text=s_counts['Qtd'],
+                        text=d_p['Qtd'],
                         textposition='auto',
                         marker_color=bar_colors,
                         marker_line_width=0,
                         hovertemplate='<b>%{y}</b>: %{x} issues<extra></extra>',
                         width=0.7 # Barras mais finas e elegantes
-                    ))
-                    
-                    fig_p.update_layout(
-                        title=dict(
-                            text=f"📁 {proj}",
-                            font=dict(size=15, color="#1E3A8A", family="Inter")
-                        ),
-                        template="plotly_white", 
-                        paper_bgcolor='rgba(0,0,0,0)', 
-                        plot_bgcolor='rgba(0,0,0,0)', 
-                        font=dict(family="Inter", color="#111827"),
-                        showlegend=False,
-                        height=220, # Compacto
-                        margin=dict(l=10, r=10, t=40, b=10),
-                        xaxis=dict(showgrid=False, showticklabels=False, zeroline=False),
-                        yaxis=dict(showgrid=False, tickfont=dict(size=11), automargin=True)
-                    )
-                    st.plotly_chart(fig_p, use_container_width=True, config={'displayModeBar': False})
+                    ), row=i // 2 + 1, col=i % 2 + 1)
+                
+                fig_p.update_layout(
+                    template="plotly_white", 
+                    paper_bgcolor='rgba(0,0,0,0)', 
+                    plot_bgcolor='rgba(0,0,0,0)', 
+                    font=dict(family="Inter", color="#111827"),
+                    showlegend=False,
+                    height=220 * linhas, # Compacto: 220px por linha da grade
+                    margin=dict(l=10, r=10, t=40, b=10)
+                )
+                fig_p.update_xaxes(showgrid=False, showticklabels=False, zeroline=False)
+                fig_p.update_yaxes(showgrid=False, tickfont=dict(size=11), automargin=True)
+                fig_p.update_annotations(font=dict(size=15, color="#1E3A8A", family="Inter"))  # Títulos dos projetos
+                return fig_p
+            
+            fig_p = memo_aba("status_projetos_grade", lambda: grade_status(pagina), pagina)
+            plotar("status_projeto", fig_p, use_container_width=True, config={'displayModeBar': False})
         else:
             st.info("Nenhum dado disponível para exibir.")
 
     with col2:
         st.subheader("📉 Burndown Acumulado (Portfólio)")
-        # Burndown Simplificado (Criados vs Resolvidos acumulados no tempo)
-        df_burn = df_final.copy()
-        df_burn = df_burn.sort_values('Criado')
-        df_burn['Criado_Count'] = 1
-        df_burn['Acum_Criado'] = df_burn['Criado_Count'].cumsum()
-        
-        df_res_burn = df_final[df_final['Status'].isin(status_concluidos)].copy()
-        df_res_burn = df_res_burn.sort_values('Resolvido')
-        df_res_burn['Resolvido_Count'] = 1
-        # Merge para alinhar no tempo
-        timeline = pd.DataFrame({'Data': pd.concat([df_final['Criado'], df_final['Resolvido']]).unique()})
-        timeline = timeline.sort_values('Data').dropna()
-        
-        # Aproximação visual - Refatorado
-        fig_burn = go.Figure()
-        
-        # Linha de Escopo (Azul Escuro Profundo)
-        fig_burn.add_trace(go.Scatter(
-            x=df_burn['Criado'], 
-            y=df_burn['Acum_Criado'], 
-            mode='lines', 
-            name='Escopo Total', 
-            line=dict(color='#1E3A8A', width=3),
-            hovertemplate='<b>Escopo</b>: %{y} issues<br>%{x|%d/%m/%Y}<extra></extra>'
-        ))
-        
-        if not df_res_burn.empty:
-             df_res_burn['Acum_Resolvido'] = range(1, len(df_res_burn) + 1)
-             # Linha de Entrega (Azul Vibrante com Preenchimento Suave)
-             fig_burn.add_trace(go.Scatter(
-                 x=df_res_burn['Resolvido'], 
-                 y=df_res_burn['Acum_Resolvido'], 
-                 mode='lines', 
-                 name='Entregue', 
-                 fill='tozeroy', 
-                 fillcolor='rgba(59, 130, 246, 0.1)', # Azul translúcido
-                 line=dict(color='#3B82F6', width=3),
-                 hovertemplate='<b>Entregue</b>: %{y} issues<br>%{x|%d/%m/%Y}<extra></extra>'
-             ))
+        # Burndown Simplificado (Criados vs Resolvidos acumulados por dia, no máximo MAX_CHART_POINTS pontos)
+        def grafico_burnup():
+            df_burn = burnup_points(fluxo) if not fluxo.empty else pd.DataFrame(columns=['date', 'scope', 'delivered'])
+
+            fig_burn = go.Figure()
+
+            # Linha de Escopo (Azul Escuro Profundo)
+            fig_burn.add_trace(go.Scatter(
+                x=df_burn['date'], 
+                y=df_burn['scope'], 
+                mode='lines', 
+                name='Escopo Total', 
+                line=dict(color='#1E3A8A', width=3),
+                hovertemplate='<b>Escopo</b>: %{y} issues<br>%{x|%d/%m/%Y}<extra></extra>'
+            ))
+
+            if df_burn['delivered'].any():
+                 # Linha de Entrega (Azul Vibrante com Preenchimento Suave)
+                 fig_burn.add_trace(go.Scatter(
+                     x=df_burn['date'], 
+                     y=df_burn['delivered'], 
+                     mode='lines', 
+                     name='Entregue', 
+                     fill='tozeroy', 
+                     fillcolor='rgba(59, 130, 246, 0.1)', # Azul translúcido
+                     line=dict(color='#3B82F6', width=3),
+                     hovertemplate='<b>Entregue</b>: %{y} issues<br>%{x|%d/%m/%Y}<extra></extra>'
+                 ))
+
+            fig_burn.update_layout(
+                title=dict(text="📉 Curva de Evolução (Burnup)", font=dict(size=18, color="#1E3A8A")),
+                template="plotly_white", 
+                paper_bgcolor='rgba(0,0,0,0)', 
+                plot_bgcolor='rgba(0,0,0,0)', 
+                font=dict(family="Inter", color="#64748B"),
+                hovermode="x unified",
+                xaxis=dict(showgrid=False, showline=True, linecolor="#E5E7EB"),
+                yaxis=dict(showgrid=True, gridcolor='#F1F5F9', gridwidth=1, zeroline=False),
+                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+                margin=dict(l=20, r=20, t=60, b=20)
+            )
+            return fig_burn
         
-        fig_burn.update_layout(
-            title=dict(text="📉 Curva de Evolução (Burnup)", font=dict(size=18, color="#1E3A8A")),
-            template="plotly_white", 
-            paper_bgcolor='rgba(0,0,0,0)', 
-            plot_bgcolor='rgba(0,0,0,0)', 
-            font=dict(family="Inter", color="#64748B"),
-            hovermode="x unified",
-            xaxis=dict(showgrid=False, showline=True, linecolor="#E5E7EB"),
-            yaxis=dict(showgrid=True, gridcolor='#F1F5F9', gridwidth=1, zeroline=False),
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-            margin=dict(l=20, r=20, t=60, b=20)
-        )
-        st.plotly_chart(fig_burn, use_container_width=True, config={'displayModeBar': False})
+        fig_burn = memo_aba("burnup", grafico_burnup)
+        plotar("burnup", fig_burn, use_container_width=True, config={'displayModeBar': False})
 
 # --- TAB 2: INDICADORES CHAVE (KPIs) ---
-with tabs[1]:
+@st.fragment
+def aba_indicadores():
     st.markdown("### 🎯 Indicadores de Performance (KPIs)")
     
     k1, k2, k3, k4, k5 = st.columns(5)
@@ -556,9 +637,10 @@ with tabs[1]:
     abertas = len(df_kanban[~df_kanban['Status'].isin(status_concluidos)])
     
     # Concluídas: Fluxo no Período (Resolvido dentro das datas selecionadas)
-    if 'Resolvido' in df_kanban.columns:
-        mask_res = (df_kanban['Resolvido'] >= pd.to_datetime(start_date)) & (df_kanban['Resolvido'] <= pd.to_datetime(end_date))
-        concluidas = len(df_kanban[mask_res & df_kanban['Status'].isin(status_concluidos)])
+    if 'Resolvido' in indice.dates:
+        # Busca binária nas datas de resolução pré-ordenadas, sobre o mesmo recorte do Kanban
+        mask_res = mask_hierarchy & indice.mask(date_start=inicio_periodo, date_end=fim_periodo, date_column='Resolvido')
+        concluidas = len(df[mask_res & df['Status'].isin(status_concluidos)])
     else:
         concluidas = 0
         
@@ -572,8 +654,9 @@ with tabs[1]:
     k3.metric("Bugs Pendentes", bugs_pendentes, f"{bugs} Total", delta_color="inverse")
     k4.metric("Itens Críticos", criticos, "Alta Prioridade", delta_color="inverse")
     
-    if not df_done.empty:
-        sla_medio = df_done['Lead Time'].mean()
+    lead_times = df_final.loc[df_final['Status'].isin(status_concluidos), 'Lead Time']
+    if not lead_times.empty:
+        sla_medio = lead_times.mean()
         k5.metric("Lead Time Médio", f"{sla_medio:.1f} dias")
     else:
         k5.metric("Lead Time", "N/A")
@@ -585,67 +668,147 @@ with tabs[1]:
     with c_k1:
         st.subheader("Distribuição por Tipo (Ativos)")
         # Pie Chart Refatorado - Modern Donut
-        blues_palette = ['#1E3A8A', '#2563EB', '#3B82F6', '#60A5FA', '#93C5FD', '#BFDBFE']
-        
-        fig_type = go.Figure(data=[go.Pie(
-            labels=df_kanban['Tipo'], 
-            hole=0.7, # Donut chart mais fino e elegante
-            marker=dict(colors=blues_palette, line=dict(color='#FFFFFF', width=2)),
-            textinfo='percent',
-            hoverinfo='label+value+percent',
-            textfont=dict(size=13, family="Inter", weight="bold"),
-            pull=[0.02] * len(df_kanban['Tipo'].unique()) # Leve separação
-        )])
-        
-        fig_type.update_layout(
-            title=dict(text="Volume por Demanda", font=dict(size=16, color="#1E3A8A")),
-            template="plotly_white", 
-            paper_bgcolor='rgba(0,0,0,0)', 
-            plot_bgcolor='rgba(0,0,0,0)', 
-            font=dict(family="Inter", color="#64748B"),
-            showlegend=True,
-            legend=dict(orientation="h", yanchor="bottom", y=-0.1, xanchor="center", x=0.5),
-            margin=dict(l=20, r=20, t=40, b=50),
-            height=350
-        )
-        
-        # Adicionar anotação no centro com Total
-        total_items = len(df_kanban)
-        fig_type.add_annotation(text=f"<b>{total_items}</b><br>Items", x=0.5, y=0.5, font_size=20, showarrow=False, font_family="Inter", font_color="#1E3A8A")
+        def grafico_tipos():
+            blues_palette = ['#1E3A8A', '#2563EB', '#3B82F6', '#60A5FA', '#93C5FD', '#BFDBFE']
+
+            # Contagens agregadas em vez de uma fatia por issue (JSON da figura independe do volume)
+            type_counts = df_kanban['Tipo'].value_counts()
+            type_counts = type_counts[type_counts > 0]
+            
+            fig_type = go.Figure(data=[go.Pie(
+                labels=type_counts.index.astype(str), 
+                values=type_counts.values,
+                hole=0.7, # Donut chart mais fino e elegante
+                marker=dict(colors=blues_palette, line=dict(color='#FFFFFF', width=2)),
+                textinfo='percent',
+                hoverinfo='label+value+percent',
+                textfont=dict(size=13, family="Inter", weight="bold"),
+                pull=[0.02] * len(type_counts) # Leve separação
+            )])
+
+            fig_type.update_layout(
+                title=dict(text="Volume por Demanda", font=dict(size=16, color="#1E3A8A")),
+                template="plotly_white", 
+                paper_bgcolor='rgba(0,0,0,0)', 
+                plot_bgcolor='rgba(0,0,0,0)', 
+                font=dict(family="Inter", color="#64748B"),
+                showlegend=True,
+                legend=dict(orientation="h", yanchor="bottom", y=-0.1, xanchor="center", x=0.5),
+                margin=dict(l=20, r=20, t=40, b=50),
+                height=350
+            )
+
+            # Adicionar anotação no centro com Total
+            total_items = len(df_kanban)
+            fig_type.add_annotation(text=f"<b>{total_items}</b><br>Items", x=0.5, y=0.5, font_size=20, showarrow=False, font_family="Inter", font_color="#1E3A8A")
+            return fig_type
         
-        st.plotly_chart(fig_type, use_container_width=True, config={'displayModeBar': False})
+        fig_type = memo_aba("tipos", grafico_tipos)
+        plotar("tipos", fig_type, use_container_width=True, config={'displayModeBar': False})
         
     with c_k2:
         st.subheader("Funil de Status")
-        status_counts = df_kanban['Status'].value_counts().reset_index()
-        status_counts.columns = ['Status', 'Qtd']
-        
-        # Funil Refatorado
-        fig_funnel = go.Figure(go.Funnel(
-            y=status_counts['Status'],
-            x=status_counts['Qtd'],
-            textinfo="value+percent initial",
-            textposition="inside",
-            marker=dict(color='#2563EB', line=dict(width=2, color="#FFFFFF")),
-            connector=dict(line=dict(color="#93C5FD", width=1, dash="dot")),
-            opacity=0.9,
-            hovertemplate='<b>%{y}</b>: %{x} issues<extra></extra>'
-        ))
+        def grafico_funil():
+            status_counts = df_kanban['Status'].value_counts().reset_index()
+            status_counts.columns = ['Status', 'Qtd']
+            status_counts = status_counts[status_counts['Qtd'] > 0]
+
+            # Funil Refatorado
+            fig_funnel = go.Figure(go.Funnel(
+                y=status_counts['Status'],
+                x=status_counts['Qtd'],
+                textinfo="value+percent initial",
+                textposition="inside",
+                marker=dict(color='#2563EB', line=dict(width=2, color="#FFFFFF")),
+                connector=dict(line=dict(color="#93C5FD", width=1, dash="dot")),
+                opacity=0.9,
+                hovertemplate='<b>%{y}</b>: %{x} issues<extra></extra>'
+            ))
+
+            fig_funnel.update_layout(
+                title=dict(text="Fluxo de Execução", font=dict(size=16, color="#1E3A8A")),
+                template="plotly_white", 
+                paper_bgcolor='rgba(0,0,0,0)', 
+                plot_bgcolor='rgba(0,0,0,0)', 
+                font=dict(family="Inter", color="#64748B"),
+                margin=dict(l=10, r=10, t=40, b=10),
+                height=350,
+                showlegend=False
+            )
+            return fig_funnel
         
-        fig_funnel.update_layout(
-            title=dict(text="Fluxo de Execução", font=dict(size=16, color="#1E3A8A")),
-            template="plotly_white", 
-            paper_bgcolor='rgba(0,0,0,0)', 
-            plot_bgcolor='rgba(0,0,0,0)', 
+        fig_funnel = memo_aba("funil", grafico_funil)
+        plotar("funil", fig_funnel, use_container_width=True, config={'displayModeBar': False})
+    
+    st.markdown("---")
+    st.subheader("Fluxo Cumulativo e Tempo em Status")
+    intervalos = obter_intervalos_status(df, df.attrs.get('versao'))
+    if intervalos is None or intervalos.empty:
+        st.info("Sem histórico de status: ative `changelog = true` na fonte Jira (secrets) para ver o fluxo cumulativo e o tempo em cada status.")
+        return
+    
+    def fluxo_status():
+        # Issues do recorte atual (sem filtro de criação); o período é a janela de dias do gráfico
+        selecionados = intervalos[mask_hierarchy[intervalos['issue'].to_numpy()]]
+        inicio, fim = flow_window(inicio_periodo, fim_periodo)
+        return (chart_days(cumulative_flow(selecionados, inicio, fim)),
+                time_in_status(selecionados, inicio, fim, done_statuses=status_concluidos))
+    
+    def grafico_cfd():
+        cfd, _ = memo_aba("fluxo_status", fluxo_status)
+        # Uma área empilhada por status: concluídos na base, etapas iniciais no topo
+        cores = px.colors.sample_colorscale('Blues', np.linspace(0.25, 1, max(len(cfd.columns), 2)))
+        fig_cfd = go.Figure()
+        for status, cor in zip(reversed(cfd.columns), cores[::-1]):
+            fig_cfd.add_trace(go.Scatter(
+                x=cfd.index, y=cfd[status], name=status, mode='lines', stackgroup='cfd',
+                line=dict(width=0.5, color=cor), hovertemplate='%{x|%d/%m/%Y}: %{y} issues<extra>' + status + '</extra>'
+            ))
+        fig_cfd.update_layout(
+            title=dict(text="Fluxo Cumulativo (CFD)", font=dict(size=16, color="#1E3A8A")),
+            template="plotly_white",
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
             font=dict(family="Inter", color="#64748B"),
+            legend=dict(traceorder="reversed"),
             margin=dict(l=10, r=10, t=40, b=10),
-            height=350,
-            showlegend=False
+            height=420
         )
-        st.plotly_chart(fig_funnel, use_container_width=True, config={'displayModeBar': False})
+        return fig_cfd
+    
+    def grafico_tempo_status():
+        _, tempos = memo_aba("fluxo_status", fluxo_status)
+        # Só status em aberto: o tempo num status concluído é só a idade da entrega
+        tempos = tempos[~tempos['done']]
+        fig_tempo = go.Figure([
+            go.Bar(y=tempos['status'], x=tempos['median_days'], name='Mediana', orientation='h', marker_color='#2563EB',
+                   customdata=tempos['issues'], hovertemplate='<b>%{y}</b>: %{x:.1f} dias (%{customdata} issues)<extra>Mediana</extra>'),
+            go.Bar(y=tempos['status'], x=tempos['p85_days'], name='85%', orientation='h', marker_color='#93C5FD',
+                   hovertemplate='<b>%{y}</b>: %{x:.1f} dias<extra>85%</extra>')
+        ])
+        fig_tempo.update_layout(
+            title=dict(text="Tempo em Status (dias por issue)", font=dict(size=16, color="#1E3A8A")),
+            template="plotly_white",
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            font=dict(family="Inter", color="#64748B"),
+            barmode='group',
+            yaxis=dict(autorange="reversed"),
+            legend=dict(orientation="h", yanchor="bottom", y=-0.2, xanchor="center", x=0.5),
+            margin=dict(l=10, r=10, t=40, b=10),
+            height=420
+        )
+        return fig_tempo
+    
+    c_f1, c_f2 = st.columns([3, 2])
+    with c_f1:
+        plotar("cfd", memo_aba("cfd", grafico_cfd), use_container_width=True, config={'displayModeBar': False})
+    with c_f2:
+        plotar("tempo_status", memo_aba("tempo_status", grafico_tempo_status), use_container_width=True, config={'displayModeBar': False})
 
 # --- TAB 3: PAINEL DE SPRINTS ---
-with tabs[2]:
+@st.fragment
+def aba_sprints():
     st.markdown("### 🏃 Gestão de Sprints")
     
     # Filtro de Sprints específico (Baseado em df_kanban para pegar todo histórico da sprint)
@@ -668,38 +831,43 @@ with tabs[2]:
         m3.metric("Progresso Geral", f"{progress_sprint:.1f}%")
         
         # Gráfico de Barras por Sprint - Refatorado com Cores Consistentes
-        sprint_data = df_sprint_view.groupby(['Sprint', 'Status']).sum(numeric_only=True).reset_index()
-        
-        fig_sprint_bar = go.Figure()
+        def grafico_sprints():
+            sprint_data = df_sprint_view.groupby(['Sprint', 'Status'], observed=True).sum(numeric_only=True).reset_index()
+
+            fig_sprint_bar = go.Figure()
+
+            for status in sprint_data['Status'].unique():
+                d = sprint_data[sprint_data['Status'] == status]
+                fig_sprint_bar.add_trace(go.Bar(
+                    x=d['Sprint'],
+                    y=d['Story Points'],
+                    name=status,
+                    marker_color=color_map.get(status, '#94A3B8'),
+                    text=d['Story Points'],
+                    textposition='auto',
+                    hovertemplate='<b>%{x}</b><br>%{y} SP<extra></extra>'
+                ))
+
+            fig_sprint_bar.update_layout(
+                title=dict(text="Story Points por Sprint", font=dict(size=18, color="#1E3A8A")),
+                template="plotly_white", 
+                paper_bgcolor='rgba(0,0,0,0)', 
+                plot_bgcolor='rgba(0,0,0,0)', 
+                font=dict(family="Inter", color="#64748B"),
+                barmode='group',
+                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+                xaxis=dict(showgrid=False, linecolor='#E2E8F0'),
+                yaxis=dict(showgrid=True, gridcolor='#F1F5F9', zeroline=False),
+                margin=dict(l=20, r=20, t=60, b=20)
+            )
+            return fig_sprint_bar
         
-        for status in sprint_data['Status'].unique():
-            d = sprint_data[sprint_data['Status'] == status]
-            fig_sprint_bar.add_trace(go.Bar(
-                x=d['Sprint'],
-                y=d['Story Points'],
-                name=status,
-                marker_color=color_map.get(status, '#94A3B8'),
-                text=d['Story Points'],
-                textposition='auto',
-                hovertemplate='<b>%{x}</b><br>%{y} SP<extra></extra>'
-            ))
-            
-        fig_sprint_bar.update_layout(
-            title=dict(text="Story Points por Sprint", font=dict(size=18, color="#1E3A8A")),
-            template="plotly_white", 
-            paper_bgcolor='rgba(0,0,0,0)', 
-            plot_bgcolor='rgba(0,0,0,0)', 
-            font=dict(family="Inter", color="#64748B"),
-            barmode='group',
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-            xaxis=dict(showgrid=False, linecolor='#E2E8F0'),
-            yaxis=dict(showgrid=True, gridcolor='#F1F5F9', zeroline=False),
-            margin=dict(l=20, r=20, t=60, b=20)
-        )
-        st.plotly_chart(fig_sprint_bar, use_container_width=True, config={'displayModeBar': False})
+        fig_sprint_bar = memo_aba("sprints", grafico_sprints, tuple(sprint_selection))
+        plotar("sprints", fig_sprint_bar, use_container_width=True, config={'displayModeBar': False})
 
 # --- TAB 4: GESTÃO DE TAREFAS ---
-with tabs[3]:
+@st.fragment
+def aba_tarefas():
     st.markdown("### 📋 Gestão Operacional de Tarefas")
     
     # Kanban Board View (Simplificado em colunas Streamlit)
@@ -716,10 +884,12 @@ with tabs[3]:
     
     kanban_titles = ['A Fazer', 'Em Progresso', 'Testes/Review', 'Concluído']
     
-    for idx, (group_name, statuses) in enumerate(kanban_mapping.items()):
+    cartoes = memo_aba("kanban", lambda: [
+        df_kanban[df_kanban['Status'].isin(statuses)].head(10) for statuses in kanban_mapping.values()
+    ])
+    for idx, items in enumerate(cartoes):
         with cols_kanban[idx]:
             st.markdown(f"**{kanban_titles[idx]}**")
-            items = df_kanban[df_kanban['Status'].isin(statuses)].head(10)
             for _, item in items.iterrows():
                 priority_color = "🔴" if item['Prioridade'] in ['High', 'Highest', 'Critical'] else "🔵"
                 st.markdown(f"""
@@ -733,16 +903,17 @@ with tabs[3]:
     
     # Top Issues Antigas
     st.subheader("🐢 Tarefas Estagnadas (Top 10 Mais Antigas Abertas)")
-    oldest = df_kanban[~df_kanban['Status'].isin(status_concluidos)].sort_values('Criado').head(10)
+    oldest = memo_aba("estagnadas", lambda: df_kanban[~df_kanban['Status'].isin(status_concluidos)].sort_values('Criado').head(10))
     if not oldest.empty:
-        # Calcular idade em dias
-        oldest['Dias Aberto'] = (datetime.now() - oldest['Criado']).dt.days
+        # Calcular idade em dias (em uma cópia: o resultado memorizado é compartilhado)
+        oldest = oldest.assign(**{'Dias Aberto': (datetime.now() - oldest['Criado']).dt.days})
         st.dataframe(oldest[['Chave', 'Resumo', 'Responsável', 'Status', 'Criado', 'Dias Aberto']], use_container_width=True)
     else:
         st.success("Nenhuma tarefa antiga encontrada!")
 
 # --- TAB 5: VISÃO DE EQUIPE ---
-with tabs[4]:
+@st.fragment
+def aba_equipe():
     st.markdown("### 👥 Performance & Carga da Equipe")
     
     # Workload
@@ -750,48 +921,50 @@ with tabs[4]:
     df_team_active = df_kanban[~df_kanban['Status'].isin(status_concluidos)]
     
     if not df_team_active.empty:
-        team_load = df_team_active.groupby('Responsável').agg({'Chave': 'count', 'Story Points': 'sum'}).reset_index()
-        team_load.columns = ['Responsável', 'Qtd Issues', 'Story Points']
-        team_load = team_load.sort_values('Story Points', ascending=True)
-        
-        fig_team = go.Figure()
-        
-        fig_team.add_trace(go.Bar(
-            y=team_load['Responsável'],
-            x=team_load['Qtd Issues'],
-            name='Qtd Issues',
-            orientation='h',
-            marker_color='#93C5FD',
-            text=team_load['Qtd Issues'],
-            textposition='auto',
-            hovertemplate='<b>%{y}</b><br>%{x} Issues<extra></extra>'
-        ))
-        
-        fig_team.add_trace(go.Bar(
-            y=team_load['Responsável'],
-            x=team_load['Story Points'],
-            name='Story Points',
-            orientation='h',
-            marker_color='#1E40AF',
-            text=team_load['Story Points'],
-            textposition='auto',
-            hovertemplate='<b>%{y}</b><br>%{x} SP<extra></extra>'
-        ))
+        def carga_equipe():
+            team_load = assignee_load(df_team_active)
+
+            fig_team = go.Figure()
+
+            fig_team.add_trace(go.Bar(
+                y=team_load['Responsável'],
+                x=team_load['Qtd Issues'],
+                name='Qtd Issues',
+                orientation='h',
+                marker_color='#93C5FD',
+                text=team_load['Qtd Issues'],
+                textposition='auto',
+                hovertemplate='<b>%{y}</b><br>%{x} Issues<extra></extra>'
+            ))
+
+            fig_team.add_trace(go.Bar(
+                y=team_load['Responsável'],
+                x=team_load['Story Points'],
+                name='Story Points',
+                orientation='h',
+                marker_color='#1E40AF',
+                text=team_load['Story Points'],
+                textposition='auto',
+                hovertemplate='<b>%{y}</b><br>%{x} SP<extra></extra>'
+            ))
+
+            fig_team.update_layout(
+                title=dict(text="Carga por Membro", font=dict(size=18, color="#1E3A8A")),
+                template="plotly_white", 
+                paper_bgcolor='rgba(0,0,0,0)', 
+                plot_bgcolor='rgba(0,0,0,0)', 
+                font=dict(family="Inter", color="#64748B"),
+                barmode='group',
+                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+                xaxis=dict(showgrid=True, gridcolor='#F1F5F9', zeroline=False),
+                yaxis=dict(showgrid=False),
+                height=400,
+                margin=dict(l=20, r=20, t=60, b=20)
+            )
+            return team_load, fig_team
         
-        fig_team.update_layout(
-            title=dict(text="Carga por Membro", font=dict(size=18, color="#1E3A8A")),
-            template="plotly_white", 
-            paper_bgcolor='rgba(0,0,0,0)', 
-            plot_bgcolor='rgba(0,0,0,0)', 
-            font=dict(family="Inter", color="#64748B"),
-            barmode='group',
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-            xaxis=dict(showgrid=True, gridcolor='#F1F5F9', zeroline=False),
-            yaxis=dict(showgrid=False),
-            height=400,
-            margin=dict(l=20, r=20, t=60, b=20)
-        )
-        st.plotly_chart(fig_team, use_container_width=True, config={'displayModeBar': False})
+        team_load, fig_team = memo_aba("equipe", carga_equipe)
+        plotar("equipe", fig_team, use_container_width=True, config={'displayModeBar': False})
         
         # Alerta de Burnout (Ex: > 10 issues ou > 20 points - Ajustável)
         overloaded = team_load[(team_load['Qtd Issues'] > 10) | (team_load['Story Points'] > 20)]
@@ -801,7 +974,8 @@ with tabs[4]:
         st.info("Equipe sem itens ativos.")
 
 # --- TAB 6: RISCOS ---
-with tabs[5]:
+@st.fragment
+def aba_riscos():
     st.markdown("### ⚠️ Matriz de Riscos & Atrasos")
     
     r1, r2 = st.columns(2)
@@ -811,46 +985,48 @@ with tabs[5]:
         if 'Módulo' in df_final.columns and not df_final.empty:
             df_atrasos = df_final[df_final['Atrasado'] == True]
             if not df_atrasos.empty:
-                heatmap_data = df_atrasos.groupby(['Módulo', 'Status']).size().reset_index(name='Qtd')
-                
-                # Pivot para formato matricial correto para Heatmap
-                matrix = heatmap_data.pivot(index='Módulo', columns='Status', values='Qtd').fillna(0)
-                
-                fig_heat = go.Figure(data=go.Heatmap(
-                    z=matrix.values,
-                    x=matrix.columns,
-                    y=matrix.index,
-                    colorscale='Blues',
-                    hovertemplate='<b>%{y}</b><br>%{x}: %{z} atrasos<extra></extra>',
-                    showscale=True,
-                    xgap=2, # Espaçamento entre células
-                    ygap=2
-                ))
+                def grafico_heatmap():
+                    # Matriz Módulo x Status (formato do Heatmap)
+                    matrix = delay_matrix(df_atrasos)
+
+                    fig_heat = go.Figure(data=go.Heatmap(
+                        z=matrix.values,
+                        x=matrix.columns,
+                        y=matrix.index,
+                        colorscale='Blues',
+                        hovertemplate='<b>%{y}</b><br>%{x}: %{z} atrasos<extra></extra>',
+                        showscale=True,
+                        xgap=2, # Espaçamento entre células
+                        ygap=2
+                    ))
+
+                    fig_heat.update_layout(
+                        title=dict(text="Concentração de Atrasos", font=dict(size=16, color="#1E3A8A")),
+                        template="plotly_white", 
+                        paper_bgcolor='rgba(0,0,0,0)', 
+                        plot_bgcolor='rgba(0,0,0,0)', 
+                        font=dict(family="Inter", color="#64748B"),
+                        xaxis=dict(showgrid=False, title=None, side="top"), # Labels no topo
+                        yaxis=dict(showgrid=False, title=None, automargin=True),
+                        height=350,
+                        margin=dict(l=10, r=10, t=60, b=10)
+                    )
+                    return fig_heat
                 
-                fig_heat.update_layout(
-                    title=dict(text="Concentração de Atrasos", font=dict(size=16, color="#1E3A8A")),
-                    template="plotly_white", 
-                    paper_bgcolor='rgba(0,0,0,0)', 
-                    plot_bgcolor='rgba(0,0,0,0)', 
-                    font=dict(family="Inter", color="#64748B"),
-                    xaxis=dict(showgrid=False, title=None, side="top"), # Labels no topo
-                    yaxis=dict(showgrid=False, title=None, automargin=True),
-                    height=350,
-                    margin=dict(l=10, r=10, t=60, b=10)
-                )
-                st.plotly_chart(fig_heat, use_container_width=True, config={'displayModeBar': False})
+                fig_heat = memo_aba("heatmap_riscos", grafico_heatmap)
+                plotar("heatmap_riscos", fig_heat, use_container_width=True, config={'displayModeBar': False})
             else:
                 st.success("Sem itens atrasados para gerar heatmap.")
     
     with r2:
         st.subheader("🚨 Lista de Prioridade Crítica")
-        critical_issues = df_kanban[
+        critical_issues = memo_aba("criticos", lambda: df_kanban[
             (
                 (df_kanban['Prioridade'].isin(['Highest', 'Critical', 'High'])) |
                 (df_kanban['Status'].isin(['Escalated', 'Blocked', 'Impediment']))
             ) & 
             (~df_kanban['Status'].isin(status_concluidos))
-        ]
+        ])
         if not critical_issues.empty:
             st.dataframe(critical_issues[['Chave', 'Resumo', 'Responsável', 'Status', 'Prioridade']], use_container_width=True)
         else:
@@ -859,10 +1035,12 @@ with tabs[5]:
     st.markdown("---")
     st.subheader("📊 Projetos com Maior Volume de Atrasos")
     if 'Atrasado' in df_final.columns:
-        df_risk_proj = df_final[df_final['Atrasado'] == True].groupby('Projeto').size().reset_index(name='Qtd Atrasos')
-        if not df_risk_proj.empty:
+        def grafico_riscos_projeto():
+            df_risk_proj = df_final[df_final['Atrasado'] == True].groupby('Projeto', observed=True).size().reset_index(name='Qtd Atrasos')
+            if df_risk_proj.empty:
+                return None
             df_risk_proj = df_risk_proj.sort_values('Qtd Atrasos', ascending=False).head(10)
-            
+
             # Gráfico Refatorado - Top Atrasos
             fig_risk_proj = go.Figure(go.Bar(
                 x=df_risk_proj['Qtd Atrasos'], 
@@ -877,7 +1055,7 @@ with tabs[5]:
                 textposition='auto',
                 hovertemplate='<b>%{y}</b><br>%{x} atrasos<extra></extra>'
             ))
-            
+
             fig_risk_proj.update_layout(
                 title=dict(text="Top 10 Projetos com Atrasos", font=dict(size=16, color="#991B1B")), # Vermelho Escuro
                 template="plotly_white", 
@@ -889,92 +1067,133 @@ with tabs[5]:
                 margin=dict(l=10, r=10, t=40, b=10),
                 height=350
             )
-            st.plotly_chart(fig_risk_proj, use_container_width=True, config={'displayModeBar': False})
+            return fig_risk_proj
+        
+        fig_risk_proj = memo_aba("riscos_projeto", grafico_riscos_projeto)
+        if fig_risk_proj is not None:
+            plotar("riscos_projeto", fig_risk_proj, use_container_width=True, config={'displayModeBar': False})
         else:
             st.info("Nenhum projeto com atrasos registrados.")
 
 # --- TAB 7: DETALHES ---
-with tabs[6]:
+@st.fragment
+def aba_dados_detalhados():
     st.markdown("### 📝 Base de Dados Completa")
     
+    def ler_arquivo(caminho):
+        # O st.download_button guarda o arquivo inteiro na memória do servidor (MediaFileManager),
+        # seja qual for o tipo de `data`: streaming de verdade só pela API (/api/export)
+        with open(caminho, 'rb') as f:
+            return f.read()
+    
+    def exportar(formato):
+        # Gerado só no clique (em outra thread), em blocos de linhas e com cache em disco
+        chave = (df.attrs.get('versao'), chave_filtros, formato)
+        caminho = cached_export(chave, formato)
+        if caminho is None:
+            posicoes_export = np.flatnonzero(mask_date & mask_hierarchy)
+            caminho = WRITERS[formato](df, posicoes_export, list(df.columns), export_path(chave, formato))
+        return ler_arquivo(caminho)
+    
     # Export Buttons
     col_exp1, col_exp2, col_exp3 = st.columns([1, 1, 3])
     
     with col_exp1:
         # Excel Export
-        from io import BytesIO
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df_final.to_excel(writer, index=False, sheet_name='Dados')
-        processed_data = output.getvalue()
-        
         st.download_button(
             label="📥 Exportar Excel",
-            data=processed_data,
+            data=perfil.timed('exportar.xlsx', lambda: exportar('xlsx')),
             file_name=f"jira_export_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            mime=EXPORT_MEDIA_TYPES['xlsx']
+        )
+        st.download_button(
+            label="📥 Exportar CSV",
+            data=perfil.timed('exportar.csv', lambda: exportar('csv')),
+            file_name=f"jira_export_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
+            mime=EXPORT_MEDIA_TYPES['csv']
         )
         
     with col_exp2:
-        # PDF Export
-        def create_pdf(dataframe):
-            pdf = FPDF()
-            pdf.add_page()
-            pdf.set_font("Arial", size=12)
-            
-            def clean_text(text):
-                return str(text).encode('latin-1', 'replace').decode('latin-1')
-            
-            # Title
-            pdf.set_font("Arial", style="B", size=16)
-            pdf.cell(200, 10, txt=clean_text("Relatório de Projetos - Jira Nexus"), ln=True, align='C')
-            pdf.ln(10)
-            
-            # Timestamp
-            pdf.set_font("Arial", size=10)
-            pdf.cell(200, 10, txt=clean_text(f"Gerado em: {datetime.now().strftime('%d/%m/%Y %H:%M')}"), ln=True, align='C')
-            pdf.ln(10)
-            
-            # Summary Metrics
-            pdf.set_font("Arial", style="B", size=12)
-            pdf.cell(200, 10, txt=clean_text("Resumo Executivo"), ln=True, align='L')
-            pdf.set_font("Arial", size=10)
-            pdf.cell(0, 10, txt=clean_text(f"Total de Tickets Filtrados: {len(dataframe)}"), ln=True)
-            pdf.cell(0, 10, txt=clean_text(f"Projetos Ativos: {dataframe['Projeto'].nunique() if 'Projeto' in dataframe.columns else 0}"), ln=True)
-            pdf.ln(10)
-            
-            # Table Header
-            pdf.set_font("Arial", style="B", size=10)
-            pdf.cell(30, 10, clean_text("Chave"), 1)
-            pdf.cell(40, 10, clean_text("Status"), 1)
-            pdf.cell(60, 10, clean_text("Responsável"), 1)
-            pdf.cell(50, 10, clean_text("Projeto"), 1)
-            pdf.ln()
-            
-            # Table Rows (Limit 50)
-            pdf.set_font("Arial", size=8)
-            for i, row in dataframe.head(50).iterrows():
-                pdf.cell(30, 10, clean_text(str(row.get('Chave', ''))[:15]), 1)
-                pdf.cell(40, 10, clean_text(str(row.get('Status', ''))[:20]), 1)
-                pdf.cell(60, 10, clean_text(str(row.get('Responsável', ''))[:30]), 1)
-                pdf.cell(50, 10, clean_text(str(row.get('Projeto', ''))[:25]), 1)
-                pdf.ln()
-            
-            if len(dataframe) > 50:
-                pdf.cell(0, 10, txt=clean_text(f"... e mais {len(dataframe) - 50} itens (exporte Excel para ver tudo)"), ln=True)
-                
-            return pdf.output(dest='S').encode('latin-1')
-
-        try:
-            pdf_data = create_pdf(df_final)
-            st.download_button(
-                label="📄 Exportar PDF",
-                data=pdf_data,
-                file_name=f"jira_report_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf",
-                mime="application/pdf"
-            )
-        except Exception as e:
-            st.error(f"Erro ao gerar PDF: {e}")
+        # PDF completo (resumo + todas as linhas): gerado em segundo plano, fora da renderização,
+        # e guardado em disco por versão + filtros
+        chave_pdf = (df.attrs.get('versao'), chave_filtros, 'pdf')
+        caminho_pdf = export_path(chave_pdf, 'pdf')
+        gerando_pdf = fila_relatorios().state(chave_pdf) == 'running'
+        
+        @st.fragment(run_every=2 if gerando_pdf else None)
+        def painel_relatorio_pdf():
+            fila = fila_relatorios()
+            estado = fila.state(chave_pdf)
+            if gerando_pdf and estado != 'running':
+                st.rerun()  # Terminou: desliga o polling do fragmento
+            if os.path.exists(caminho_pdf):
+                st.download_button(
+                    label="📄 Baixar Relatório PDF",
+                    data=lambda: ler_arquivo(caminho_pdf),
+                    file_name=f"jira_report_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf",
+                    mime=EXPORT_MEDIA_TYPES['pdf']
+                )
+            elif estado == 'running':
+                st.caption("⏳ Gerando relatório PDF...")
+            else:
+                if estado == 'error':
+                    st.error(f"Erro ao gerar PDF: {fila.error(chave_pdf)}")
+                if st.button("📄 Gerar Relatório PDF"):
+                    posicoes_pdf = obter_indice_ordenacao(df, df.attrs.get('versao')).listing(
+                        (('Criado', False), ('Chave', True)),
+                        make_mask=lambda: mask_date & mask_hierarchy,
+                        key=chave_filtros
+                    )
+                    filtros = "; ".join(f"{dim}: {', '.join(map(str, sel))}" for dim, sel in selecoes_restritas.items())
+                    subtitulo = f"Período: {start_date.strftime('%d/%m/%Y')} a {end_date.strftime('%d/%m/%Y')}" + \
+                        (f" | {filtros}" if filtros else "")
+                    colunas_pdf = [(col, largura) for col, largura in REPORT_COLUMNS if col in df.columns]
+                    fila.submit(chave_pdf, perfil.timed('exportar.pdf', write_pdf), df, posicoes_pdf, colunas_pdf, caminho_pdf,
+                                "Relatório de Projetos - Jira Nexus", subtitulo, status_concluidos)
+                    st.rerun()
+        
+        painel_relatorio_pdf()
         
-    st.dataframe(df_final, width=None, use_container_width=True)
+    # Tabela paginada: a ordem das linhas é calculada uma vez por versão/filtros/ordenação
+    # e cada página é só uma fatia (em vez de enviar o df_final inteiro ao navegador)
+    ordenacao = obter_indice_ordenacao(df, df.attrs.get('versao'))
+    col_ord, col_dir, col_tam, col_pag = st.columns([2, 1, 1, 1])
+    colunas = list(df.columns)
+    coluna_ordem = col_ord.selectbox("Ordenar por", colunas, index=colunas.index('Criado'))
+    ascendente = col_dir.radio("Ordem", ["Decrescente", "Crescente"], horizontal=True) == "Crescente"
+    tamanho_pagina = col_tam.selectbox("Linhas por página", [50, 100, 250, 500], index=1)
+    
+    posicoes = ordenacao.listing(
+        ((coluna_ordem, ascendente), ('Chave', True)),
+        make_mask=lambda: mask_date & mask_hierarchy,
+        key=chave_filtros
+    )
+    total_paginas = max(1, -(-len(posicoes) // tamanho_pagina))
+    pagina = col_pag.number_input(f"Página (de {total_paginas})", min_value=1, max_value=total_paginas, value=1)
+    
+    inicio = (pagina - 1) * tamanho_pagina
+    st.dataframe(df.iloc[posicoes[inicio:inicio + tamanho_pagina]], width=None, use_container_width=True)
+    st.caption(f"{len(posicoes)} issues · exibindo {inicio + 1 if len(posicoes) else 0}–{min(inicio + tamanho_pagina, len(posicoes))}")
+
+# --- Renderização das Abas ---
+# Só a aba aberta é executada; cada uma é um fragmento (widgets internos reexecutam só a própria aba)
+abas = [aba_visao_geral, aba_indicadores, aba_sprints, aba_tarefas, aba_equipe, aba_riscos, aba_dados_detalhados]
+for aba, conteudo in zip(tabs, abas):
+    if aba.open:
+        with aba, perfil.section(conteudo.__name__.replace('_', '.', 1)):
+            conteudo()
 
+# --- Perfil de Renderização (opcional) ---
+if perfil.enabled:
+    with st.expander("⏱️ Perfil de Renderização", expanded=True):
+        resumo = pd.DataFrame(perfil.summary())
+        resumo['KB'] = resumo['bytes'].astype(float) / 1024
+        st.caption(f"Rerun em {perfil.total():.3f}s · {resumo['KB'].sum():.0f} KB de figuras")
+        st.dataframe(
+            resumo[['section', 'kind', 'count', 'seconds', 'render_seconds', 'KB']].rename(columns={
+                'section': 'Seção', 'kind': 'Tipo', 'count': 'Chamadas', 'seconds': 'Tempo (s)',
+                'render_seconds': 'Envio (s)'
+            }),
+            use_container_width=True, hide_index=True
+        )
+    print(perfil.log_line())
@@ -0,0 +1,274 @@
+"""On-demand CSV / Excel / PDF exports of a filtered issue listing.
+
+Rows are written in fixed-size chunks (CSV via pandas, xlsx through an
+openpyxl write-only workbook, which spills rows to disk as it goes), so
+memory does not grow with the number of rows. The PDF report has an
+executive summary (KPIs and a per-project table) followed by every row,
+paginated with a repeated table header; it is slow enough to build that
+callers run it as a background job (see jobs.py).
+
+Finished files are kept in EXPORT_DIR under a hash of the caller's key
+(snapshot version + filters + format), so repeating an export is just
+sending the file again. Each format keeps its own MAX_CACHED_EXPORTS most
+recent files, so a burst of CSV/xlsx downloads never evicts a PDF report
+that was just built.
+"""
+import glob
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+from fpdf import FPDF
+from openpyxl import Workbook
+
+from flow_cube import DONE_STATUSES
+from snapshot import SNAPSHOT_DIR
+
+EXPORT_DIR = os.path.join(SNAPSHOT_DIR, "exports")
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "pdf": "application/pdf"
+}
+# Report table: (column, width in mm) on a landscape A4 page
+REPORT_COLUMNS = [('Chave', 28), ('Resumo', 97), ('Status', 35), ('Responsável', 45), ('Projeto', 42), ('Criado', 30)]
+CHUNK_ROWS = 5000
+FILE_CHUNK_BYTES = 64 * 1024  # Read size when sending a finished file
+MAX_CACHED_EXPORTS = 20
+
+
+def export_path(key, fmt):
+    digest = hashlib.sha1(repr(key).encode()).hexdigest()
+    return os.path.join(EXPORT_DIR, f"{digest}.{fmt}")
+
+
+def cached_export(key, fmt):
+    """Path of a finished export for `key`, or None."""
+    path = export_path(key, fmt)
+    return path if os.path.exists(path) else None
+
+
+def _chunks(df, positions, columns, chunk_rows=CHUNK_ROWS):
+    for start in range(0, len(positions), chunk_rows):
+        yield df.iloc[positions[start:start + chunk_rows]][columns]
+
+
+def _temp_file(path):
+    # Next to `path` (EXPORT_DIR for export_path() files), so publishing is an atomic rename
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    return tmp_path
+
+
+def _publish(tmp_path, path):
+    os.replace(tmp_path, path)
+    # Keep only the most recent exports of this format (older snapshot versions are never asked for again)
+    finished = sorted(
+        glob.glob(os.path.join(os.path.dirname(path), "*" + os.path.splitext(path)[1])),
+        key=os.path.getmtime, reverse=True
+    )
+    for old in finished[MAX_CACHED_EXPORTS:]:
+        try:
+            os.remove(old)
+        except OSError:
+            pass
+
+
+def stream_csv(df, positions, columns, path):
+    """Yield the CSV in chunks while also writing it to `path` (published only if complete)."""
+    tmp_path = _temp_file(path)
+    complete = False
+    try:
+        with open(tmp_path, "wb") as f:
+            header = pd.DataFrame(columns=columns).to_csv(index=False).encode("utf-8")
+            f.write(header)
+            yield header
+            for chunk in _chunks(df, positions, columns):
+                data = chunk.to_csv(index=False, header=False).encode("utf-8")
+                f.write(data)
+                yield data
+        complete = True
+        _publish(tmp_path, path)
+    finally:
+        if not complete and os.path.exists(tmp_path):
+            os.remove(tmp_path)  # Client went away mid-download
+
+
+def write_csv(df, positions, columns, path):
+    for _ in stream_csv(df, positions, columns, path):
+        pass
+    return path
+
+
+def _excel_rows(chunk):
+    # Cell values openpyxl understands: datetimes, numbers, strings, None for missing
+    cells = chunk.astype(object).where(chunk.notna(), None)
+    return cells.itertuples(index=False, name=None)
+
+
+def stream_file(path, chunk_size=FILE_CHUNK_BYTES):
+    """Yield a finished export in `chunk_size` blocks instead of reading it whole."""
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            yield block
+
+
+def write_xlsx(df, positions, columns, path):
+    tmp_path = _temp_file(path)
+    try:
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Dados")
+        sheet.append(columns)
+        for chunk in _chunks(df, positions, columns):
+            for row in _excel_rows(chunk):
+                sheet.append(row)
+        workbook.save(tmp_path)
+        _publish(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def stream_xlsx(df, positions, columns, path):
+    """Yield the workbook in chunks: written to `path` on the first iteration, then read back.
+
+    A zip can only be sent once the workbook is closed, so the first bytes
+    wait for the write; iterating lazily keeps that work out of the request
+    handler and neither step holds the file in memory.
+    """
+    write_xlsx(df, positions, columns, path)
+    yield from stream_file(path)
+
+
+def _latin1(text):
+    # Core PDF fonts only cover latin-1
+    return str(text).encode('latin-1', 'replace').decode('latin-1')
+
+
+def _report_text(values):
+    if values.dtype.kind == 'M':
+        return values.dt.strftime('%d/%m/%Y').fillna('')
+    return values.astype(object).where(values.notna(), '').astype(str)
+
+
+def report_summary(df, positions, done_statuses=DONE_STATUSES):
+    """Executive summary KPIs and per-project counts of the listed rows."""
+    rows = df.iloc[positions]
+    if 'Status_Category' in rows.columns:
+        done = (rows['Status_Category'] == 'Done').to_numpy()
+    else:
+        done = rows['Status'].isin(done_statuses).to_numpy()
+    points = rows['Story Points'].fillna(0).to_numpy() if 'Story Points' in rows.columns else np.zeros(len(rows))
+    kpis = [
+        ("Total de Tickets", len(rows)),
+        ("Projetos", rows['Projeto'].nunique()),
+        ("Concluídos", int(done.sum())),
+        ("Em Aberto", int((~done).sum())),
+        ("Bugs", int(rows['Tipo'].isin(['Bug', 'Bug Report']).sum())),
+        ("Story Points (entregues / total)", f"{points[done].sum():.0f} / {points.sum():.0f}")
+    ]
+    if 'Data Entrega' in rows.columns:
+        overdue = (rows['Data Entrega'] < pd.Timestamp.now().normalize()).to_numpy() & ~done
+        kpis.append(("Atrasados", int(overdue.sum())))
+    by_project = pd.DataFrame({'Projeto': rows['Projeto'].astype(object), 'done': done, 'points': points}) \
+        .groupby('Projeto').agg(total=('done', 'size'), done=('done', 'sum'), points=('points', 'sum')) \
+        .sort_values('total', ascending=False)
+    return kpis, by_project
+
+
+class _ReportPDF(FPDF):
+    def __init__(self, title, columns):
+        super().__init__(orientation='L', unit='mm', format='A4')
+        self.title = title
+        self.columns = columns
+        self.table_started = False
+        self.alias_nb_pages()
+        self.set_auto_page_break(True, margin=15)
+
+    def table_header(self):
+        self.set_font('Arial', 'B', 8)
+        self.set_fill_color(226, 232, 240)
+        for col, width in self.columns:
+            self.cell(width, 7, _latin1(col), 1, 0, 'L', True)
+        self.ln()
+        self.set_font('Arial', '', 7)
+
+    def header(self):
+        self.set_font('Arial', 'B', 9)
+        self.set_text_color(100, 116, 139)
+        self.cell(0, 6, _latin1(self.title), 0, 1, 'L')
+        self.set_text_color(0, 0, 0)
+        if self.table_started:
+            self.table_header()
+
+    def footer(self):
+        self.set_y(-12)
+        self.set_font('Arial', '', 7)
+        self.set_text_color(100, 116, 139)
+        self.cell(0, 6, _latin1(f"Página {self.page_no()}/{{nb}}"), 0, 0, 'R')
+        self.set_text_color(0, 0, 0)
+
+
+def write_pdf(df, positions, columns, path, title="Relatório de Projetos", subtitle=None,
+              done_statuses=DONE_STATUSES):
+    """Full PDF report: executive summary, per-project table, then every row (`columns` = REPORT_COLUMNS entries)."""
+    kpis, by_project = report_summary(df, positions, done_statuses)
+    pdf = _ReportPDF(title, columns)
+    pdf.add_page()
+
+    pdf.set_font('Arial', 'B', 16)
+    pdf.cell(0, 10, _latin1(title), 0, 1, 'C')
+    pdf.set_font('Arial', '', 9)
+    pdf.cell(0, 6, _latin1(f"Gerado em: {pd.Timestamp.now().strftime('%d/%m/%Y %H:%M')}"), 0, 1, 'C')
+    if subtitle:
+        pdf.multi_cell(0, 5, _latin1(subtitle), 0, 'C')
+    pdf.ln(4)
+
+    pdf.set_font('Arial', 'B', 12)
+    pdf.cell(0, 8, _latin1("Resumo Executivo"), 0, 1)
+    pdf.set_font('Arial', '', 10)
+    for label, value in kpis:
+        pdf.cell(80, 6, _latin1(label), 0, 0)
+        pdf.cell(0, 6, _latin1(value), 0, 1)
+    pdf.ln(4)
+
+    pdf.set_font('Arial', 'B', 9)
+    for label, width in (("Projeto", 80), ("Total", 30), ("Concluídos", 30), ("Em Aberto", 30), ("Story Points", 30)):
+        pdf.cell(width, 6, _latin1(label), 1)
+    pdf.ln()
+    pdf.set_font('Arial', '', 9)
+    for project, total, done, points in by_project.itertuples(name=None):
+        for value, width in ((project, 80), (total, 30), (int(done), 30),
+                             (total - int(done), 30), (f"{points:.0f}", 30)):
+            pdf.cell(width, 6, _latin1(value)[:45], 1)
+        pdf.ln()
+
+    # Every row; the header is repeated on each new page
+    pdf.add_page()
+    pdf.table_started = True
+    pdf.table_header()
+    names = [col for col, _ in columns]
+    limits = [int(width / 1.45) for _, width in columns]  # ~characters per cell at 7pt
+    for start in range(0, len(positions), CHUNK_ROWS):
+        chunk = df.iloc[positions[start:start + CHUNK_ROWS]]
+        texts = [_report_text(chunk[col]).to_numpy() for col in names]
+        for i in range(len(chunk)):
+            for values, (_, width), limit in zip(texts, columns, limits):
+                pdf.cell(width, 5, _latin1(values[i])[:limit], 1)
+            pdf.ln()
+
+    tmp_path = _temp_file(path)
+    try:
+        pdf.output(tmp_path, 'F')
+        _publish(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+WRITERS = {"csv": write_csv, "xlsx": write_xlsx, "pdf": write_pdf}
@@ -0,0 +1,118 @@
+"""Bitmap index over the filter dimensions of an issue snapshot.
+
+Built once per snapshot: for every distinct value of each filter dimension a
+packed bitmap (1 bit per row) marks the rows holding it ('Labels': the rows
+whose label set holds that label, see issue_table.label_matrix), and each
+date column (creation and resolution) is kept as a sorted array with its row
+order. A filter request then becomes bitmap unions (values of one dimension)
+and intersections (across dimensions), plus one binary-search range on
+'Criado' or 'Resolvido'.
+"""
+import numpy as np
+import pandas as pd
+
+from issue_table import label_matrix
+
+FILTER_DIMENSIONS = ['Projeto', 'Status', 'Tipo', 'Responsável', 'Cliente', 'Módulo', 'Fonte']
+LABEL_COLUMN = 'Labels'  # Multi-valued: a row matches each label of its set
+DATE_COLUMNS = ['Criado', 'Resolvido']
+
+
+class FilterIndex:
+    def __init__(self, df, dimensions=FILTER_DIMENSIONS, date_columns=DATE_COLUMNS):
+        self.df = df
+        self.n = len(df)
+        self.bitmaps = {}
+        self.has_missing = {}
+        for dim in dimensions:
+            if dim in df.columns:
+                self.bitmaps[dim] = self._build_bitmaps(df[dim])
+                self.has_missing[dim] = bool(df[dim].isna().any())
+        if LABEL_COLUMN in df.columns and isinstance(df[LABEL_COLUMN].dtype, pd.CategoricalDtype):
+            self.bitmaps[LABEL_COLUMN], self.has_missing[LABEL_COLUMN] = self._build_label_bitmaps(df[LABEL_COLUMN])
+
+        # {column: (row order, sorted dates)}; NaT sorts last, so date ranges never include
+        # rows without a date (e.g. unresolved issues for 'Resolvido')
+        self.dates = {}
+        for column in date_columns:
+            if column in df.columns:
+                dates = df[column].to_numpy(dtype='datetime64[ns]')
+                order = np.argsort(dates, kind='stable')
+                self.dates[column] = (order, dates[order])
+
+    def _build_bitmaps(self, column):
+        codes, values = pd.factorize(column, use_na_sentinel=True)
+        # Group row positions by code once instead of scanning the column per value
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(values) + 1))
+        bitmaps = {}
+        for code, value in enumerate(values):
+            bitmaps[value] = self._positions_to_bitmap(order[bounds[code]:bounds[code + 1]])
+        return bitmaps
+
+    def _build_label_bitmaps(self, labels):
+        # Label ids over the dictionary of label sets: a label's rows are those whose set code holds it
+        names, member = label_matrix(labels)
+        member = np.vstack([member, np.zeros((1, len(names)), dtype=bool)])  # Code -1 (missing) holds none
+        codes = labels.cat.codes.to_numpy()
+        bitmaps = {name: np.packbits(member[:, label_id][codes]) for label_id, name in enumerate(names)}
+        # Rows without labels are left out by any selection of labels
+        return bitmaps, not member.any(axis=1)[codes].all()
+
+    def _positions_to_bitmap(self, positions):
+        mask = np.zeros(self.n, dtype=bool)
+        mask[positions] = True
+        return np.packbits(mask)
+
+    def _empty(self):
+        return np.zeros((self.n + 7) // 8, dtype=np.uint8)
+
+    def selects_all(self, dim, values):
+        """True if `values` keeps every row (all values of `dim` selected and none missing).
+
+        Like mask(), a dimension the snapshot does not have restricts nothing.
+        """
+        if dim not in self.bitmaps:
+            return True
+        return not self.has_missing[dim] and self.bitmaps[dim].keys() <= set(values)
+
+    def select(self, dim, values):
+        """Union of the bitmaps of `values`; None means 'no restriction' (all values selected)."""
+        if self.selects_all(dim, values):
+            return None
+        index = self.bitmaps[dim]
+        wanted = [v for v in set(values) if v in index]
+        result = self._empty()
+        for value in wanted:
+            np.bitwise_or(result, index[value], out=result)
+        return result
+
+    def date_range(self, start=None, end=None, column='Criado'):
+        """Bitmap of rows with start <= `column` < end (binary search on the sorted dates)."""
+        order, sorted_dates = self.dates[column]
+        lo = 0 if start is None else np.searchsorted(sorted_dates, np.datetime64(pd.Timestamp(start), 'ns'), 'left')
+        if end is None:
+            # Everything up to (not including) the trailing NaTs
+            hi = len(sorted_dates) - int(np.isnat(sorted_dates).sum())
+        else:
+            hi = np.searchsorted(sorted_dates, np.datetime64(pd.Timestamp(end), 'ns'), 'left')
+        return self._positions_to_bitmap(order[lo:hi])
+
+    def mask(self, selections=None, date_start=None, date_end=None, date_column='Criado'):
+        """Boolean row mask for {dimension: [values]} selections and an optional [start, end) range of `date_column`."""
+        result = None
+        for dim, values in (selections or {}).items():
+            if values is None or dim not in self.bitmaps:
+                continue
+            bitmap = self.select(dim, values)
+            if bitmap is not None:
+                result = bitmap if result is None else np.bitwise_and(result, bitmap)
+        if date_start is not None or date_end is not None:
+            bitmap = self.date_range(date_start, date_end, date_column)
+            result = bitmap if result is None else np.bitwise_and(result, bitmap)
+        if result is None:
+            return np.ones(self.n, dtype=bool)
+        return np.unpackbits(result, count=self.n).astype(bool)
+
+    def filter(self, selections=None, date_start=None, date_end=None, date_column='Criado'):
+        return self.df[self.mask(selections, date_start, date_end, date_column)]
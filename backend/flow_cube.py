@@ -0,0 +1,97 @@
+"""Materialized daily flow cube of an issue snapshot.
+
+One row per (day, project, type, status category) with the number of issues
+created that day and the number delivered (status category 'Done', by
+resolution day), plus the story points of each. Burnup, velocity and the
+7-day averages are sums over slices of the cube, so their cost depends on
+the number of days and dimension values, not on the number of issues.
+
+Built once per snapshot and updated on delta syncs by subtracting the
+contribution of the replaced/pruned rows and adding the changed ones.
+"""
+import numpy as np
+import pandas as pd
+
+CUBE_DIMENSIONS = ['Projeto', 'Tipo', 'Status_Category']
+FLOW_COLUMNS = ['created', 'created_sp', 'delivered', 'delivered_sp']
+# Used when the frame has no 'Status_Category' column (the Streamlit app)
+DONE_STATUSES = ['Concluído', 'Done', 'Finalizado', 'Resolvido', 'Closed']
+MAX_CHART_POINTS = 120
+
+
+def _aggregate(df, done_statuses):
+    if 'Status_Category' in df.columns:
+        category = df['Status_Category'].astype(object)
+    else:
+        category = pd.Series(np.where(df['Status'].isin(done_statuses), 'Done', 'Active'), index=df.index)
+    dims = [df['Projeto'].astype(object), df['Tipo'].astype(object), category.rename('Status_Category')]
+    points = df['Story Points'].fillna(0)
+
+    created = pd.DataFrame({'created': 1, 'created_sp': points}).groupby(
+        [df['Criado'].dt.normalize().rename('Data'), *dims]).sum()
+
+    done = (category == 'Done') & df['Resolvido'].notna()
+    delivered = pd.DataFrame({'delivered': 1, 'delivered_sp': points[done]}).groupby(
+        [df.loc[done, 'Resolvido'].dt.normalize().rename('Data'), *(d[done] for d in dims)]).sum()
+
+    return created.join(delivered, how='outer').fillna(0).astype({'created': int, 'delivered': int})
+
+
+class FlowCube:
+    def __init__(self, df, done_statuses=DONE_STATUSES, table=None):
+        self.df = df
+        self.done_statuses = done_statuses
+        self.table = _aggregate(df, done_statuses) if table is None else table
+
+    def updated(self, df, removed, added):
+        """Cube for `df`, the previous snapshot minus the `removed` rows plus the `added` ones."""
+        table = pd.concat([
+            self.table,
+            -_aggregate(removed, self.done_statuses),
+            _aggregate(added, self.done_statuses)
+        ]).groupby(level=['Data', *CUBE_DIMENSIONS]).sum()
+        table = table[(table[FLOW_COLUMNS] != 0).any(axis=1)]
+        return FlowCube(df, self.done_statuses, table)
+
+    def covers(self, selections):
+        """True if every restricted dimension of `selections` is a cube dimension."""
+        return all(values is None or dim in CUBE_DIMENSIONS for dim, values in selections.items())
+
+    def daily(self, selections=None):
+        """Daily flow (one row per calendar day, gaps filled with 0) of the selected slice."""
+        table = self.table
+        for dim, values in (selections or {}).items():
+            if values is not None:
+                table = table[table.index.get_level_values(dim).isin(list(values))]
+        daily = table.groupby(level='Data')[FLOW_COLUMNS].sum()
+        if daily.empty:
+            return daily
+        return daily.asfreq('D', fill_value=0)
+
+
+def burnup_points(daily, max_points=MAX_CHART_POINTS):
+    """Cumulative scope/delivered, sampled down to at most `max_points` days (last day always kept)."""
+    cumulative = pd.DataFrame({
+        'date': daily.index,
+        'scope': daily['created'].cumsum().to_numpy(),
+        'delivered': daily['delivered'].cumsum().to_numpy()
+    })
+    if len(cumulative) > max_points:
+        step = -(-len(cumulative) // (max_points - 1))
+        positions = np.unique(np.r_[np.arange(0, len(cumulative), step), len(cumulative) - 1])
+        cumulative = cumulative.iloc[positions]
+    return cumulative
+
+
+def monthly_velocity(daily):
+    """Mean story points delivered per month, over the months with deliveries."""
+    monthly = daily.groupby(daily.index.to_period('M'))[['delivered', 'delivered_sp']].sum()
+    monthly = monthly[monthly['delivered'] > 0]
+    return float(monthly['delivered_sp'].mean()) if not monthly.empty else 0.0
+
+
+def daily_average(daily, column, start, end):
+    """Mean of `column` over the days in [start, end) that had any activity."""
+    window = daily.loc[(daily.index >= start) & (daily.index < end), column]
+    window = window[window > 0]
+    return float(window.mean()) if not window.empty else 0.0
@@ -0,0 +1,71 @@
+"""Compact in-memory representation of the issue table.
+
+Low-cardinality dimensions are stored as pandas categoricals (int codes plus
+one shared dictionary of values), so every cached copy stops repeating the
+same strings and `isin` filters / groupbys work on the integer codes.
+
+'Labels' is interned per label *set*: each row holds the code of its
+sorted, comma-joined label combination ("CLI_Cury, urgente"), and the
+distinct combinations are stored once in the categorical dictionary.
+label_matrix() then interns the individual labels of that dictionary
+(label -> id, plus a set x label membership bitmap), so selecting rows by
+label is a lookup by set code, never a substring match on the strings.
+"""
+import numpy as np
+import pandas as pd
+
+DIMENSION_COLUMNS = ['Status', 'Projeto', 'Tipo', 'Responsável', 'Sprint', 'Módulo', 'Prioridade',
+                     'Cliente', 'Status_Category', 'Jira_Status_Category', 'Fonte']
+LABEL_SEPARATOR = ', '
+
+
+def _label_set(labels):
+    if isinstance(labels, str):
+        return labels
+    if labels is None or isinstance(labels, float):  # missing (NaN)
+        return ''
+    return LABEL_SEPARATOR.join(sorted(labels))
+
+
+def encode_labels(labels):
+    """Intern a column of label lists as a categorical of label sets."""
+    if isinstance(labels.dtype, pd.CategoricalDtype):
+        return labels
+    return pd.Categorical([_label_set(l) for l in labels])
+
+
+def label_matrix(labels):
+    """(label names, bool array of label sets x labels) of an encoded 'Labels' column."""
+    sets = [label_set.split(LABEL_SEPARATOR) if label_set else [] for label_set in labels.cat.categories]
+    names = pd.Index(sorted({label for label_set in sets for label in label_set}))
+    member = np.zeros((len(sets), len(names)), dtype=bool)
+    member[np.repeat(np.arange(len(sets)), [len(label_set) for label_set in sets]),
+           names.get_indexer([label for label_set in sets for label in label_set])] = True
+    return names, member
+
+
+def label_mask(labels, selected):
+    """Bool mask of the rows of an encoded 'Labels' column holding any of the `selected` labels."""
+    names, member = label_matrix(labels)
+    ids = names.get_indexer(list(selected))
+    has_any = np.r_[member[:, ids[ids >= 0]].any(axis=1), False]  # Code -1 (missing) -> last entry
+    return has_any[labels.cat.codes.to_numpy()]
+
+
+def compact_issue_table(df):
+    """Return `df` with dimension columns (and Labels) dictionary-encoded.
+
+    Safe to call again after concat/upsert: columns that were decoded back to
+    plain strings are re-encoded and categoricals are rebuilt from the values
+    still present, dropping unused dictionary entries.
+    """
+    df = df.copy()
+    for col in DIMENSION_COLUMNS:
+        if col in df.columns:
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].cat.remove_unused_categories()
+            else:
+                df[col] = df[col].astype('category')
+    if 'Labels' in df.columns:
+        df['Labels'] = encode_labels(df['Labels'])
+    return df
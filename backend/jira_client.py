@@ -0,0 +1,193 @@
+"""Shared, long-lived async client for the Jira REST API.
+
+One httpx.AsyncClient per Jira site, reused by every fetch. Connections are
+kept alive and pooled (HTTP/2 when the optional `h2` package is installed,
+so concurrent requests share one TLS connection), and timeouts are explicit.
+HTTP 429/503 answers and dropped connections are retried, honouring
+Retry-After.
+
+All clients live on one background event loop ("jira-io"), so they can be
+used from anywhere:
+
+    client = get_client(**load_settings(SECRETS_PATH))
+    total = await client.count(jql)              # from async code, any loop
+    total = client.run(client.count(jql))        # from threads / Streamlit
+"""
+import asyncio
+import os
+import threading
+from collections import Counter
+
+import httpx
+import toml
+
+try:
+    import h2  # noqa: F401
+    HTTP2 = True
+except ImportError:  # Optional: without it the pool speaks HTTP/1.1 keep-alive
+    HTTP2 = False
+
+API_PATH = "/rest/api/2/"
+TIMEOUT = 30.0  # Seconds per read/write/pool wait
+CONNECT_TIMEOUT = 10.0
+MAX_CONNECTIONS = 16
+MAX_RETRIES = 5
+RETRY_STATUSES = (429, 503)
+MAX_RETRY_DELAY = 30.0
+CHANGELOG_PAGE_SIZE = 100
+CLIENT_OPTIONS = ("timeout", "connect_timeout", "max_connections", "max_retries", "http2")
+
+_LOOP = None
+_LOOP_LOCK = threading.Lock()
+_CLIENTS = {}  # (url, username, token) -> JiraClient
+_CLIENTS_LOCK = threading.Lock()
+
+
+def _io_loop():
+    """The event loop every client runs on, started on first use."""
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="jira-io", daemon=True).start()
+            _LOOP = loop
+        return _LOOP
+
+
+def clients():
+    """The shared clients created so far."""
+    with _CLIENTS_LOCK:
+        return list(_CLIENTS.values())
+
+
+def run(coro):
+    """Run a coroutine on the Jira loop and wait for it (for synchronous callers)."""
+    return asyncio.run_coroutine_threadsafe(coro, _io_loop()).result()
+
+
+def load_settings(secrets_path):
+    """Jira url/username/token (and optional client options) from the [jira] section of
+    secrets.toml, else from JIRA_* env vars (e.g. the local mock_jira.py server)."""
+    if os.path.exists(secrets_path):
+        return dict(toml.load(secrets_path)["jira"])
+    if os.environ.get("JIRA_URL"):
+        return {
+            "url": os.environ["JIRA_URL"],
+            "username": os.environ.get("JIRA_USERNAME", ""),
+            "token": os.environ.get("JIRA_TOKEN", "")
+        }
+    raise FileNotFoundError("Secrets file not found")
+
+
+def get_client(url, username, token, **options):
+    """The shared client for this site and credentials (created on first call).
+
+    Other keys of the settings (e.g. the rest of a secrets section) are ignored
+    unless they are one of CLIENT_OPTIONS.
+    """
+    key = (url.rstrip("/"), username, token)
+    options = {name: value for name, value in options.items() if name in CLIENT_OPTIONS}
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            client = JiraClient(*key, **options)
+            _CLIENTS[key] = client
+        return client
+
+
+def close_clients():
+    with _CLIENTS_LOCK:
+        clients = list(_CLIENTS.values())
+        _CLIENTS.clear()
+    for client in clients:
+        client.run(client.aclose())
+
+
+class JiraClient:
+    def __init__(self, url, username, token, timeout=TIMEOUT, connect_timeout=CONNECT_TIMEOUT,
+                 max_connections=MAX_CONNECTIONS, max_retries=MAX_RETRIES, http2=HTTP2):
+        self.url = url.rstrip("/")
+        self.max_retries = max_retries
+        # (endpoint, outcome) -> count; outcome is "ok", the HTTP status of a failed/retried
+        # answer (e.g. "429") or "transport_error"
+        self.requests = Counter()
+        self.loop = _io_loop()
+        self._http = httpx.AsyncClient(
+            base_url=self.url + API_PATH,
+            auth=(username, token),
+            http2=http2 and HTTP2,
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            headers={"Accept": "application/json"}
+        )
+
+    # --- Loop bridging ---
+
+    async def _call(self, coro):
+        # The connection pool belongs to the client's loop: hop there unless already on it
+        if asyncio.get_running_loop() is self.loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self.loop))
+
+    def run(self, coro):
+        return run(coro)
+
+    async def _request(self, method, path, endpoint, **kwargs):
+        attempt = 0
+        while True:
+            try:
+                response = await self._http.request(method, path, **kwargs)
+            except httpx.TransportError:
+                self.requests[endpoint, "transport_error"] += 1
+                if attempt >= self.max_retries:
+                    raise
+                delay = min(0.5 * 2 ** attempt, MAX_RETRY_DELAY)
+            else:
+                self.requests[endpoint, "ok" if response.is_success else str(response.status_code)] += 1
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    response.raise_for_status()
+                    return response.json()
+                retry_after = response.headers.get("Retry-After", "")
+                delay = min(float(retry_after) if retry_after.isdigit() else 0.5 * 2 ** attempt, MAX_RETRY_DELAY)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    # --- API ---
+
+    async def search(self, jql, fields, start_at=0, max_results=100, expand=None):
+        """One page of /search: {'startAt', 'maxResults', 'total', 'issues': [raw issue JSON]}.
+
+        `expand="changelog"` embeds each issue's history (possibly truncated, see changelog()).
+        """
+        params = {
+            "jql": jql,
+            "startAt": start_at,
+            "maxResults": max_results,
+            "fields": fields if isinstance(fields, str) else ",".join(fields),
+            "validateQuery": "true"
+        }
+        if expand:
+            params["expand"] = expand
+        return await self._call(self._request("GET", "search", "search", params=params))
+
+    async def count(self, jql):
+        """Number of issues matching `jql` (no issues are transferred)."""
+        page = await self._call(self._request("GET", "search", "count", params={"jql": jql, "maxResults": 0, "fields": "key"}))
+        return page.get("total", 0)
+
+    async def changelog(self, key, page_size=CHANGELOG_PAGE_SIZE):
+        """Every changelog entry of issue `key`, oldest first."""
+        async def fetch():
+            entries, start_at = [], 0
+            while True:
+                page = await self._request("GET", f"issue/{key}/changelog", "changelog",
+                                           params={"startAt": start_at, "maxResults": page_size})
+                values = page.get("values", [])
+                entries.extend(values)
+                start_at += len(values)
+                if page.get("isLast", True) or not values or start_at >= page.get("total", 0):
+                    return entries
+        return await self._call(fetch())
+
+    async def aclose(self):
+        await self._call(self._http.aclose())
@@ -0,0 +1,59 @@
+"""Concurrent paginated fetch engine for Jira searches.
+
+`jira.search_issues(jql, maxResults=0)` walks the result pages one after the
+other. Here the first page is read to learn the total, then the remaining
+`startAt` pages are requested concurrently on the shared async client (see
+jira_client.py) and put back in order. Changelogs embedded by
+`expand=changelog` are capped by Jira; complete_changelogs() downloads the
+full history of those issues.
+"""
+import asyncio
+
+PAGE_SIZE = 100  # Jira caps maxResults at 100 for most instances
+MAX_WORKERS = 8  # Pages in flight; keep it modest: Jira rate-limits aggressive clients (HTTP 429)
+
+
+async def fetch_all_issues(client, jql, fields, page_size=PAGE_SIZE, max_concurrency=MAX_WORKERS, expand=None):
+    """Raw JSON of every issue matching `jql`, in JQL order: at most `max_concurrency` pages in flight."""
+    first = await client.search(jql, fields, 0, page_size, expand)
+    issues = list(first.get('issues', []))
+    total = first.get('total', len(issues))
+    page_size = first.get('maxResults') or page_size
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def page(start):
+        async with semaphore:
+            return await client.search(jql, fields, start, page_size, expand)
+
+    # gather() keeps submission order, so pages come back sorted
+    for result in await asyncio.gather(*(page(start) for start in range(page_size, total, page_size))):
+        issues.extend(result.get('issues', []))
+    return _unique(issues)
+
+
+async def complete_changelogs(client, issues, max_concurrency=MAX_WORKERS):
+    """Replace truncated embedded changelogs with the issue's full history (in place); returns how many."""
+    truncated = [raw for raw in issues
+                 if raw.get('changelog') and raw['changelog'].get('total', 0) > len(raw['changelog'].get('histories', []))]
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def complete(raw):
+        async with semaphore:
+            histories = await client.changelog(raw['key'])
+        raw['changelog'] = {'startAt': 0, 'maxResults': len(histories), 'total': len(histories), 'histories': histories}
+
+    await asyncio.gather(*(complete(raw) for raw in truncated))
+    return len(truncated)
+
+
+def _unique(issues):
+    # Issues can shift between pages while we read them; keep the first occurrence
+    seen = set()
+    unique = []
+    for raw in issues:
+        if raw['key'] not in seen:
+            seen.add(raw['key'])
+            unique.append(raw)
+    return unique
+
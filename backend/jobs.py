@@ -0,0 +1,54 @@
+"""Background job queue for on-demand artifacts (e.g. PDF reports).
+
+Jobs run on a small worker pool, keyed by the cache key of what they
+produce: submitting a key that is already queued or running returns the
+same Future (single-flight, like BackgroundRefresher.trigger), so many
+clicks on "generate" still build one report.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_FINISHED_JOBS = 50
+
+
+class JobQueue:
+    def __init__(self, max_workers=1, name="jobs"):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._jobs = {}  # key -> Future, in submission order
+
+    def submit(self, key, fn, *args):
+        """Queue fn(*args) under `key` unless a job for it is pending; return its Future."""
+        with self._lock:
+            future = self._jobs.get(key)
+            if future is None or future.done():
+                self._jobs.pop(key, None)
+                future = self._executor.submit(fn, *args)
+                self._jobs[key] = future
+                self._forget_finished()
+            return future
+
+    def _forget_finished(self):
+        finished = [key for key, future in self._jobs.items() if future.done()]
+        for key in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[key]
+
+    def forget(self, key):
+        """Drop a finished job (e.g. its artifact was evicted), so state() is None until it is submitted again."""
+        with self._lock:
+            future = self._jobs.get(key)
+            if future is not None and future.done():
+                del self._jobs[key]
+
+    def state(self, key):
+        """None (unknown), 'running' (queued or running), 'done' or 'error'."""
+        future = self._jobs.get(key)
+        if future is None:
+            return None
+        if not future.done():
+            return "running"
+        return "error" if future.exception() is not None else "done"
+
+    def error(self, key):
+        future = self._jobs.get(key)
+        return future.exception() if future is not None and future.done() else None
@@ -1,14 +1,34 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Header, Response
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 import pandas as pd
-from jira import JIRA
-import toml
 import os
-from datetime import datetime, timedelta
+import time
+from datetime import date, datetime, timedelta
 import numpy as np
 
+from export import EXPORT_DIR, EXPORT_MEDIA_TYPES, REPORT_COLUMNS, cached_export, export_path, stream_csv, stream_xlsx, write_pdf
+from filter_index import FilterIndex
+from flow_cube import FlowCube, burnup_points, daily_average
+from issue_table import compact_issue_table
+from jobs import JobQueue
+from jira_client import close_clients
+from metrics import (CACHE_REQUESTS, NOT_MODIFIED, SNAPSHOT_AGE, SNAPSHOT_ISSUES, SYNC_FAILURES, SYNC_SECONDS,
+                     observe_fetch, observe_response, render as render_metrics, timed)
+from normalize import JIRA_CATEGORY_COLUMN, SOURCE_COLUMN, normalize_issues, status_category_keys
+from periods import ALL_TIME, CUSTOM_PERIOD, DATE_FIELDS, PERIOD_PRESETS, period_days, period_range
+from refresher import BackgroundRefresher
+from response_cache import ResponseCache, etag_matches
+from wire_format import ARROW, ENCODERS, RECORDS, choose_encoding, compress, encode_json, negotiate_format
+from snapshot import snapshot_path, save_snapshot, load_snapshot
+from sort_index import SortIndex, decode_cursor, encode_cursor, parse_sort
+from sources import DEFAULT_SOURCE, fetch_sources, load_sources
+from status_flow import chart_days, cumulative_flow, flow_window, status_intervals, time_in_status
+from sync import build_delta_jql, upsert_issues, prune_window, same_issues
+from transitions import prune_transitions, status_transitions, upsert_transitions
+
 app = FastAPI(title="Jira Dashboard API")
 
 # Enable CORS for React Frontend
@@ -18,100 +38,260 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let the browser read the cache/snapshot headers of /api/dashboard
+    expose_headers=["ETag", "X-Snapshot-Updated", "X-Snapshot-Age", "X-Snapshot-Refreshing"],
 )
 
+@app.middleware("http")
+async def record_request_metrics(request, call_next):
+    # Duration (until the response starts) and size of every response, by route template
+    t0 = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    size = response.headers.get("content-length")
+    observe_response(
+        request.method, route.path if route else "unmatched", response.status_code, time.perf_counter() - t0,
+        response.headers.get("content-type", "").split(";")[0], int(size) if size else None
+    )
+    return response
+
 # --- Configuration & Auth ---
 SECRETS_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), ".streamlit", "secrets.toml")
 
-def get_jira_client():
-    try:
-        if os.path.exists(SECRETS_PATH):
-            secrets = toml.load(SECRETS_PATH)
-            return JIRA(
-                server=secrets["jira"]["url"],
-                basic_auth=(secrets["jira"]["username"], secrets["jira"]["token"])
-            )
-        else:
-            # Fallback to env vars if needed
-            raise FileNotFoundError("Secrets file not found")
-    except Exception as e:
-        print(f"Error connecting to Jira: {e}")
-        return None
-
 # --- Data Cache (Simple In-Memory for MVP) ---
 # In a real production app, use Redis or similar.
 CACHE = {
     "data": None,
-    "last_updated": None
+    "last_updated": None,
+    "last_full_sync": None,
+    "index": None,  # FilterIndex over "data"
+    "cube": None,  # FlowCube over "data"
+    "sort_index": None,  # SortIndex over "data" (built on first /api/issues call)
+    "version": 0,  # Bumped whenever "data" is replaced (also in data.attrs["version"])
+    "source_synced": {},  # Jira source name -> time of its last successful fetch
+    "transitions": None,  # Status-transition events of "data" (transitions.py), if any source ingests changelogs
+    "status_intervals": None  # (data, transitions, status visits) built from them on first /api/status-flow call
 }
 CACHE_TTL = 600  # 10 minutes (Use 'Refresh' button for real-time)
+SNAPSHOT_PATH = snapshot_path("backend_issues")
+TRANSITIONS_PATH = snapshot_path("backend_transitions")
+TIMEZONE = 'America/Sao_Paulo'
+FULL_SYNC_INTERVAL = 24 * 3600  # Full re-download once a day (catches deleted/moved issues)
+# Serialized /api/dashboard bodies keyed by (data version, filters, day, media type)
+DASHBOARD_CACHE = ResponseCache(max_entries=256, max_bytes=64 * 1024 * 1024)
+STATUS_FLOW_CACHE = ResponseCache(max_entries=64, max_bytes=32 * 1024 * 1024)
+
+BASE_JQL = 'statusCategory != Done OR created >= -730d'
+JIRA_FIELDS = "summary,assignee,status,created,project,customfield_10031,customfield_10020,duedate,priority,issuetype,resolutiondate,updated,timeoriginalestimate,timespent,components,labels"
+ISSUE_COLUMNS = ['Chave', 'Resumo', 'Tipo', 'Status', 'Prioridade', 'Responsável', 'Projeto', 'Criado',
+                 'Resolvido', 'Atualizado', 'Story Points', 'Sprint', 'Módulo', 'Data Entrega']
+
+def issues_to_dataframe(raw_issues, source=None):
+    # Convert to Brazil Time, with the source's custom field mapping
+    source = source or {"name": DEFAULT_SOURCE, "fields": None}
+    df = normalize_issues(raw_issues, tz=TIMEZONE, field_map=source["fields"])[ISSUE_COLUMNS]
+    
+    # Status Categories
+    STATUS_DONE = ['Concluído', 'Done', 'Finalizado', 'Resolvido', 'Closed']
+    return df.assign(
+        Status_Category=np.where(df['Status'].isin(STATUS_DONE), 'Done', 'Active'),
+        # Jira's category, which the sync window JQL filters on (see sync.prune_window)
+        **{JIRA_CATEGORY_COLUMN: status_category_keys(raw_issues), SOURCE_COLUMN: source["name"]}
+    )
 
 def get_data(force_refresh=False):
-    now = datetime.now()
-    if not force_refresh and CACHE["data"] is not None and CACHE["last_updated"] is not None:
-        if (now - CACHE["last_updated"]).total_seconds() < CACHE_TTL:
-            return CACHE["data"]
+    if force_refresh or CACHE["data"] is None:
+        # Join the in-flight sync (or start one) and wait for it
+        try:
+            REFRESHER.trigger().result()
+        except Exception as e:
+            if CACHE["data"] is None:
+                raise
+            print(f"Refresh failed, serving last good snapshot: {e}")
+    elif snapshot_age() >= CACHE_TTL:
+        # Stale-while-revalidate: answer now with the last good snapshot, refresh in background
+        REFRESHER.trigger()
+    return CACHE["data"]
+
+def snapshot_age():
+    if CACHE["last_updated"] is None:
+        return None
+    return (datetime.now() - CACHE["last_updated"]).total_seconds()
+
+def snapshot_info():
+    age = snapshot_age()
+    return {
+        "last_updated": CACHE["last_updated"].isoformat() if CACHE["last_updated"] else None,
+        "age_seconds": int(age) if age is not None else None,
+        "refreshing": REFRESHER.in_flight()
+    }
 
-    jira = get_jira_client()
-    if not jira:
+def get_jira_sources():
+    # Jira sites/boards to ingest; each gets a pooled async client (see sources.py, jira_client.py)
+    try:
+        return load_sources(SECRETS_PATH)
+    except Exception as e:
+        print(f"Error reading Jira sources: {e}")
+        return None
+
+def sync_from_jira(now):
+    t0 = time.perf_counter()
+    sources = get_jira_sources()
+    if not sources:
         raise HTTPException(status_code=500, detail="Could not connect to Jira")
 
-    print("Fetching data from Jira...")
-    jql = 'statusCategory != Done OR created >= -730d ORDER BY created DESC'
-    fields = "summary,assignee,status,created,project,customfield_10031,customfield_10020,duedate,priority,issuetype,resolutiondate,updated,timeoriginalestimate,timespent,components,labels"
+    df = previous = CACHE["data"]
+    full_sync = (
+        df is None
+        or CACHE["last_full_sync"] is None
+        or (now - CACHE["last_full_sync"]).total_seconds() >= FULL_SYNC_INTERVAL
+    )
+    # Each source syncs from its own last success: a new source (or one that has never
+    # been fetched, or whose status history is not stored yet) gets a full download,
+    # the others only their changes
+    synced = CACHE["source_synced"]
+    full = {source["name"] for source in sources
+            if full_sync or source["name"] not in synced or (source["changelog"] and CACHE["transitions"] is None)}
     
-    issues = jira.search_issues(jql, maxResults=0, fields=fields)
+    def jql_for(source):
+        if source["name"] in full:
+            return f"{BASE_JQL} ORDER BY created DESC"
+        return build_delta_jql(synced[source["name"]], now)
     
-    data = []
-    for issue in issues:
-        assignee = issue.fields.assignee.displayName if issue.fields.assignee else 'Não Atribuído'
-        story_points = getattr(issue.fields, 'customfield_10031', 0) or 0
-        sprint_field = getattr(issue.fields, 'customfield_10020', None)
-        sprint_name = sprint_field[0].name if sprint_field else 'Backlog'
-        
-        data.append({
-            'Chave': issue.key,
-            'Resumo': issue.fields.summary,
-            'Tipo': issue.fields.issuetype.name,
-            'Status': issue.fields.status.name,
-            'Prioridade': issue.fields.priority.name if issue.fields.priority else 'Medium',
-            'Responsável': assignee,
-            'Projeto': issue.fields.project.name,
-            'Criado': issue.fields.created,
-            'Resolvido': issue.fields.resolutiondate,
-            'Atualizado': issue.fields.updated,
-            'Story Points': float(story_points),
-            'Sprint': sprint_name,
-            'Módulo': issue.fields.components[0].name if issue.fields.components else 'Geral',
-            'Data Entrega': issue.fields.duedate
-        })
+    print(f"Fetching data from Jira ({len(full)} full, {len(sources) - len(full)} delta of {len(sources)} sources)...")
+    results = fetch_sources(sources, jql_for, JIRA_FIELDS, on_fetched=observe_fetch)
+    fetched = {name: issues for name, issues in results.items() if not isinstance(issues, Exception)}
+    for name, error in results.items():
+        if name not in fetched:
+            print(f"[{name}] fetch failed, keeping its last good rows: {error}")
+    if not fetched:
+        raise next(iter(results.values()))
     
-    df = pd.DataFrame(data)
+    changed = pd.concat([issues_to_dataframe(fetched[source["name"]], source)
+                         for source in sources if source["name"] in fetched], ignore_index=True)
+    print(f"{len(changed)} issues fetched")
+    if previous is None:
+        df = changed.sort_values('Criado', ascending=False, ignore_index=True)
+    else:
+        # Rows of removed and of re-downloaded sources are dropped; delta sources are upserted by key
+        kept = [source["name"] for source in sources if source["name"] not in fetched or source["name"] not in full]
+        df = upsert_issues(previous[previous[SOURCE_COLUMN].isin(kept)], changed)
+    df = compact_issue_table(prune_window(df, now))
     
-    # Pre-processing (Convert to Brazil Time)
-    tz = 'America/Sao_Paulo'
-    df['Criado'] = pd.to_datetime(df['Criado'], utc=True).dt.tz_convert(tz).dt.tz_localize(None)
-    df['Resolvido'] = pd.to_datetime(df['Resolvido'], utc=True).dt.tz_convert(tz).dt.tz_localize(None)
-    df['Atualizado'] = pd.to_datetime(df['Atualizado'], utc=True).dt.tz_convert(tz).dt.tz_localize(None)
-    df['Data Entrega'] = pd.to_datetime(df['Data Entrega'])
+    cube = CACHE["cube"]
+    if full_sync or full or cube is None or cube.df is not previous:
+        cube = FlowCube(df)
+    else:
+        # Replaced or pruned rows leave the cube, changed rows enter it
+        removed = previous[same_issues(previous, changed) | ~same_issues(previous, df)]
+        cube = cube.updated(df, removed, df[same_issues(df, changed)])
     
-    # Status Categories
-    STATUS_DONE = ['Concluído', 'Done', 'Finalizado', 'Resolvido', 'Closed']
-    df['Status_Category'] = df['Status'].apply(lambda x: 'Done' if x in STATUS_DONE else 'Active')
+    transitions = update_transitions(sources, fetched, changed, df)
     
+    if full_sync:
+        CACHE["last_full_sync"] = now
+    names = {source["name"] for source in sources}
+    CACHE["source_synced"] = {name: at for name, at in synced.items() if name in names} | dict.fromkeys(fetched, now)
+    CACHE["version"] += 1
+    df.attrs["version"] = CACHE["version"]  # Travels with the frame, so readers never mix versions
+    CACHE["index"] = FilterIndex(df)
+    CACHE["cube"] = cube
+    CACHE["transitions"] = transitions
     CACHE["data"] = df
     CACHE["last_updated"] = now
+    
+    try:
+        save_snapshot(df, SNAPSHOT_PATH, last_sync=now, last_full_sync=CACHE["last_full_sync"])
+        if transitions is not None:
+            save_snapshot(transitions, TRANSITIONS_PATH, last_sync=now)
+        elif os.path.exists(TRANSITIONS_PATH):
+            os.remove(TRANSITIONS_PATH)  # No source ingests changelogs any more
+    except Exception as e:
+        print(f"Error saving snapshot: {e}")
+    SYNC_SECONDS.labels("full" if full_sync else "delta").observe(time.perf_counter() - t0)
     return df
 
+def update_transitions(sources, fetched, changed, df):
+    # Issues re-fetched from changelog sources replace their events; events of issues that left
+    # the table (pruned, deleted) or of sources that stopped ingesting changelogs are dropped
+    with_history = [source["name"] for source in sources if source["changelog"]]
+    if not with_history:
+        return None
+    if CACHE["transitions"] is None and not any(name in fetched for name in with_history):
+        return None
+    transitions = upsert_transitions(
+        CACHE["transitions"],
+        changed[changed[SOURCE_COLUMN].isin(with_history)],
+        [status_transitions(fetched[name], name, tz=TIMEZONE) for name in with_history if name in fetched]
+    )
+    transitions = transitions[transitions[SOURCE_COLUMN].isin(with_history)]
+    print(f"{len(transitions)} status transitions stored")
+    return prune_transitions(transitions, df)
+
+def sync_now():
+    try:
+        return sync_from_jira(datetime.now())
+    except Exception:
+        SYNC_FAILURES.inc()
+        raise
+
+# Reloads the data before CACHE_TTL expires; concurrent triggers share one fetch
+REFRESHER = BackgroundRefresher(sync_now, interval=CACHE_TTL * 0.8)
+
+SNAPSHOT_AGE.set_function(lambda: snapshot_age() if CACHE["last_updated"] is not None else float("nan"))
+SNAPSHOT_ISSUES.set_function(lambda: len(CACHE["data"]) if CACHE["data"] is not None else 0)
+
+@app.on_event("startup")
+def warm_start():
+    # Serve the last persisted snapshot right away, then catch up with Jira in the background
+    snapshot = load_snapshot(SNAPSHOT_PATH)
+    if snapshot is not None:
+        # Snapshots from before federation hold a single source
+        if SOURCE_COLUMN not in snapshot["data"].columns:
+            snapshot["data"][SOURCE_COLUMN] = pd.Categorical([DEFAULT_SOURCE] * len(snapshot["data"]))
+        CACHE["version"] += 1
+        snapshot["data"].attrs["version"] = CACHE["version"]
+        CACHE["index"] = FilterIndex(snapshot["data"])
+        CACHE["cube"] = FlowCube(snapshot["data"])
+        CACHE["data"] = snapshot["data"]
+        CACHE["last_updated"] = snapshot["last_sync"]
+        transitions = load_snapshot(TRANSITIONS_PATH)
+        if transitions is not None:
+            CACHE["transitions"] = transitions["data"]
+        CACHE["last_full_sync"] = snapshot["last_full_sync"]
+        CACHE["source_synced"] = dict.fromkeys(snapshot["data"][SOURCE_COLUMN].unique(), snapshot["last_sync"])
+        print(f"Loaded snapshot with {len(snapshot['data'])} issues (synced {snapshot['last_sync']})")
+    REFRESHER.start()
+
+@app.on_event("shutdown")
+def stop_refresher():
+    REFRESHER.stop()
+    close_clients()
+
 # --- Endpoints ---
 
 class FilterParams(BaseModel):
     projects: Optional[List[str]] = None
     statuses: Optional[List[str]] = None
     types: Optional[List[str]] = None
-    period: str = "Tudo" # Tudo, Este Mês, Mês Passado, etc.
+    sources: Optional[List[str]] = None  # Jira sources ('Fonte'), when several are federated
+    period: str = Field(ALL_TIME, pattern=f"^({'|'.join(PERIOD_PRESETS)})$")  # Tudo, Este Mês, Mês Passado, etc.
+    start_date: Optional[date] = None  # "Personalizado" range, both days included
+    end_date: Optional[date] = None
+    date_field: str = Field("created", pattern="^(created|resolved)$")  # Period of creation, or of resolution (flow)
     force_refresh: bool = False
 
+class IssueQuery(FilterParams):
+    sort: List[str] = ["-Criado"]  # Column names, "-" prefix for descending
+    columns: Optional[List[str]] = None  # Projection (default: all)
+    cursor: Optional[str] = None  # next_cursor of the previous page
+    limit: int = Field(100, ge=1, le=1000)
+
+class ExportQuery(FilterParams):
+    format: str = Field("csv", pattern="^(csv|xlsx)$")
+    sort: List[str] = ["-Criado"]
+    columns: Optional[List[str]] = None
+
 @app.get("/api/filters")
 def get_filters():
     df = get_data()
@@ -119,128 +299,164 @@ def get_filters():
         "projects": sorted(df['Projeto'].unique().tolist()),
         "statuses": sorted(df['Status'].unique().tolist()),
         "types": sorted(df['Tipo'].unique().tolist()),
-        "assignees": sorted(df['Responsável'].unique().tolist())
+        "assignees": sorted(df['Responsável'].unique().tolist()),
+        "sources": sorted(df[SOURCE_COLUMN].unique().tolist()),
+        "periods": PERIOD_PRESETS,
+        "snapshot": snapshot_info()
     }
 
-@app.post("/api/dashboard")
-def get_dashboard_data(filters: FilterParams):
-    df = get_data(force_refresh=filters.force_refresh)
-    
-    # Apply Filters
-    if filters.projects and "Todos" not in filters.projects:
-        df = df[df['Projeto'].isin(filters.projects)]
-    if filters.statuses:
-        df = df[df['Status'].isin(filters.statuses)]
-    if filters.types:
-        df = df[df['Tipo'].isin(filters.types)]
-        
-    # Time Filtering (Simplified for this example)
-    today = datetime.today()
-    if filters.period == "Este Mês":
-        df = df[df['Criado'] >= today.replace(day=1)]
-    # ... add other period logic as needed
-    
-    # --- KPIs ---
+# --- Dashboard Stages ---
+# Each stage takes the (filtered) issue DataFrame and returns JSON-ready data,
+# so they can be timed/benchmarked individually (see benchmarks/bench_pipeline.py).
+
+def snapshot_structure(name, df, build):
+    # CACHE[name] is built for the served snapshot. A request still holding a frame that a sync
+    # has since replaced gets a throwaway build, so it never overwrites the new snapshot's
+    built = CACHE[name]
+    if built is None or built.df is not df:
+        built = build(df)
+        if df is CACHE["data"]:
+            CACHE[name] = built
+    return built
+
+def get_filter_index(df):
+    # Built after each sync; rebuilt here only if `df` is not the indexed snapshot
+    return snapshot_structure("index", df, FilterIndex)
+
+def get_sort_index(df):
+    return snapshot_structure("sort_index", df, SortIndex)
+
+def filters_key(filters):
+    # Hashable identity of the filters that shape the filtered DataFrame
+    return (
+        tuple(sorted(filters.projects)) if filters.projects else None,
+        tuple(sorted(filters.statuses)) if filters.statuses else None,
+        tuple(sorted(filters.types)) if filters.types else None,
+        tuple(sorted(filters.sources)) if filters.sources else None,
+        filters.period,
+        (filters.start_date, filters.end_date) if filters.period == CUSTOM_PERIOD else None,
+        filters.date_field
+    )
+
+def get_flow_cube(df):
+    # Same contract as get_filter_index: the cube is materialized per snapshot
+    return snapshot_structure("cube", df, FlowCube)
+
+def filter_selections(filters):
+    return {
+        "Projeto": filters.projects if filters.projects and "Todos" not in filters.projects else None,
+        "Status": filters.statuses or None,
+        "Tipo": filters.types or None,
+        SOURCE_COLUMN: filters.sources or None
+    }
+
+def date_filter(filters):
+    # FilterIndex.mask() arguments of the period: a [start, end) range of creation or resolution dates
+    start, end = period_range(filters.period, start=filters.start_date, end=filters.end_date)
+    return {"date_start": start, "date_end": end, "date_column": DATE_FIELDS[filters.date_field]}
+
+def has_period(filters):
+    bounds = date_filter(filters)
+    return bounds["date_start"] is not None or bounds["date_end"] is not None
+
+def apply_filters(df, filters):
+    index = get_filter_index(df)
+    return index.filter(filter_selections(filters), **date_filter(filters))
+
+def compute_flow(df, filters):
+    # Daily flow of the filtered issues: a slice of the snapshot's cube when the filters only
+    # restrict cube dimensions, else aggregated from the filtered rows. A period (of creation or
+    # resolution dates) changes which issues count, so it always takes the second path.
+    index = get_filter_index(df)
+    selections = {dim: values for dim, values in filter_selections(filters).items()
+                  if values is not None and not index.selects_all(dim, values)}
+    cube = get_flow_cube(df)
+    if not has_period(filters) and cube.covers(selections):
+        return cube.daily(selections)
+    return FlowCube(apply_filters(df, filters)).daily()
+
+def compute_kpis(df):
     total_issues = len(df)
     active_issues = len(df[df['Status_Category'] == 'Active'])
     done_issues = len(df[df['Status_Category'] == 'Done'])
     bugs = len(df[df['Tipo'].isin(['Bug', 'Bug Report'])])
-    
-    # --- Charts Data Preparation ---
-    
-    # 1. Status by Project
-    status_by_project = df.groupby(['Projeto', 'Status']).size().reset_index(name='count')
-    
-    # 2. Burndown (Burnup: Scope vs Delivered)
-    df_burn = df.sort_values('Criado')
-    df_burn['count'] = 1
-    df_burn['cumsum'] = df_burn['count'].cumsum()
-    
-    # Scope Line
-    scope_data = df_burn[['Criado', 'cumsum']].rename(columns={'cumsum': 'scope'}).to_dict(orient='records')
-    
-    # Delivered Line
-    df_done = df[df['Status_Category'] == 'Done'].copy()
-    delivered_data = []
-    if not df_done.empty:
-        df_done = df_done.sort_values('Resolvido').dropna(subset=['Resolvido'])
-        df_done['count'] = 1
-        df_done['cumsum_done'] = df_done['count'].cumsum()
-        delivered_data = df_done[['Resolvido', 'cumsum_done']].rename(columns={'Resolvido': 'Criado', 'cumsum_done': 'delivered'}).to_dict(orient='records')
-    
-    # Merge for chart (Simplified merge by concatenating and letting frontend handle x-axis or just sending two series)
-    # Ideally, we align them on a common timeline. For simplicity, we'll send two lists or a combined list if we had a common date index.
-    # Let's just send a combined list sorted by date for easier frontend consumption, or separate series.
-    # Recharts prefers a single array with keys like { date: '...', scope: 10, delivered: 5 }
-    
-    # Create a common timeline
-    timeline_dates = sorted(list(set(df['Criado'].tolist() + df_done['Resolvido'].tolist())))
-    burndown_data = []
-    
-    current_scope = 0
-    current_delivered = 0
-    
-    # Pre-calculate lookups
-    scope_lookup = df_burn.set_index('Criado')['cumsum'].to_dict() # This might miss duplicates, better to use forward fill logic
-    # Better approach: resample by day
-    
-    # Resample Scope
-    df_burn_daily = df_burn.set_index('Criado').resample('D')['count'].sum().cumsum().reset_index()
-    df_burn_daily.columns = ['date', 'scope']
-    
-    # Resample Delivered
-    if not df_done.empty:
-        df_done_daily = df_done.set_index('Resolvido').resample('D')['count'].sum().cumsum().reset_index()
-        df_done_daily.columns = ['date', 'delivered']
-        
-        # Merge
-        df_merged = pd.merge(df_burn_daily, df_done_daily, on='date', how='outer').sort_values('date').fillna(method='ffill').fillna(0)
-    else:
-        df_merged = df_burn_daily
-        df_merged['delivered'] = 0
-        
-    burndown_data = df_merged.to_dict(orient='records')
-    
-    # 3. Type Distribution
+    return {
+        "total": total_issues,
+        "active": active_issues,
+        "done": done_issues,
+        "bugs": bugs
+    }
+
+def compute_status_by_project(df):
+    return df.groupby(['Projeto', 'Status'], observed=True).size().reset_index(name='count')
+
+def compute_burnup(df, flow=None):
+    # Burnup: Scope vs Delivered, from the daily flow (bounded number of points)
+    if flow is None:
+        flow = FlowCube(df).daily()
+    if flow.empty:
+        return pd.DataFrame(columns=['date', 'scope', 'delivered'])
+    return burnup_points(flow)
+
+def compute_type_distribution(df):
     type_dist = df['Tipo'].value_counts().reset_index()
     type_dist.columns = ['name', 'value']
-    
-    # 4. Team Load
-    team_load = df[df['Status_Category'] == 'Active'].groupby('Responsável').agg(
+    return type_dist[type_dist['value'] > 0] # Unused categories
+
+def compute_team_load(df):
+    return df[df['Status_Category'] == 'Active'].groupby('Responsável', observed=True).agg(
         issues=('Chave', 'count'),
         points=('Story Points', 'sum')
     ).reset_index().sort_values('points', ascending=False)
-    
-    # --- Daily Pulse ---
+
+def compute_team_performance(df, today_start):
+    # One grouped pass over the issues instead of re-filtering them per member
+    assigned = df[df['Responsável'].notna() & (df['Responsável'] != 'Não Atribuído')]
+    delivered = (assigned['Status_Category'] == 'Done') & (assigned['Resolvido'] >= today_start)
+    per_row = pd.DataFrame({
+        'name': assigned['Responsável'],
+        'delivered_count': delivered,
+        'delivered_sp': assigned['Story Points'].where(delivered, 0),
+        'created_count': assigned['Criado'] >= today_start
+    })
+    totals = per_row.groupby('name', observed=True).sum()
+
+    # Status Recente: the member's issue updated last today
+    updated_today = assigned[assigned['Atualizado'] >= today_start]
+    latest = (updated_today.sort_values('Atualizado', ascending=False, kind='stable')
+              .drop_duplicates('Responsável'))
+    recent_status = dict(zip(latest['Responsável'], latest['Chave'] + ' - ' + latest['Status'].astype(str)))
+
+    team_perf = [
+        {
+            "name": name,
+            "delivered_count": int(row.delivered_count),
+            "delivered_sp": float(row.delivered_sp),
+            "created_count": int(row.created_count),
+            "recent_status": recent_status.get(name)
+        }
+        for name, row in sorted(totals.iterrows(), key=lambda item: item[0])
+    ]
+    team_perf.sort(key=lambda x: (x['delivered_sp'], x['delivered_count']), reverse=True)
+    return team_perf
+
+def compute_daily_pulse(df, flow=None):
     today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
     
-    # 1. KPIs
+    # 1. KPIs (from the daily flow)
+    if flow is None:
+        flow = FlowCube(df).daily()
+    today = flow.loc[flow.index == today_start]
     # Entregues Hoje
-    delivered_today_df = df[(df['Status_Category'] == 'Done') & (df['Resolvido'] >= today_start)]
-    delivered_today_count = len(delivered_today_df)
+    delivered_today_count = int(today['delivered'].sum())
     
     # Criados Hoje
-    created_today_df = df[df['Criado'] >= today_start]
-    created_today_count = len(created_today_df)
+    created_today_count = int(today['created'].sum())
     
-    # 7-day Avg (last 7 days excluding today)
+    # 7-day Avg (last 7 days excluding today, over the days with activity)
     start_7d = today_start - timedelta(days=7)
-    
-    # Entregues Avg
-    delivered_last_7d = df[(df['Status_Category'] == 'Done') & (df['Resolvido'] >= start_7d) & (df['Resolvido'] < today_start)]
-    if not delivered_last_7d.empty:
-        daily_delivered = delivered_last_7d.groupby(delivered_last_7d['Resolvido'].dt.date).size()
-        avg_delivered = daily_delivered.mean()
-    else:
-        avg_delivered = 0
-        
-    # Criados Avg
-    created_last_7d = df[(df['Criado'] >= start_7d) & (df['Criado'] < today_start)]
-    if not created_last_7d.empty:
-        daily_created = created_last_7d.groupby(created_last_7d['Criado'].dt.date).size()
-        avg_created = daily_created.mean()
-    else:
-        avg_created = 0
+    avg_delivered = daily_average(flow, 'delivered', start_7d, today_start)
+    avg_created = daily_average(flow, 'created', start_7d, today_start)
         
     daily_pulse = {
         "delivered": {
@@ -255,58 +471,253 @@ def get_dashboard_data(filters: FilterParams):
         }
     }
     
-    # 2. Team Performance
-    all_assignees = sorted(df['Responsável'].dropna().unique().tolist())
-    team_perf = []
-    
-    for member in all_assignees:
-        if member == 'Não Atribuído':
-            continue
-            
-        # Entregues Hoje (Assigned to member)
-        member_delivered = delivered_today_df[delivered_today_df['Responsável'] == member]
-        del_count = len(member_delivered)
-        del_sp = member_delivered['Story Points'].sum()
-        
-        # Criados Hoje (Assigned to member)
-        member_created = created_today_df[created_today_df['Responsável'] == member]
-        created_count = len(member_created)
-        
-        # Status Recente (Last updated today)
-        member_updated_today = df[(df['Responsável'] == member) & (df['Atualizado'] >= today_start)]
-        
-        recent_status = None
-        if not member_updated_today.empty:
-            last_issue = member_updated_today.sort_values('Atualizado', ascending=False).iloc[0]
-            recent_status = f"{last_issue['Chave']} - {last_issue['Status']}"
-            
-        team_perf.append({
-            "name": member,
-            "delivered_count": int(del_count),
-            "delivered_sp": float(del_sp),
-            "created_count": int(created_count),
-            "recent_status": recent_status
-        })
-        
-    team_perf.sort(key=lambda x: (x['delivered_sp'], x['delivered_count']), reverse=True)
-    daily_pulse["team"] = team_perf
-    
+    # 2. Team Performance (once per DASHBOARD_CACHE miss: the body is cached, not this table)
+    daily_pulse["team"] = compute_team_performance(df, today_start)
+    return daily_pulse
+
+def build_dashboard(df, flow=None):
+    # Tables stay DataFrames here; wire_format encodes them as records, columns or Arrow
+    # Each stage is timed into the dashboard_stage_duration_seconds histogram (/metrics)
     return {
-        "kpis": {
-            "total": total_issues,
-            "active": active_issues,
-            "done": done_issues,
-            "bugs": bugs
-        },
+        "kpis": timed("kpis", compute_kpis, df),
         "charts": {
-            "status_by_project": status_by_project.to_dict(orient='records'),
-            "burndown": burndown_data,
-            "type_distribution": type_dist.to_dict(orient='records'),
-            "team_load": team_load.to_dict(orient='records')
+            "status_by_project": timed("status_by_project", compute_status_by_project, df),
+            "burndown": timed("burnup", compute_burnup, df, flow),
+            "type_distribution": timed("type_distribution", compute_type_distribution, df),
+            "team_load": timed("team_load", compute_team_load, df)
         },
-        "daily_pulse": daily_pulse,
-        "raw_subset": df.head(50).fillna('').to_dict(orient='records') # Preview
+        "daily_pulse": timed("daily_pulse", compute_daily_pulse, df, flow),
+        "raw_subset": df.head(50) # Preview
+    }
+
+def render_dashboard(df, filters, media_type=RECORDS):
+    # The Daily Pulse is relative to today: the day is part of the key and of the ETag,
+    # so yesterday's body is never served (nor confirmed with a 304) after midnight
+    today = date.today()
+    key = (df.attrs.get("version"), filters_key(filters), today, media_type)
+    cached = DASHBOARD_CACHE.get(key)
+    CACHE_REQUESTS.labels("dashboard", "miss" if cached is None else "hit").inc()
+    if cached is None:
+        flow = timed("flow", compute_flow, df, filters)
+        filtered = timed("filters", apply_filters, df, filters)
+        body = timed("serialization", ENCODERS[media_type], build_dashboard(filtered, flow=flow))
+        if media_type != ARROW:
+            # Leave the JSON object open so the live snapshot info can be appended per request
+            body = body[:-1]
+        cached = DASHBOARD_CACHE.put(key, body)
+    etag, body = cached
+    return f'"{today.isoformat()}-{etag[1:]}', body
+
+@app.post("/api/dashboard")
+def get_dashboard_data(
+    filters: FilterParams,
+    format: Optional[str] = Query(None, description="records | columns | arrow (default: from Accept)"),
+    accept: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None)
+):
+    df = get_data(force_refresh=filters.force_refresh)
+    media_type = negotiate_format(accept, format)
+    etag, body = render_dashboard(df, filters, media_type)
+    snapshot = snapshot_info()
+    # Snapshot age/refresh state change between syncs without changing the dashboard,
+    # so they are also sent as headers: a 304 still tells the client how fresh its copy is
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "no-cache",
+        "X-Snapshot-Updated": snapshot["last_updated"] or "",
+        "X-Snapshot-Age": str(snapshot["age_seconds"] if snapshot["age_seconds"] is not None else ""),
+        "X-Snapshot-Refreshing": "true" if snapshot["refreshing"] else "false"
     }
+    encoding = choose_encoding(accept_encoding, len(body))
+    if encoding:
+        # One ETag per representation
+        etag = f'{etag[:-1]}-{encoding}"'
+        headers["ETag"] = etag
+    headers["Vary"] = "Accept, Accept-Encoding"
+    if etag_matches(if_none_match, etag):
+        NOT_MODIFIED.inc()
+        return Response(status_code=304, headers=headers)
+    
+    if media_type != ARROW:
+        body += b',"snapshot":' + encode_json(snapshot) + b"}"
+    if encoding:
+        body = timed("compression", compress, body, encoding)
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=media_type, headers=headers)
+
+# --- Status Flow (CFD + time in status, from the changelog transitions) ---
+
+def get_status_intervals(df):
+    # Status visits of the issues of changelog sources, once per (snapshot, transition store)
+    transitions = CACHE["transitions"]
+    if transitions is None:
+        return None
+    cached = CACHE["status_intervals"]
+    if cached is None or cached[0] is not df or cached[1] is not transitions:
+        with_history = df[SOURCE_COLUMN].isin(transitions[SOURCE_COLUMN].cat.categories).to_numpy()
+        intervals = status_intervals(df, transitions)
+        cached = (df, transitions, intervals[with_history[intervals['issue'].to_numpy()]].reset_index(drop=True))
+        CACHE["status_intervals"] = cached
+    return cached[2]
+
+def compute_status_flow(df, filters, intervals):
+    # Issues selected by the dimension filters; the period is the window of days (default: the last year)
+    mask = get_filter_index(df).mask(filter_selections(filters))
+    selected = intervals[mask[intervals['issue'].to_numpy()]]
+    start, end = flow_window(*period_range(filters.period, start=filters.start_date, end=filters.end_date))
+    return {
+        "window": {"start": start.date().isoformat(), "end": (end - timedelta(days=1)).date().isoformat()},
+        "cfd": chart_days(cumulative_flow(selected, start, end)).reset_index(),
+        "time_in_status": time_in_status(selected, start, end)
+    }
+
+@app.post("/api/status-flow")
+def get_status_flow(
+    filters: FilterParams,
+    format: Optional[str] = Query(None, description="records | columns | arrow (default: from Accept)"),
+    accept: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None)
+):
+    df = get_data(force_refresh=filters.force_refresh)
+    intervals = get_status_intervals(df)
+    if intervals is None:
+        raise HTTPException(status_code=404, detail="No status history: no Jira source ingests changelogs (changelog = true)")
+    media_type = negotiate_format(accept, format)
+    # Default windows end today, so the day is part of the key
+    key = (df.attrs.get("version"), filters_key(filters), date.today(), media_type)
+    cached = STATUS_FLOW_CACHE.get(key)
+    CACHE_REQUESTS.labels("status_flow", "miss" if cached is None else "hit").inc()
+    if cached is None:
+        flow = timed("status_flow", compute_status_flow, df, filters, intervals)
+        cached = STATUS_FLOW_CACHE.put(key, ENCODERS[media_type](flow))
+    etag, body = cached
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
+
+def issue_listing(df, query, columns):
+    # Rows of these filters in this sort order: computed once per snapshot, then every page is a slice
+    sort = parse_sort(query.sort)
+    unknown = [col for col in columns + [col for col, _ in sort] if col not in df.columns]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown columns: {unknown}")
+    return get_sort_index(df).listing(
+        sort,
+        make_mask=lambda: get_filter_index(df).mask(filter_selections(query), **date_filter(query)),
+        key=filters_key(query)
+    )
+
+@app.post("/api/issues")
+def list_issues(
+    query: IssueQuery,
+    format: Optional[str] = Query(None, description="records | columns | arrow (default: from Accept)"),
+    accept: Optional[str] = Header(None)
+):
+    df = get_data(force_refresh=query.force_refresh)
+    columns = query.columns or list(df.columns)
+    positions = issue_listing(df, query, columns)
+    
+    version = df.attrs.get("version")
+    offset = 0
+    if query.cursor:
+        try:
+            cursor_version, offset, last_key = decode_cursor(query.cursor)
+            offset = max(offset, 0)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if cursor_version != version and last_key is not None:
+            # Data changed since the previous page: continue after the last issue sent, if still listed
+            found = np.flatnonzero(df['Chave'].to_numpy()[positions] == last_key)
+            if len(found):
+                offset = int(found[0]) + 1
+    
+    page = positions[offset:offset + query.limit]
+    items = df.iloc[page][columns]
+    end = offset + len(page)
+    next_cursor = encode_cursor(version, end, items['Chave'].iloc[-1] if 'Chave' in items and len(items) else None) \
+        if end < len(positions) else None
+    
+    media_type = negotiate_format(accept, format)
+    body = ENCODERS[media_type]({"total": len(positions), "next_cursor": next_cursor, "items": items})
+    return Response(content=body, media_type=media_type)
+
+@app.post("/api/export")
+def export_issues(query: ExportQuery):
+    df = get_data(force_refresh=query.force_refresh)
+    columns = query.columns or list(df.columns)
+    positions = issue_listing(df, query, columns)
+    
+    key = (df.attrs.get("version"), filters_key(query), tuple(query.sort), tuple(columns))
+    media_type = EXPORT_MEDIA_TYPES[query.format]
+    headers = {"Content-Disposition": f'attachment; filename="jira_export_{datetime.now().strftime("%Y%m%d_%H%M")}.{query.format}"'}
+    
+    path = cached_export(key, query.format)
+    if path:
+        return FileResponse(path, media_type=media_type, headers=headers)
+    path = export_path(key, query.format)
+    if query.format == "csv":
+        # Rows go out as they are written; the file is cached once complete
+        return StreamingResponse(stream_csv(df, positions, columns, path), media_type=media_type, headers=headers)
+    # xlsx is a zip: written while the response iterates (not in this handler), then sent in chunks
+    return StreamingResponse(stream_xlsx(df, positions, columns, path), media_type=media_type, headers=headers)
+
+# PDF reports take seconds for large listings, so they are built by a background
+# worker: POST starts (or joins) the job, the client polls GET until the file is ready.
+REPORTS = JobQueue(max_workers=1, name="pdf-report")
+
+def report_subtitle(filters):
+    parts = [f"{label}: {', '.join(values)}" for label, values in
+             (("Fontes", filters.sources), ("Projetos", filters.projects), ("Status", filters.statuses),
+              ("Tipos", filters.types)) if values]
+    if has_period(filters):
+        days = " a ".join(day.strftime('%d/%m/%Y') if day is not None else "..."
+                          for day in period_days(filters.period, start=filters.start_date, end=filters.end_date))
+        field = "resolução" if filters.date_field == "resolved" else "criação"
+        parts.append(f"Período ({field}): {filters.period}, {days}")
+    return "Filtros: " + ("; ".join(parts) if parts else "todos")
+
+@app.post("/api/reports")
+def create_report(filters: FilterParams):
+    df = get_data(force_refresh=filters.force_refresh)
+    columns = [(col, width) for col, width in REPORT_COLUMNS if col in df.columns]
+    path = export_path((df.attrs.get("version"), filters_key(filters), "pdf"), "pdf")
+    report_id = os.path.splitext(os.path.basename(path))[0]
+    if os.path.exists(path):
+        return {"status": "done", "report_id": report_id}
+    
+    positions = issue_listing(df, IssueQuery(**filters.model_dump()), [col for col, _ in columns])
+    REPORTS.submit(report_id, write_pdf, df, positions, columns, path, "Relatório de Projetos", report_subtitle(filters))
+    return Response(
+        content=encode_json({"status": REPORTS.state(report_id), "report_id": report_id}),
+        status_code=202, media_type=RECORDS
+    )
+
+@app.get("/api/reports/{report_id}")
+def get_report(report_id: str):
+    path = os.path.join(EXPORT_DIR, f"{os.path.basename(report_id)}.pdf")
+    if os.path.exists(path):
+        filename = f"relatorio_projetos_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf"
+        return FileResponse(path, media_type=EXPORT_MEDIA_TYPES["pdf"],
+                            headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+    state = REPORTS.state(report_id)
+    if state == "running":
+        return Response(content=encode_json({"status": state, "report_id": report_id}),
+                        status_code=202, media_type=RECORDS)
+    if state == "error":
+        raise HTTPException(status_code=500, detail=f"Report failed: {REPORTS.error(report_id)}")
+    if state == "done":
+        # Built, but the file has since been evicted: the job is expired, POST /api/reports builds it again
+        REPORTS.forget(report_id)
+        raise HTTPException(status_code=410, detail="Report expired, request it again")
+    raise HTTPException(status_code=404, detail="Unknown or expired report")
+
+@app.get("/metrics")
+def get_metrics():
+    # Prometheus text format: Jira ingestion, caches, dashboard stages, response sizes
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,86 @@
+"""Prometheus metrics for Jira ingestion and the API hot paths (served at /metrics).
+
+- Jira: per-source fetch duration and issue counts, sync duration by mode,
+  failed syncs, and every HTTP request the shared clients made (by endpoint
+  and outcome: "ok", "429", "503", "transport_error", ...; successful
+  "search" requests are pages).
+- Caches: hit/miss counts per cache, 304s, and the snapshot age / size.
+- Requests: a timing histogram per /api/dashboard stage (filters, kpis,
+  burnup, daily_pulse, serialization, ...), plus duration and response size
+  per route.
+"""
+import time
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily
+
+from jira_client import clients
+
+# Dashboard stages take milliseconds to a few seconds
+STAGE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+FETCH_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+
+JIRA_FETCH_SECONDS = Histogram("jira_fetch_duration_seconds", "Time to fetch every page of one Jira source",
+                               ["source"], buckets=FETCH_BUCKETS)
+JIRA_ISSUES = Counter("jira_issues_fetched_total", "Issues fetched from Jira", ["source"])
+JIRA_FETCH_ERRORS = Counter("jira_fetch_errors_total", "Jira source fetches that failed", ["source"])
+SYNC_SECONDS = Histogram("jira_sync_duration_seconds", "Duration of a full or delta sync (fetch + rebuild)",
+                         ["mode"], buckets=FETCH_BUCKETS)
+SYNC_FAILURES = Counter("jira_sync_failures_total", "Syncs that raised (the last good snapshot is kept)")
+
+CACHE_REQUESTS = Counter("cache_requests_total", "Cache lookups", ["cache", "result"])
+NOT_MODIFIED = Counter("dashboard_not_modified_total", "/api/dashboard requests answered with 304")
+SNAPSHOT_AGE = Gauge("snapshot_age_seconds", "Seconds since the last successful Jira sync")
+SNAPSHOT_ISSUES = Gauge("snapshot_issues", "Issues in the current snapshot")
+
+STAGE_SECONDS = Histogram("dashboard_stage_duration_seconds", "Time spent in each /api/dashboard stage",
+                          ["stage"], buckets=STAGE_BUCKETS)
+REQUEST_SECONDS = Histogram("http_request_duration_seconds", "Request duration by route",
+                            ["method", "route", "status"], buckets=STAGE_BUCKETS)
+RESPONSE_BYTES = Histogram("http_response_size_bytes", "Response body size (as sent) by route and media type",
+                           ["route", "media_type"], buckets=SIZE_BUCKETS)
+
+
+class JiraClientCollector:
+    """Request counters kept by each shared JiraClient (see JiraClient.requests)."""
+
+    def collect(self):
+        family = CounterMetricFamily("jira_requests", "HTTP requests made to Jira",
+                                     labels=["site", "endpoint", "outcome"])
+        for client in clients():
+            for (endpoint, outcome), count in list(client.requests.items()):
+                family.add_metric([client.url, endpoint, outcome], count)
+        yield family
+
+
+REGISTRY.register(JiraClientCollector())
+
+
+def timed(stage, fn, *args):
+    """fn(*args), observed in the dashboard stage histogram."""
+    t0 = time.perf_counter()
+    try:
+        return fn(*args)
+    finally:
+        STAGE_SECONDS.labels(stage).observe(time.perf_counter() - t0)
+
+
+def observe_fetch(source, issues, seconds, error):
+    # sources.fetch_sources callback
+    JIRA_FETCH_SECONDS.labels(source["name"]).observe(seconds)
+    if error is not None:
+        JIRA_FETCH_ERRORS.labels(source["name"]).inc()
+    else:
+        JIRA_ISSUES.labels(source["name"]).inc(len(issues))
+
+
+def observe_response(method, route, status, seconds, media_type, size):
+    REQUEST_SECONDS.labels(method, route, str(status)).observe(seconds)
+    if size is not None:
+        RESPONSE_BYTES.labels(route, media_type).observe(size)
+
+
+def render():
+    """(body, content type) of the Prometheus text exposition."""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
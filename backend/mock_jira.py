@@ -0,0 +1,264 @@
+"""Local stand-in for the Jira REST search API, backed by synthetic issues.
+
+Serves /rest/api/2/search (GET and POST) with startAt/maxResults pagination,
+field projection and a small JQL subset (created/updated/resolutiondate
+comparisons with relative or absolute dates, statusCategory, status, project,
+AND/OR, parentheses, ORDER BY created/updated) and `expand=changelog`, plus a
+paginated /rest/api/2/issue/{key}/changelog, both serving the multi-step
+status history of synthetic.issue_changelog(). Latency and HTTP 429 errors
+can be injected to exercise the fetch engine.
+
+Usage:
+    python mock_jira.py --issues 100000 --latency-ms 150 --error-rate 0.02 --port 8080
+
+then point the dashboard at it (JIRA_URL=http://localhost:8080 JIRA_USERNAME=x JIRA_TOKEN=x).
+"""
+import argparse
+import random
+import re
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from synthetic import generate_issues, issue_changelog
+
+DEFAULT_MAX_RESULTS = 100
+EMBEDDED_CHANGELOG_LIMIT = 100  # Histories embedded per issue by expand=changelog (the rest via /changelog)
+
+
+class IssueStore:
+    """Synthetic issues plus column arrays used to evaluate JQL with numpy masks."""
+
+    def __init__(self, issues):
+        self.issues = issues
+        fields = [i['fields'] for i in issues]
+        self.columns = {
+            'created': self._dates([f['created'] for f in fields]),
+            'updated': self._dates([f['updated'] for f in fields]),
+            'resolutiondate': self._dates([f['resolutiondate'] for f in fields]),
+            'statuscategory': np.array([f['status']['statusCategory']['name'].lower() for f in fields]),
+            'status': np.array([f['status']['name'].lower() for f in fields]),
+            'project': np.array([f['project']['key'].lower() for f in fields]),
+        }
+
+    @staticmethod
+    def _dates(values):
+        return np.array([v[:19] if v else 'NaT' for v in values], dtype='datetime64[s]')
+
+
+# --- JQL subset ---
+TOKEN_RE = re.compile(r'\s*(\(|\)|>=|<=|!=|=|>|<|"[^"]*"|[^\s()"=<>!]+)')
+DATE_FIELDS = ('created', 'updated', 'resolutiondate')
+RELATIVE_RE = re.compile(r'^(-?\d+)([mhdw])$')
+UNITS = {'m': 'minutes', 'h': 'hours', 'd': 'days', 'w': 'weeks'}
+
+
+def _tokenize(jql):
+    tokens = TOKEN_RE.findall(jql)
+    if ''.join(tokens).replace(' ', '') != jql.replace(' ', ''):
+        raise ValueError(f"Unsupported JQL: {jql}")
+    return tokens
+
+
+def _parse_date(value, now):
+    value = value.strip('"')
+    match = RELATIVE_RE.match(value)
+    if match:
+        return np.datetime64(now + timedelta(**{UNITS[match.group(2)]: int(match.group(1))}), 's')
+    for fmt in ('%Y/%m/%d %H:%M', '%Y-%m-%d %H:%M', '%Y/%m/%d', '%Y-%m-%d'):
+        try:
+            return np.datetime64(datetime.strptime(value, fmt), 's')
+        except ValueError:
+            continue
+    raise ValueError(f"Unsupported JQL date: {value}")
+
+
+def _compare(column, op, value):
+    return {
+        '=': column == value, '!=': column != value,
+        '>=': column >= value, '<=': column <= value,
+        '>': column > value, '<': column < value,
+    }[op]
+
+
+class JqlParser:
+    """Recursive descent parser: expr := term (OR term)*, term := factor (AND factor)*."""
+
+    def __init__(self, tokens, store):
+        self.tokens = tokens
+        self.pos = 0
+        self.store = store
+
+    def _next(self):
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def _peek(self):
+        return self.tokens[self.pos].lower() if self.pos < len(self.tokens) else None
+
+    def parse(self):
+        mask = self.expr()
+        if self.pos != len(self.tokens):
+            raise ValueError(f"Unexpected token: {self.tokens[self.pos]}")
+        return mask
+
+    def expr(self):
+        mask = self.term()
+        while self._peek() == 'or':
+            self._next()
+            mask = mask | self.term()
+        return mask
+
+    def term(self):
+        mask = self.factor()
+        while self._peek() == 'and':
+            self._next()
+            mask = mask & self.factor()
+        return mask
+
+    def factor(self):
+        if self._peek() == '(':
+            self._next()
+            mask = self.expr()
+            if self._next() != ')':
+                raise ValueError("Missing ')'")
+            return mask
+        field, op, value = self._next().lower(), self._next(), self._next()
+        column = self.store.columns.get(field)
+        if column is None:
+            raise ValueError(f"Unsupported JQL field: {field}")
+        if field in DATE_FIELDS:
+            return _compare(column, op, _parse_date(value, datetime.now()))
+        return _compare(column, op, value.strip('"').lower())
+
+
+def search(store, jql):
+    """Return the indexes of the issues matching `jql`, in ORDER BY order."""
+    jql = jql.strip()
+    order_field, descending = 'created', True
+    match = re.search(r'\s*ORDER\s+BY\s+(\w+)(?:\s+(ASC|DESC))?\s*$', jql, re.IGNORECASE)
+    if match:
+        order_field = match.group(1).lower()
+        descending = (match.group(2) or 'ASC').upper() == 'DESC'
+        jql = jql[:match.start()]
+
+    if jql.strip():
+        mask = JqlParser(_tokenize(jql), store).parse()
+        idx = np.flatnonzero(mask)
+    else:
+        idx = np.arange(len(store.issues))
+
+    keys = store.columns.get(order_field, store.columns['created'])[idx]
+    order = np.argsort(keys, kind='stable')
+    return idx[order[::-1]] if descending else idx[order]
+
+
+def _project(issue, fields):
+    if not fields or '*all' in fields:
+        return issue
+    return {'id': issue['id'], 'key': issue['key'],
+            'fields': {f: issue['fields'].get(f) for f in fields if f in issue['fields']}}
+
+
+def _with_changelog(issue, projected):
+    histories = issue_changelog(issue)
+    return {**projected, 'changelog': {'startAt': 0, 'maxResults': EMBEDDED_CHANGELOG_LIMIT, 'total': len(histories),
+                                       'histories': histories[:EMBEDDED_CHANGELOG_LIMIT]}}
+
+
+def create_app(n_issues=10_000, seed=42, latency_ms=0, error_rate=0.0, max_results_cap=DEFAULT_MAX_RESULTS):
+    store = IssueStore(generate_issues(n_issues, seed=seed))
+    mock = FastAPI(title="Mock Jira")
+    mock.state.store = store
+    mock.state.requests = 0
+
+    by_key = {issue['key']: issue for issue in store.issues}
+
+    def _throttle():
+        mock.state.requests += 1
+        if latency_ms:
+            time.sleep(latency_ms / 1000)
+        if error_rate and random.random() < error_rate:
+            return JSONResponse({"errorMessages": ["Rate limit exceeded"]}, status_code=429,
+                                headers={"Retry-After": "1"})
+        return None
+
+    def _handle(params):
+        error = _throttle()
+        if error is not None:
+            return error
+        try:
+            matches = search(store, params.get('jql', ''))
+        except ValueError as e:
+            return JSONResponse({"errorMessages": [str(e)]}, status_code=400)
+
+        start_at = int(params.get('startAt', 0))
+        max_results = min(int(params.get('maxResults', 50)), max_results_cap)
+        fields = params.get('fields')
+        if isinstance(fields, str):
+            fields = [f.strip() for f in fields.split(',') if f.strip()]
+
+        page = matches[start_at:start_at + max_results]
+        issues = [_project(store.issues[i], fields) for i in page]
+        if 'changelog' in str(params.get('expand', '')):
+            issues = [_with_changelog(store.issues[i], issue) for i, issue in zip(page, issues)]
+        return {
+            "startAt": start_at,
+            "maxResults": max_results,
+            "total": int(len(matches)),
+            "issues": issues,
+        }
+
+    @mock.get("/rest/api/2/search")
+    def search_get(request: Request):
+        params = dict(request.query_params)
+        # Repeated ?fields=a&fields=b is also accepted
+        if len(request.query_params.getlist('fields')) > 1:
+            params['fields'] = request.query_params.getlist('fields')
+        return _handle(params)
+
+    @mock.post("/rest/api/2/search")
+    async def search_post(request: Request):
+        return _handle(await request.json())
+
+    @mock.get("/rest/api/2/issue/{key}/changelog")
+    def changelog(key: str, startAt: int = 0, maxResults: int = DEFAULT_MAX_RESULTS):
+        error = _throttle()
+        if error is not None:
+            return error
+        if key not in by_key:
+            return JSONResponse({"errorMessages": ["Issue does not exist"]}, status_code=404)
+        values = issue_changelog(by_key[key])
+        page = values[startAt:startAt + min(maxResults, max_results_cap)]
+        return {"startAt": startAt, "maxResults": maxResults, "total": len(values),
+                "isLast": startAt + len(page) >= len(values), "values": page}
+
+    @mock.get("/rest/api/2/serverInfo")
+    def server_info():
+        return {"baseUrl": "http://localhost", "version": "9.12.0", "versionNumbers": [9, 12, 0],
+                "deploymentType": "Server", "buildNumber": 912000, "serverTitle": "Mock Jira"}
+
+    @mock.get("/rest/api/2/field")
+    def fields():
+        return []
+
+    return mock
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Mock Jira search API with synthetic issues")
+    parser.add_argument("--issues", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--latency-ms", type=int, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 429")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+
+    print(f"Generating {args.issues} synthetic issues...")
+    uvicorn.run(create_app(args.issues, args.seed, args.latency_ms, args.error_rate), host="0.0.0.0", port=args.port)
@@ -0,0 +1,96 @@
+"""Bulk normalization of raw Jira search JSON into the dashboard issue table.
+
+Works directly on the `issues` arrays returned by /rest/api/2/search (no
+`jira` Resource objects) and builds one column at a time; dates are parsed
+once per column instead of once per issue.
+"""
+import re
+
+import pandas as pd
+
+JIRA_DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S.%f%z'
+ISSUE_COLUMNS = ['Chave', 'Resumo', 'Responsável', 'Status', 'Tipo', 'Prioridade', 'Projeto',
+                 'Criado', 'Resolvido', 'Data Entrega', 'Atualizado', 'Story Points', 'Sprint',
+                 'Estimativa (s)', 'Tempo Gasto (s)', 'Módulo', 'Cliente', 'Labels']
+
+STORY_POINTS_FIELD = 'customfield_10031'
+SPRINT_FIELD = 'customfield_10020'
+SOURCE_COLUMN = 'Fonte'  # Jira source of each issue when several are federated (see sources.py)
+# Jira's own status category key ('new', 'indeterminate', 'done'): what `statusCategory` in JQL matches
+JIRA_CATEGORY_COLUMN = 'Jira_Status_Category'
+# Site-specific custom fields, by role (Jira sites may map them differently, see sources.py)
+FIELD_MAP = {'story_points': STORY_POINTS_FIELD, 'sprint': SPRINT_FIELD}
+SPRINT_NAME_RE = re.compile(r'name=([^,]+)')
+
+
+def _name(value, default):
+    return value.get('name', default) if value else default
+
+
+def _sprint_name(sprints):
+    if not sprints:
+        return 'Backlog'
+    sprint = sprints[0]
+    # Jira Cloud returns objects, Jira Server the legacy "...[id=1,name=Sprint 1,...]" strings
+    if isinstance(sprint, dict):
+        return sprint.get('name') or 'Backlog'
+    match = SPRINT_NAME_RE.search(str(sprint))
+    return match.group(1) if match else 'Backlog'
+
+
+def _client_tag(labels):
+    return next((l for l in labels if l.startswith('CLI_')), 'Interno')
+
+
+def status_category_keys(raw_issues):
+    """Status category key of each raw issue (None if Jira did not send one)."""
+    statuses = [(issue.get('fields') or {}).get('status') or {} for issue in raw_issues]
+    return [(status.get('statusCategory') or {}).get('key') for status in statuses]
+
+
+def parse_jira_datetimes(values, tz=None):
+    """Parse a column of Jira timestamps ('2024-01-15T10:30:00.000-0300').
+
+    With `tz` the instants are converted to that timezone; without it the
+    offset is dropped and the wall-clock time reported by Jira is kept.
+    """
+    s = pd.Series(values, dtype=object)
+    if tz:
+        parsed = pd.to_datetime(s, format=JIRA_DATETIME_FORMAT, utc=True, errors='coerce')
+        return parsed.dt.tz_convert(tz).dt.tz_localize(None)
+    return pd.to_datetime(s.str.slice(0, 23), format='%Y-%m-%dT%H:%M:%S.%f', errors='coerce')
+
+
+def normalize_issues(raw_issues, tz=None, field_map=None):
+    """Build the issue DataFrame (ISSUE_COLUMNS) from raw search JSON issues.
+
+    `field_map` overrides entries of FIELD_MAP (e.g. {'story_points': 'customfield_10016'}).
+    """
+    field_map = {**FIELD_MAP, **(field_map or {})}
+    story_points_field, sprint_field = field_map['story_points'], field_map['sprint']
+    fields = [issue.get('fields') or {} for issue in raw_issues]
+    labels = [f.get('labels') or [] for f in fields]
+
+    df = pd.DataFrame({
+        'Chave': [issue['key'] for issue in raw_issues],
+        'Resumo': [f.get('summary') for f in fields],
+        'Responsável': [(f.get('assignee') or {}).get('displayName', 'Não Atribuído') for f in fields],
+        'Status': [_name(f.get('status'), None) for f in fields],
+        'Tipo': [_name(f.get('issuetype'), None) for f in fields],
+        'Prioridade': [_name(f.get('priority'), 'Medium') for f in fields],
+        'Projeto': [_name(f.get('project'), None) for f in fields],
+        'Criado': parse_jira_datetimes([f.get('created') for f in fields], tz),
+        'Resolvido': parse_jira_datetimes([f.get('resolutiondate') for f in fields], tz),
+        'Data Entrega': pd.to_datetime(pd.Series([f.get('duedate') for f in fields], dtype=object),
+                                       format='%Y-%m-%d', errors='coerce'),
+        'Atualizado': parse_jira_datetimes([f.get('updated') for f in fields], tz),
+        'Story Points': pd.to_numeric(pd.Series([f.get(story_points_field) for f in fields], dtype=object),
+                                      errors='coerce').fillna(0).astype(float),
+        'Sprint': [_sprint_name(f.get(sprint_field)) for f in fields],
+        'Estimativa (s)': [f.get('timeoriginalestimate') or 0 for f in fields],
+        'Tempo Gasto (s)': [f.get('timespent') or 0 for f in fields],
+        'Módulo': [(f.get('components') or [{}])[0].get('name', 'Geral') for f in fields],
+        'Cliente': [_client_tag(l) for l in labels],
+        'Labels': labels,
+    }, columns=ISSUE_COLUMNS)
+    return df
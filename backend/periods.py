@@ -0,0 +1,42 @@
+"""Period presets shared by the Streamlit sidebar and the API filters.
+
+A period resolves to whole days; period_range() gives the half-open
+[start, end) bounds FilterIndex.mask() turns into two binary searches on a
+presorted date column: 'Criado' (issues created in the period) or
+'Resolvido' (issues delivered in it, the flow view of the KPIs).
+"""
+import pandas as pd
+
+ALL_TIME = "Tudo"
+CUSTOM_PERIOD = "Personalizado"
+PERIOD_PRESETS = [ALL_TIME, "Este Mês", "Mês Passado", "Último Trimestre", "Este Ano", CUSTOM_PERIOD]
+DATE_FIELDS = {"created": "Criado", "resolved": "Resolvido"}
+
+
+def period_days(period, today=None, start=None, end=None):
+    """(first day, last day) of a preset, both inclusive; (None, None) for "Tudo".
+
+    "Personalizado" uses `start` / `end` (dates; either may be None for an open end).
+    """
+    today = pd.Timestamp("today" if today is None else today).normalize()
+    if period == ALL_TIME:
+        return None, None
+    if period == "Este Mês":
+        return today.replace(day=1), today
+    if period == "Mês Passado":
+        first = today.replace(day=1) - pd.DateOffset(months=1)
+        return first, first + pd.DateOffset(months=1) - pd.DateOffset(days=1)
+    if period == "Último Trimestre":
+        return today - pd.DateOffset(months=3), today
+    if period == "Este Ano":
+        return today.replace(month=1, day=1), today
+    if period == CUSTOM_PERIOD:
+        return (None if start is None else pd.Timestamp(start).normalize(),
+                None if end is None else pd.Timestamp(end).normalize())
+    raise ValueError(f"Unknown period: {period}")
+
+
+def period_range(period, today=None, start=None, end=None):
+    """[start, end) bounds of period_days(): `end` is the day after the last one (None = open)."""
+    first, last = period_days(period, today, start, end)
+    return first, None if last is None else last + pd.Timedelta(days=1)
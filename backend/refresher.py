@@ -0,0 +1,47 @@
+"""Background refresher with single-flight semantics.
+
+Runs the sync function periodically so the cache is reloaded before it
+expires, and collapses concurrent refresh requests into one in-flight call:
+every caller that triggers a refresh while one is running gets the same
+Future back.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BackgroundRefresher:
+    def __init__(self, refresh_fn, interval):
+        self.refresh_fn = refresh_fn
+        self.interval = interval
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="jira-refresh")
+        self._lock = threading.Lock()
+        self._future = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def trigger(self):
+        """Start a refresh unless one is already running; return its Future."""
+        with self._lock:
+            if self._future is None or self._future.done():
+                self._future = self._executor.submit(self.refresh_fn)
+            return self._future
+
+    def in_flight(self):
+        future = self._future
+        return future is not None and not future.done()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="jira-refresh-loop", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.trigger().result()
+            except Exception as e:
+                print(f"Background refresh failed: {e}")
+            self._stop.wait(self.interval)
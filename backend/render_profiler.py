@@ -0,0 +1,102 @@
+"""Opt-in wall-clock profiler for one Streamlit rerun (see app.py).
+
+The script is timed in consecutive slices:
+
+- checkpoint(name) closes a top-level slice: the time since the previous
+  event (start, checkpoint, section or figure) is booked under `name`, so
+  long straight-line stretches need no re-indentation;
+- section(name) is a context manager, nestable ("aba.visao_geral/...");
+- figure(name, fig, render) books the code since the previous event as the
+  figure's build time, then times render() (st.plotly_chart) and records
+  the size of the figure JSON;
+- timed(name, fn) wraps a callable run outside the rerun (e.g. an export
+  generated on a download click) and logs it when it finishes.
+
+A disabled profiler does nothing: sections yield immediately and figures
+are just rendered, so the instrumentation can stay in place.
+"""
+import contextlib
+import time
+from collections import OrderedDict
+
+
+class RenderProfiler:
+    def __init__(self, enabled=False, log=print):
+        self.enabled = enabled
+        self.log = log
+        self.started = self._last = time.perf_counter()
+        self.records = []  # {"section", "kind", "seconds", "render_seconds", "bytes"}
+        self._stack = []
+
+    def _path(self, name):
+        return "/".join([*self._stack, name])
+
+    def _record(self, name, kind, seconds, render_seconds=None, size=None):
+        self.records.append({"section": self._path(name), "kind": kind, "seconds": seconds,
+                             "render_seconds": render_seconds, "bytes": size})
+        self._last = time.perf_counter()
+
+    def checkpoint(self, name):
+        if self.enabled:
+            self._record(name, "checkpoint", time.perf_counter() - self._last)
+
+    @contextlib.contextmanager
+    def section(self, name):
+        if not self.enabled:
+            yield
+            return
+        t0 = self._last = time.perf_counter()
+        self._stack.append(name)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            self._record(name, "section", time.perf_counter() - t0)
+
+    def figure(self, name, fig, render):
+        if not self.enabled:
+            return render()
+        build = time.perf_counter() - self._last
+        size = len(fig.to_json().encode("utf-8"))  # Extra serialization, only while profiling
+        t0 = time.perf_counter()
+        result = render()
+        self._record(name, "figure", build, time.perf_counter() - t0, size)
+        return result
+
+    def timed(self, name, fn):
+        if not self.enabled:
+            return fn
+
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            result = fn(*args, **kwargs)
+            self.log(f"[perfil] {name} {time.perf_counter() - t0:.3f}s")
+            return result
+        return wrapper
+
+    def total(self):
+        return time.perf_counter() - self.started
+
+    def summary(self):
+        """Rows aggregated by section path, in first-seen order (repeated figures are summed)."""
+        rows = OrderedDict()
+        for record in self.records:
+            row = rows.setdefault(record["section"], {
+                "section": record["section"], "kind": record["kind"], "count": 0,
+                "seconds": 0.0, "render_seconds": None, "bytes": None
+            })
+            row["count"] += 1
+            row["seconds"] += record["seconds"] + (record["render_seconds"] or 0)
+            if record["render_seconds"] is not None:
+                row["render_seconds"] = (row["render_seconds"] or 0) + record["render_seconds"]
+            if record["bytes"] is not None:
+                row["bytes"] = (row["bytes"] or 0) + record["bytes"]
+        return list(rows.values())
+
+    def log_line(self):
+        """One line per rerun: total, top-level slices and figure totals."""
+        top = [r for r in self.summary() if "/" not in r["section"]]
+        figures = [r for r in self.records if r["kind"] == "figure"]
+        parts = [f"{r['section']} {r['seconds']:.3f}s" for r in top]
+        parts.append(f"{len(figures)} figuras {sum(r['bytes'] for r in figures) / 1024:.0f} KB")
+        return f"[perfil] rerun {self.total():.3f}s | " + " | ".join(parts)
@@ -0,0 +1,65 @@
+"""In-memory LRU cache of serialized API responses.
+
+Entries are keyed by the caller (e.g. data version + normalized filters) and
+hold the encoded body together with its ETag, so a repeated request is a
+dictionary lookup and a client that already has the body gets a 304.
+Eviction is least-recently-used, bounded by entry count and total bytes.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def make_etag(body):
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def etag_matches(if_none_match, etag):
+    """True if an If-None-Match header value matches `etag` (weak comparison, '*' matches anything)."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    return any(tag == '*' or tag.removeprefix('W/') == etag for tag in candidates)
+
+
+class ResponseCache:
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (etag, body)
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """Return (etag, body) for `key`, or None."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, body):
+        """Store `body` under `key` and return (etag, body)."""
+        entry = (make_etag(body), body)
+        if len(body) > self.max_bytes:
+            return entry  # Never cacheable, don't flush everything else for it
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old[1])
+            self.entries[key] = entry
+            self.size += len(body)
+            while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+        return entry
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
@@ -0,0 +1,62 @@
+"""Persistent on-disk snapshot of the normalized issue table.
+
+After each sync the DataFrame is written as an uncompressed Arrow IPC
+(Feather v2) file, which can be memory-mapped on startup so a fresh process
+serves data immediately while the live Jira refresh runs in the background.
+The schema version and sync watermarks travel in the file metadata.
+"""
+import json
+import os
+from datetime import datetime
+
+import pyarrow as pa
+import pyarrow.feather as feather
+
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache")
+# Bump whenever the columns/dtypes of the normalized table change
+SNAPSHOT_SCHEMA_VERSION = 2
+METADATA_KEY = b"dashboard_snapshot"
+
+
+def snapshot_path(name):
+    return os.path.join(SNAPSHOT_DIR, f"{name}.arrow")
+
+
+def save_snapshot(df, path, last_sync, last_full_sync=None):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    meta = {
+        "schema_version": SNAPSHOT_SCHEMA_VERSION,
+        "last_sync": last_sync.isoformat(),
+        "last_full_sync": last_full_sync.isoformat() if last_full_sync else None,
+        "rows": len(df),
+    }
+    schema_meta = dict(table.schema.metadata or {})
+    schema_meta[METADATA_KEY] = json.dumps(meta).encode()
+    table = table.replace_schema_metadata(schema_meta)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write to a temp file and rename, so readers never see a half-written snapshot
+    tmp_path = f"{path}.tmp"
+    feather.write_feather(table, tmp_path, compression="uncompressed")
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path):
+    """Return {'data', 'last_sync', 'last_full_sync'} or None if missing/outdated."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with pa.memory_map(path, "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+        meta = json.loads((table.schema.metadata or {}).get(METADATA_KEY, b"{}"))
+        if meta.get("schema_version") != SNAPSHOT_SCHEMA_VERSION:
+            print(f"Ignoring snapshot {path}: schema version {meta.get('schema_version')}")
+            return None
+        return {
+            "data": table.to_pandas(),
+            "last_sync": datetime.fromisoformat(meta["last_sync"]),
+            "last_full_sync": datetime.fromisoformat(meta["last_full_sync"]) if meta.get("last_full_sync") else None,
+        }
+    except Exception as e:
+        print(f"Error reading snapshot {path}: {e}")
+        return None
@@ -0,0 +1,78 @@
+"""Presorted row orders for paging through an issue snapshot.
+
+For a sort spec (one or more columns, each ascending or descending) the
+full row order is computed once per snapshot; a filtered listing is that
+order restricted to the rows of a filter mask, also kept per
+(filters, sort). Any page is then a slice of a cached positions array.
+Both caches are small LRUs, since each entry is one int per row.
+"""
+import base64
+import json
+import threading
+from collections import OrderedDict
+
+
+def parse_sort(fields):
+    """['-Criado', 'Chave'] -> (('Criado', False), ('Chave', True))."""
+    return tuple((field[1:], False) if field.startswith('-') else (field.lstrip('+'), True) for field in fields)
+
+
+class SortIndex:
+    def __init__(self, df, max_orders=16, max_listings=32):
+        self.df = df
+        self.n = len(df)
+        self.orders = OrderedDict()
+        self.listings = OrderedDict()
+        self.max_orders = max_orders
+        self.max_listings = max_listings
+        self.lock = threading.Lock()
+
+    def _cached(self, cache, key, limit, compute):
+        with self.lock:
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+        value = compute()
+        with self.lock:
+            cache[key] = value
+            while len(cache) > limit:
+                cache.popitem(last=False)
+        return value
+
+    def order(self, sort):
+        """Row positions of the whole snapshot in `sort` order (missing values last, stable)."""
+        def compute():
+            columns = [col for col, _ in sort]
+            frame = self.df[columns].reset_index(drop=True)
+            return frame.sort_values(
+                columns, ascending=[asc for _, asc in sort], na_position='last', kind='stable'
+            ).index.to_numpy()
+        return self._cached(self.orders, sort, self.max_orders, compute)
+
+    def listing(self, sort, make_mask=None, key=None):
+        """Positions of the rows selected by `make_mask()` (a bool row mask), in `sort` order.
+
+        With a `key` (identifying the filters) the result is cached and the mask only
+        built on a miss.
+        """
+        def compute():
+            order = self.order(sort)
+            return order if make_mask is None else order[make_mask()[order]]
+        if key is None:
+            return compute()
+        return self._cached(self.listings, (key, sort), self.max_listings, compute)
+
+
+def encode_cursor(version, offset, last_key):
+    """Opaque page cursor: data version, offset of the next row and the key of the last row sent."""
+    payload = json.dumps({"v": version, "o": offset, "k": last_key}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Inverse of encode_cursor; raises ValueError for anything it did not produce."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return payload["v"], int(payload["o"]), payload["k"]
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {e}") from None
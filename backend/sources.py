@@ -0,0 +1,117 @@
+"""Federated ingestion from several Jira sources into one issue table.
+
+A source is a Jira site (or a slice of one) with its own JQL and field
+mapping. They are listed in secrets.toml as an array of tables; url,
+username and token default to the [jira] section, so several boards of the
+same site only need a name and a JQL:
+
+    [jira]
+    url = "https://empresa.atlassian.net"
+    username = "..."
+    token = "..."
+
+    [[jira_sources]]
+    name = "Cury"
+    jql = "project = CUR"
+
+    [[jira_sources]]
+    name = "Manutenção"
+    url = "https://sustentacao.atlassian.net"   # another site, other credentials
+    username = "..."
+    token = "..."
+    jql = "project = MAN"
+    fields = { story_points = "customfield_10016" }
+    changelog = true   # also ingest status history (see transitions.py)
+
+Without [[jira_sources]] the [jira] section (or the JIRA_* env vars) is the
+only source, with no extra JQL. All sources are fetched concurrently on the
+shared Jira event loop, so a refresh takes as long as the slowest source.
+Issues are tagged with their source name in the 'Fonte' column. Sources with
+`changelog = true` are searched with `expand=changelog`.
+"""
+import asyncio
+import os
+import time
+
+import toml
+
+from jira_client import get_client, load_settings, run
+from jira_fetch import complete_changelogs, fetch_all_issues
+from normalize import FIELD_MAP
+
+DEFAULT_SOURCE = "Jira"
+
+
+def sources_from_config(config):
+    """Source dicts (name, url, username, token, jql, fields, client options) from a secrets mapping."""
+    site = dict(config.get("jira", {}))
+    entries = config.get("jira_sources") or [{"name": DEFAULT_SOURCE}]
+    sources = []
+    for entry in entries:
+        source = {**site, **entry}
+        source["name"] = source.get("name") or source["url"]
+        source["jql"] = source.get("jql") or None
+        source["fields"] = {**FIELD_MAP, **dict(entry.get("fields", {}))}
+        source["changelog"] = bool(source.get("changelog", False))
+        sources.append(source)
+    names = [source["name"] for source in sources]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate Jira source names: {names}")
+    return sources
+
+
+def load_sources(secrets_path):
+    if os.path.exists(secrets_path):
+        return sources_from_config(toml.load(secrets_path))
+    # JIRA_* env vars (e.g. the local mock_jira.py server): one source, with history if JIRA_CHANGELOG=1
+    settings = load_settings(secrets_path)
+    settings["changelog"] = os.environ.get("JIRA_CHANGELOG") == "1"
+    return sources_from_config({"jira": settings})
+
+
+def scoped_jql(source, jql):
+    """`jql` restricted to the source's own JQL ('... ORDER BY ...' stays at the end)."""
+    if not source["jql"]:
+        return jql
+    query, order_by = jql, ""
+    position = jql.upper().find(" ORDER BY ")
+    if position >= 0:
+        query, order_by = jql[:position], jql[position:]
+    return f"({source['jql']}) AND ({query}){order_by}"
+
+
+def source_fields(fields, field_map):
+    """Comma-separated search fields with the default custom fields swapped for the source's."""
+    renamed = {FIELD_MAP[role]: field for role, field in field_map.items() if role in FIELD_MAP}
+    return ",".join(renamed.get(field, field) for field in fields.split(","))
+
+
+async def _fetch_source(source, jql, fields, on_fetched):
+    client = get_client(**source)
+    t0 = time.perf_counter()
+    try:
+        issues = await fetch_all_issues(client, scoped_jql(source, jql), source_fields(fields, source["fields"]),
+                                        expand="changelog" if source["changelog"] else None)
+        if source["changelog"]:
+            await complete_changelogs(client, issues)
+    except Exception as e:
+        if on_fetched is not None:
+            on_fetched(source, None, time.perf_counter() - t0, e)
+        raise
+    elapsed = time.perf_counter() - t0
+    print(f"[{source['name']}] {len(issues)} issues in {elapsed:.2f}s")
+    if on_fetched is not None:
+        on_fetched(source, issues, elapsed, None)
+    return issues
+
+
+def fetch_sources(sources, jql_for, fields, on_fetched=None):
+    """Raw issues of every source, fetched concurrently: {name: issues, or the exception it raised}.
+
+    `jql_for(source)` is the query for that source (e.g. full or delta), before its own JQL is applied.
+    `on_fetched(source, issues, seconds, error)` is called as each source finishes (e.g. for metrics).
+    """
+    async def fetch_all():
+        return await asyncio.gather(*(_fetch_source(source, jql_for(source), fields, on_fetched) for source in sources),
+                                    return_exceptions=True)
+    return dict(zip((source["name"] for source in sources), run(fetch_all())))
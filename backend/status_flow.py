@@ -0,0 +1,156 @@
+"""Cumulative flow and time in status, from the status-transition store.
+
+An issue's history is a chain of intervals [start, end), one per status it
+went through: it was created in the 'De' of its first transition (in its
+current 'Status' if it never moved), then sat in the 'Para' of each
+transition until the next one; the last interval is still open. Both views
+are array arithmetic over those intervals, with no per-issue loop:
+
+- cumulative_flow(): an interval adds 1 to its status on the day it starts
+  and takes it back on the day it ends (two bincounts over day x status);
+  a cumulative sum over the days gives the issues in each status at the end
+  of every day.
+- time_in_status(): interval lengths clipped to the window, summed per
+  issue and status (a re-entered status adds up), described per status.
+
+Intervals are built once per snapshot (positions into the issue table), so
+any filter is a boolean mask over their 'issue' column.
+"""
+import numpy as np
+import pandas as pd
+
+from flow_cube import DONE_STATUSES, MAX_CHART_POINTS
+from normalize import SOURCE_COLUMN
+
+DEFAULT_WINDOW_DAYS = 365  # Window of the flow when no period is chosen: the last year
+SECONDS_PER_DAY = 86400
+
+
+def _issue_keys(df):
+    if SOURCE_COLUMN in df.columns:
+        return pd.MultiIndex.from_arrays([df[SOURCE_COLUMN].astype(str), df['Chave'].astype(str)])
+    return pd.Index(df['Chave'].astype(str))
+
+
+def _codes(values, statuses):
+    return pd.Categorical(values, categories=statuses).codes.astype(np.int64)
+
+
+def status_intervals(df, transitions, done_statuses=DONE_STATUSES):
+    """One row per status visit of the issues of `df`.
+
+    'issue' is the row position in `df`, 'end' is NaT while the issue is
+    still in that status and 'step' counts the moves before the visit.
+    'status' is categorical, ordered along the workflow: open statuses by the
+    mean step they are reached at, then the done ones.
+    """
+    rows = _issue_keys(df).get_indexer(_issue_keys(transitions))
+    found = rows >= 0  # Events of issues no longer in the table are ignored
+    rows = rows[found]
+    current = df['Status'].astype(str)
+    statuses = pd.Index(transitions['De'].cat.categories).union(pd.Index(current.unique()))
+
+    moved_from = _codes(transitions['De'], statuses)[found]
+    moved_to = _codes(transitions['Para'], statuses)[found]
+    moved_at = transitions['Data'].to_numpy()[found]
+    first = np.r_[True, rows[1:] != rows[:-1]] if len(rows) else np.zeros(0, bool)
+    last = np.r_[rows[1:] != rows[:-1], True] if len(rows) else np.zeros(0, bool)
+    left_at = np.empty_like(moved_at)
+    left_at[:-1] = moved_at[1:]
+    left_at[last] = np.datetime64('NaT')
+    position = np.arange(len(rows))
+    step = position - np.maximum.accumulate(np.where(first, position, 0)) + 1
+
+    created = df['Criado'].to_numpy()
+    never_moved = np.ones(len(df), bool)
+    never_moved[rows] = False
+    still = np.flatnonzero(never_moved)
+    intervals = pd.DataFrame({
+        # Creation status up to the first move, each move's status up to the next, never-moved issues
+        'issue': np.r_[rows[first], rows, still],
+        'status': np.r_[moved_from[first], moved_to, _codes(current.iloc[still], statuses)],
+        'start': np.r_[np.minimum(created[rows[first]], moved_at[first]), moved_at, created[still]],
+        'end': np.r_[moved_at[first], left_at, np.full(len(still), np.datetime64('NaT'), dtype=moved_at.dtype)],
+        'step': np.r_[np.zeros(first.sum(), np.int64), step, np.zeros(len(still), np.int64)]
+    })
+    intervals = intervals[(intervals['status'] >= 0) & intervals['start'].notna()]
+
+    # Workflow order of the statuses visited
+    codes = intervals['status'].to_numpy()
+    visits = np.bincount(codes, minlength=len(statuses))
+    mean_step = np.bincount(codes, weights=intervals['step'], minlength=len(statuses)) / np.maximum(visits, 1)
+    order = sorted(np.flatnonzero(visits), key=lambda code: (statuses[code] in done_statuses, mean_step[code]))
+    intervals['status'] = pd.Categorical.from_codes(codes, statuses).set_categories(statuses[order])
+    return intervals.reset_index(drop=True)
+
+
+def flow_window(start=None, end=None, today=None):
+    """[start, end) days of the flow: a period's bounds, open ends up to tomorrow / the last DEFAULT_WINDOW_DAYS."""
+    if end is None:
+        end = pd.Timestamp('today' if today is None else today).normalize() + pd.Timedelta(days=1)
+    end = pd.Timestamp(end).normalize()
+    start = end - pd.Timedelta(days=DEFAULT_WINDOW_DAYS) if start is None else pd.Timestamp(start).normalize()
+    return start, end
+
+
+def cumulative_flow(intervals, start, end):
+    """Issues in each status at the end of every day of [start, end): one row per day, one column per status."""
+    days = pd.date_range(start, end, freq='D', inclusive='left', name='date')
+    statuses = intervals['status'].cat.categories
+    n_days, n_statuses = len(days), len(statuses)
+    codes = intervals['status'].cat.codes.to_numpy().astype(np.int64)
+    first_day = np.datetime64(days[0].date() if n_days else pd.Timestamp(start).date(), 'D')
+
+    # Day indexes clipped to [0, n_days]: index n_days falls after the window (dropped), an
+    # interval that ended before it enters and leaves on day 0 (cancels out)
+    entered = np.clip((intervals['start'].to_numpy().astype('datetime64[D]') - first_day).astype(np.int64), 0, n_days)
+    end_values = intervals['end'].to_numpy()
+    left = np.where(np.isnat(end_values), n_days,
+                    np.clip((end_values.astype('datetime64[D]') - first_day).astype(np.int64), 0, n_days))
+    size = (n_days + 1) * n_statuses
+    delta = (np.bincount(entered * n_statuses + codes, minlength=size)
+             - np.bincount(left * n_statuses + codes, minlength=size))
+    counts = delta.reshape(n_days + 1, n_statuses)[:n_days].cumsum(axis=0)
+    cfd = pd.DataFrame(counts, index=days, columns=pd.Index(statuses.astype(str), name='status'))
+    return cfd.loc[:, cfd.any()]
+
+
+def chart_days(cfd, max_points=MAX_CHART_POINTS):
+    """`cfd` sampled down to at most `max_points` days (last day always kept), like burnup_points()."""
+    if len(cfd) <= max_points:
+        return cfd
+    step = -(-len(cfd) // (max_points - 1))
+    return cfd.iloc[np.unique(np.r_[np.arange(0, len(cfd), step), len(cfd) - 1])]
+
+
+def time_in_status(intervals, start, end, now=None, done_statuses=DONE_STATUSES):
+    """Days the issues spent in each status within [start, end) (open intervals run until `now`).
+
+    One row per status, in workflow order: issues that spent time in it, total,
+    mean, median and 85th percentile days per issue, and whether it is done.
+    """
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    stop = min(end, pd.Timestamp('now' if now is None else now))
+    begin = intervals['start'].to_numpy()
+    finish = intervals['end'].to_numpy()
+    finish = np.where(np.isnat(finish), stop.to_datetime64(), finish)
+    seconds = ((np.minimum(finish, np.datetime64(stop)) - np.maximum(begin, np.datetime64(start)))
+               / np.timedelta64(1, 's'))
+    inside = seconds > 0
+
+    statuses = intervals['status'].cat.categories
+    codes = intervals['status'].cat.codes.to_numpy().astype(np.int64)[inside]
+    per_issue = pd.Series(seconds[inside] / SECONDS_PER_DAY).groupby(
+        [intervals['issue'].to_numpy()[inside], codes]).sum()
+    by_status = per_issue.groupby(level=1)
+    table = pd.DataFrame({
+        'issues': by_status.size(),
+        'total_days': by_status.sum(),
+        'mean_days': by_status.mean(),
+        'median_days': by_status.median(),
+        'p85_days': by_status.quantile(0.85)
+    }).reindex(range(len(statuses)))
+    table.insert(0, 'status', statuses.astype(str))
+    table['issues'] = table['issues'].fillna(0).astype(int)
+    table['done'] = table['status'].isin(done_statuses)
+    return table[table['issues'] > 0].round(2).reset_index(drop=True)
@@ -0,0 +1,65 @@
+"""Incremental (delta) sync helpers for the in-memory Jira issue cache.
+
+Instead of re-downloading the whole backlog on every refresh, only issues
+updated since the previous sync are fetched and upserted by issue
+('Chave' within its Jira source).
+"""
+import math
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from normalize import JIRA_CATEGORY_COLUMN, SOURCE_COLUMN
+
+# Same window as the full-sync JQL: open issues + anything created in the last 2 years
+SYNC_WINDOW_DAYS = 730
+# Extra minutes added to the delta window to absorb clock skew between us and Jira
+SYNC_OVERLAP_MINUTES = 5
+
+
+def build_delta_jql(last_sync, now):
+    # Relative JQL ("-15m") avoids depending on the Jira user's timezone
+    minutes = math.ceil((now - last_sync).total_seconds() / 60) + SYNC_OVERLAP_MINUTES
+    return f'updated >= -{minutes}m ORDER BY updated ASC'
+
+
+def same_issues(df, other):
+    """Bool mask of the rows of `df` whose issue also appears in `other`.
+
+    An issue is its 'Chave' within its Jira source (federated sites may reuse
+    project keys): keys are matched first, the source only for those rows.
+    """
+    mask = df['Chave'].isin(other['Chave']).to_numpy().copy()
+    if SOURCE_COLUMN in df.columns and SOURCE_COLUMN in other.columns and mask.any():
+        rows = np.flatnonzero(mask)
+        candidates = pd.MultiIndex.from_arrays([df[SOURCE_COLUMN].iloc[rows].astype(str), df['Chave'].iloc[rows]])
+        mask[rows] = candidates.isin(pd.MultiIndex.from_arrays([other[SOURCE_COLUMN].astype(str), other['Chave']]))
+    return mask
+
+
+def upsert_issues(df, changed):
+    """Replace rows of `df` whose issue ('Fonte' + 'Chave') appears in `changed` and append new ones."""
+    if changed.empty:
+        return df
+    kept = df[~same_issues(df, changed)]
+    merged = pd.concat([kept, changed], ignore_index=True)
+    # Keep the same ordering as the full sync (ORDER BY created DESC)
+    return merged.sort_values('Criado', ascending=False, ignore_index=True)
+
+
+def prune_window(df, now):
+    """Drop issues that fell out of the sync window (done and created too long ago).
+
+    'Done' is Jira's status category, as in the JQL (statusCategory != Done),
+    not the dashboard's list of done statuses: a 'Cancelado' issue is in the
+    done category too. Rows from snapshots saved before the category was kept
+    fall back to 'Status_Category' until the next full sync replaces them.
+    """
+    cutoff = now - timedelta(days=SYNC_WINDOW_DAYS)
+    done = (df['Status_Category'] == 'Done').to_numpy()
+    if JIRA_CATEGORY_COLUMN in df.columns:
+        category = df[JIRA_CATEGORY_COLUMN]
+        done = np.where(category.notna().to_numpy(), (category == 'done').to_numpy(), done)
+    in_window = ~done | (df['Criado'] >= cutoff).to_numpy()
+    return df[in_window].reset_index(drop=True)
@@ -0,0 +1,151 @@
+"""Synthetic Jira issue generator for offline benchmarks and load tests.
+
+Produces raw issues shaped like /rest/api/2/search results (the same JSON the
+fetch engine and normalize_issues consume): projects, sprints, components,
+labels with CLI_ client tags, Portuguese/English statuses with their status
+categories, resolution dates for finished work, story points, due dates...
+Generation is seeded, so the same arguments always give the same dataset.
+issue_changelog() gives an issue the status history `expand=changelog` returns.
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+
+PROJECTS = [
+    ('CUR', 'Cury'), ('MAN', 'Manutenção'), ('PROJ', 'Projetos'), ('FIN', 'Financeiro'),
+    ('APP', 'App Mobile'), ('POR', 'Portal do Cliente'), ('INT', 'Integrações'), ('BI', 'Business Intelligence'),
+]
+# (name, statusCategory key) - mix of Portuguese and English workflows
+STATUSES = [
+    ('Tarefas pendentes', 'new'), ('To Do', 'new'), ('Backlog', 'new'), ('Aberto', 'new'),
+    ('Em andamento', 'indeterminate'), ('In Progress', 'indeterminate'), ('Em desenvolvimento', 'indeterminate'),
+    ('Pronto para QA', 'indeterminate'), ('Homologação', 'indeterminate'), ('Teste Cury', 'indeterminate'),
+    ('Escalated', 'indeterminate'), ('Impedimento', 'indeterminate'),
+    ('Concluído', 'done'), ('Done', 'done'), ('Finalizado', 'done'), ('Resolvido', 'done'), ('Closed', 'done'),
+    ('Cancelado', 'done'),
+]
+STATUS_CATEGORY_NAMES = {'new': 'To Do', 'indeterminate': 'In Progress', 'done': 'Done'}
+ISSUE_TYPES = ['Bug', 'Story', 'Task', 'Sub-task', 'Epic', 'Bug Report', 'Melhoria']
+PRIORITIES = ['Highest', 'High', 'Medium', 'Low', 'Lowest']
+COMPONENTS = ['Financeiro', 'Cadastro', 'Relatórios', 'Autenticação', 'API', 'Frontend', 'Infra', 'Pagamentos']
+LABELS = ['CLI_Cury', 'CLI_Acme', 'CLI_Tenda', 'CLI_MRV', 'urgente', 'infra', 'ux', 'debito-tecnico', 'regulatorio']
+FIRST_NAMES = ['Ana', 'Bruno', 'Carla', 'Diego', 'Eduarda', 'Felipe', 'Gustavo', 'Helena', 'Igor', 'Juliana',
+               'Lucas', 'Mariana', 'Nicolas', 'Olivia', 'Pedro', 'Rafaela', 'Raphael', 'Sofia', 'Thiago', 'Vitória']
+LAST_NAMES = ['Silva', 'Souza', 'Oliveira', 'Santos', 'Lima', 'Pereira', 'Costa', 'Giovanini', 'Almeida', 'Rocha']
+STORY_POINTS = [None, 1, 2, 3, 5, 8, 13]
+JIRA_DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S.000-0300'
+# Path of an issue through the workflow before it reaches its current status
+WORKFLOW = ['To Do', 'Em andamento', 'Pronto para QA', 'Homologação']
+REWORK_RATE = 0.15  # Issues sent back from QA to development once
+
+
+def _fmt(dt):
+    return dt.strftime(JIRA_DATETIME_FORMAT)
+
+
+def _parse(value):
+    return datetime.strptime(value, JIRA_DATETIME_FORMAT)
+
+
+def generate_issues(n, seed=42, now=None, history_days=900, n_assignees=60, sprints_per_project=40):
+    """Return `n` raw issues (dicts with 'id', 'key' and 'fields'), newest first."""
+    rng = np.random.default_rng(seed)
+    now = now or datetime.now().replace(microsecond=0)
+    start = now - timedelta(days=history_days)
+
+    assignees = [f'{FIRST_NAMES[i % len(FIRST_NAMES)]} {LAST_NAMES[(i // len(FIRST_NAMES)) % len(LAST_NAMES)]}'
+                 for i in range(n_assignees)]
+
+    # Column-wise draws (cheap even for 1M issues); dicts are assembled afterwards
+    created_s = np.sort(rng.integers(0, history_days * 86400, n))
+    project_idx = rng.integers(0, len(PROJECTS), n)
+    # Older issues are more likely to be finished
+    age_frac = 1 - created_s / (history_days * 86400)
+    is_done = rng.random(n) < (0.35 + 0.6 * age_frac)
+    done_status = [i for i, (_, cat) in enumerate(STATUSES) if cat == 'done']
+    open_status = [i for i, (_, cat) in enumerate(STATUSES) if cat != 'done']
+    status_idx = np.where(is_done, rng.choice(done_status, n), rng.choice(open_status, n))
+    lead_s = (rng.gamma(1.5, 9, n) * 86400).astype(np.int64)
+    resolved_s = np.minimum(created_s + lead_s, history_days * 86400)
+    update_lag_s = (rng.exponential(5, n) * 86400).astype(np.int64)
+    updated_s = np.where(is_done, resolved_s, np.minimum(created_s + update_lag_s, history_days * 86400))
+    type_idx = rng.choice(len(ISSUE_TYPES), n, p=[0.25, 0.3, 0.25, 0.08, 0.02, 0.05, 0.05])
+    prio_idx = rng.choice(len(PRIORITIES), n, p=[0.05, 0.15, 0.55, 0.2, 0.05])
+    assignee_idx = rng.integers(-6, n_assignees, n)  # negatives -> unassigned (~10%)
+    sp_idx = rng.integers(0, len(STORY_POINTS), n)
+    sprint_num = np.where(rng.random(n) < 0.7, (created_s / (history_days * 86400) * sprints_per_project).astype(int) + 1, 0)
+    has_due = rng.random(n) < 0.5
+    due_days = rng.integers(5, 60, n)
+    comp_idx = rng.integers(-2, len(COMPONENTS), n)  # negatives -> no component
+    n_labels = rng.choice(3, n, p=[0.4, 0.45, 0.15])
+    estimate = rng.choice([0, 3600, 7200, 14400, 28800], n)
+    spent = (estimate * rng.random(n)).astype(int)
+
+    counters = {key: 0 for key, _ in PROJECTS}
+    issues = []
+    for i in range(n):
+        proj_key, proj_name = PROJECTS[project_idx[i]]
+        counters[proj_key] += 1
+        status_name, cat = STATUSES[status_idx[i]]
+        created = start + timedelta(seconds=int(created_s[i]))
+        resolved = start + timedelta(seconds=int(resolved_s[i])) if is_done[i] else None
+        updated = start + timedelta(seconds=int(updated_s[i]))
+        labels = list(rng.choice(LABELS, n_labels[i], replace=False)) if n_labels[i] else []
+
+        issues.append({
+            'id': str(10000 + i),
+            'key': f'{proj_key}-{counters[proj_key]}',
+            'fields': {
+                'summary': f'{ISSUE_TYPES[type_idx[i]]} {counters[proj_key]} em {proj_name}',
+                'assignee': {'displayName': assignees[assignee_idx[i]]} if assignee_idx[i] >= 0 else None,
+                'status': {'name': status_name,
+                           'statusCategory': {'key': cat, 'name': STATUS_CATEGORY_NAMES[cat]}},
+                'issuetype': {'name': ISSUE_TYPES[type_idx[i]]},
+                'priority': {'name': PRIORITIES[prio_idx[i]]},
+                'project': {'key': proj_key, 'name': proj_name},
+                'created': _fmt(created),
+                'updated': _fmt(updated),
+                'resolutiondate': _fmt(resolved) if resolved else None,
+                'duedate': (created + timedelta(days=int(due_days[i]))).strftime('%Y-%m-%d') if has_due[i] else None,
+                'customfield_10031': STORY_POINTS[sp_idx[i]],
+                'customfield_10020': [{'id': int(sprint_num[i]), 'name': f'{proj_key} Sprint {sprint_num[i]}',
+                                       'state': 'closed'}] if sprint_num[i] else None,
+                'timeoriginalestimate': int(estimate[i]) or None,
+                'timespent': int(spent[i]) or None,
+                'components': [{'name': COMPONENTS[comp_idx[i]]}] if comp_idx[i] >= 0 else [],
+                'labels': [str(l) for l in labels],
+            },
+        })
+    # Same order as the dashboard JQL (ORDER BY created DESC)
+    issues.reverse()
+    return issues
+
+
+def issue_changelog(issue):
+    """Status history of a generated issue, as changelog 'histories' (oldest first).
+
+    Issues still in a 'new' status never moved. The others were created in
+    'To Do', went through the first steps of WORKFLOW (sometimes back from QA
+    to development) and reached their current status at 'updated', the moves
+    spread between creation and that last one. Seeded by the issue id.
+    """
+    fields = issue['fields']
+    status = fields['status']['name']
+    if fields['status']['statusCategory']['key'] == 'new':
+        return []
+    rng = np.random.default_rng(int(issue['id']))
+    path = WORKFLOW[:1 + rng.integers(0, len(WORKFLOW))]
+    if len(path) >= 3 and rng.random() < REWORK_RATE:
+        path += WORKFLOW[1:3]
+    if path[-1] != status:
+        path.append(status)
+
+    created, updated = _parse(fields['created']), _parse(fields['updated'])
+    moves = len(path) - 1
+    offsets = np.r_[np.sort(rng.random(moves - 1)), 1.0] * (updated - created).total_seconds()
+    return [{
+        'id': f"{issue['id']}{i:03d}",
+        'author': fields['assignee'] if rng.random() < 0.8 else None,  # Else moved by an automation rule
+        'created': _fmt(created + timedelta(seconds=int(offset))),
+        'items': [{'field': 'status', 'fieldtype': 'jira', 'fromString': path[i], 'toString': path[i + 1]}]
+    } for i, offset in enumerate(offsets)]
@@ -0,0 +1,45 @@
+"""Aggregations behind the Streamlit tabs (app.py).
+
+The Streamlit script cannot be imported, so the computations its tabs run on
+the filtered issue frames live here: app.py calls them, and
+benchmarks/bench_pipeline.py times these same functions.
+"""
+import pandas as pd
+
+from periods import CUSTOM_PERIOD, period_range
+
+
+def with_derived_columns(df, done_statuses, today=None):
+    """`df` plus 'Atrasado' (open and past its due date) and 'Lead Time' (days from creation to resolution, 0 if open)."""
+    today = pd.Timestamp('today' if today is None else today).normalize()
+    return df.assign(
+        # Vectorized: missing due dates compare as False
+        Atrasado=~df['Status'].isin(done_statuses) & (df['Data Entrega'] < today),
+        **{'Lead Time': (df['Resolvido'] - df['Criado']).dt.days.fillna(0)}
+    )
+
+
+def sidebar_masks(index, selections, start_date, end_date):
+    """(creation period mask, dimension mask) of the sidebar filters, from the snapshot's FilterIndex."""
+    start, end = period_range(CUSTOM_PERIOD, start=start_date, end=end_date)  # [start, end + 1 day)
+    return index.mask(date_start=start, date_end=end), index.mask(selections)
+
+
+def status_grid(df):
+    """Issues per (Projeto, Status), projects in order and their statuses by count."""
+    return (df.groupby(['Projeto', 'Status'], observed=True).size().reset_index(name='Qtd')
+            .astype({'Projeto': str, 'Status': str})
+            .sort_values(['Projeto', 'Qtd'], ascending=[True, False], ignore_index=True))
+
+
+def assignee_load(df_active):
+    """Open issues and story points per assignee, lightest load first."""
+    load = df_active.groupby('Responsável', observed=True).agg({'Chave': 'count', 'Story Points': 'sum'}).reset_index()
+    load.columns = ['Responsável', 'Qtd Issues', 'Story Points']
+    return load.sort_values('Story Points', ascending=True)
+
+
+def delay_matrix(df_late):
+    """Late issues per Módulo (rows) x Status (columns)."""
+    counts = df_late.groupby(['Módulo', 'Status'], observed=True).size().reset_index(name='Qtd')
+    return counts.pivot(index='Módulo', columns='Status', values='Qtd').fillna(0)
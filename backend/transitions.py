@@ -0,0 +1,83 @@
+"""Compact store of issue status transitions, built from Jira changelogs.
+
+Sources with `changelog = true` (see sources.py) are searched with
+`expand=changelog`, so every sync brings the history of the issues it
+fetches: everything on a full sync, only the issues updated since the last
+one on a delta sync. Their status changes are kept as one event per row:
+
+    Fonte | Chave | De | Para | Data | Autor
+
+'De' and 'Para' share one dictionary of statuses; 'Fonte', 'Chave' and
+'Autor' are dictionary-encoded too (pandas categoricals, int codes), so an
+event costs a few bytes. Like the issue table, the store is upserted per
+issue (a re-fetched issue replaces all of its events) and persisted next to
+the snapshot (save_snapshot / load_snapshot), so flow analytics never need
+to download the history again.
+"""
+import pandas as pd
+
+from normalize import SOURCE_COLUMN, parse_jira_datetimes
+from sync import same_issues
+
+TRANSITION_COLUMNS = [SOURCE_COLUMN, 'Chave', 'De', 'Para', 'Data', 'Autor']
+UNKNOWN_AUTHOR = 'Automação'  # Transitions made by Jira itself (workflows, automation rules) have no author
+
+
+def status_transitions(raw_issues, source_name, tz=None):
+    """Transition table of the status changes in the changelogs of raw search issues.
+
+    Issues fetched without `expand=changelog` have no events.
+    """
+    keys, froms, tos, dates, authors = [], [], [], [], []
+    for raw in raw_issues:
+        for history in (raw.get('changelog') or {}).get('histories', []):
+            for item in history.get('items', []):
+                if item.get('field') == 'status':
+                    keys.append(raw['key'])
+                    froms.append(item.get('fromString'))
+                    tos.append(item.get('toString'))
+                    dates.append(history.get('created'))
+                    authors.append((history.get('author') or {}).get('displayName', UNKNOWN_AUTHOR))
+    return compact_transitions(pd.DataFrame({
+        SOURCE_COLUMN: [source_name] * len(keys),
+        'Chave': keys,
+        'De': froms,
+        'Para': tos,
+        'Data': parse_jira_datetimes(dates, tz),
+        'Autor': authors
+    }))
+
+
+def compact_transitions(table):
+    """`table` dictionary-encoded ('De'/'Para' on one shared status dictionary), ordered by issue and time.
+
+    Safe to call again after concat/filtering: dictionaries are rebuilt from the values still present.
+    """
+    table = table[TRANSITION_COLUMNS].copy()
+    statuses = pd.CategoricalDtype(sorted(set(table['De'].dropna().astype(str)) | set(table['Para'].dropna().astype(str))))
+    for col in ('De', 'Para'):
+        table[col] = table[col].astype(object).astype(statuses)
+    for col in (SOURCE_COLUMN, 'Chave', 'Autor'):
+        table[col] = table[col].astype(object).astype('category')
+    table['Data'] = table['Data'].astype('datetime64[ns]')
+    return table.sort_values([SOURCE_COLUMN, 'Chave', 'Data'], kind='stable', ignore_index=True)
+
+
+def empty_transitions():
+    return compact_transitions(pd.DataFrame({col: pd.Series(dtype='datetime64[ns]' if col == 'Data' else object)
+                                             for col in TRANSITION_COLUMNS}))
+
+
+def upsert_transitions(table, refetched, events):
+    """Replace the events of every issue of `refetched` (rows with 'Fonte' and 'Chave') by `events`."""
+    if table is None or table.empty:
+        return compact_transitions(pd.concat([empty_transitions(), *events], ignore_index=True))
+    kept = table[~same_issues(table, refetched)]
+    return compact_transitions(pd.concat([kept, *events], ignore_index=True))
+
+
+def prune_transitions(table, df):
+    """Events of the issues still in the issue table `df` (pruned or deleted issues leave the store)."""
+    if table.empty:
+        return table
+    return compact_transitions(table[same_issues(table, df)])
@@ -0,0 +1,137 @@
+"""Wire formats for dashboard payloads.
+
+The dashboard stages return DataFrames for their tabular sections; this
+module turns a dashboard dict into bytes in one of three media types:
+
+- RECORDS (application/json): one object per row, the original format.
+- COLUMNS (application/vnd.dashboard.columns+json): each table becomes
+  {column: [values]}, built from numpy arrays without per-row dicts.
+  Missing values are null, dates are ISO strings.
+- ARROW (application/vnd.apache.arrow.stream): an Arrow IPC stream with a
+  single row; every top-level section (kpis, the charts, daily_pulse,
+  raw_subset) is one column, tables as list<struct>.
+
+Bodies are compressed with brotli or gzip, as the client's Accept-Encoding
+allows.
+"""
+import gzip
+import json
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from fastapi.encoders import jsonable_encoder
+
+try:
+    import brotli
+except ImportError:  # Optional: without it only gzip is offered
+    brotli = None
+
+RECORDS = "application/json"
+COLUMNS = "application/vnd.dashboard.columns+json"
+ARROW = "application/vnd.apache.arrow.stream"
+FORMATS = {"records": RECORDS, "columns": COLUMNS, "arrow": ARROW}
+MIN_COMPRESS_SIZE = 1024
+
+
+def negotiate_format(accept=None, requested=None):
+    """Media type for an explicit `format` name, else the first supported type in Accept."""
+    if requested:
+        return FORMATS.get(requested, RECORDS)
+    for part in (accept or "").split(","):
+        media_type = part.split(";")[0].strip()
+        if media_type in (COLUMNS, ARROW):
+            return media_type
+    return RECORDS
+
+
+def _encode_sections(dashboard, convert):
+    # Tables go through `convert`, everything else through FastAPI's encoder
+    return {
+        key: _encode_sections(value, convert) if isinstance(value, dict)
+        else convert(value) if isinstance(value, pd.DataFrame)
+        else jsonable_encoder(value)
+        for key, value in dashboard.items()
+    }
+
+
+def _records(frame):
+    return jsonable_encoder(frame.astype(object).fillna('').to_dict(orient='records'))
+
+
+def _column_values(series):
+    missing = series.isna().to_numpy()
+    if series.dtype.kind == 'M':
+        values = np.datetime_as_string(series.to_numpy(dtype='datetime64[s]'), unit='s').astype(object)
+    elif series.dtype.kind in 'iub':
+        return series.to_numpy().tolist()
+    else:
+        values = series.to_numpy(dtype=object)
+    if missing.any():
+        values = values.copy()
+        values[missing] = None
+    return values.tolist()
+
+
+def _columns(frame):
+    # Plain Python lists: already JSON-ready, no per-value pass through jsonable_encoder
+    return {col: _column_values(frame[col]) for col in frame.columns}
+
+
+def encode_json(obj):
+    # Same encoding as FastAPI's JSONResponse
+    return json.dumps(obj, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def encode_records(dashboard):
+    return encode_json(_encode_sections(dashboard, _records))
+
+
+def encode_columns(dashboard):
+    return encode_json(_encode_sections(dashboard, _columns))
+
+
+def _list_of_structs(frame):
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    rows = pa.StructArray.from_arrays([col.combine_chunks() for col in table.columns], names=table.column_names)
+    return pa.ListArray.from_arrays(pa.array([0, len(frame)], pa.int32()), rows)
+
+
+def encode_arrow(dashboard):
+    sections = {**dashboard.get("charts", {}), **{k: v for k, v in dashboard.items() if k != "charts"}}
+    columns = {
+        name: _list_of_structs(value) if isinstance(value, pd.DataFrame) else pa.array([jsonable_encoder(value)])
+        for name, value in sections.items()
+    }
+    table = pa.table(columns)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+ENCODERS = {RECORDS: encode_records, COLUMNS: encode_columns, ARROW: encode_arrow}
+
+
+def accepted_encodings(accept_encoding):
+    return {part.split(";")[0].strip().lower() for part in (accept_encoding or "").split(",")}
+
+
+def choose_encoding(accept_encoding, size):
+    """Content-Encoding for a body of `size` bytes: 'br', 'gzip' or None."""
+    if size < MIN_COMPRESS_SIZE:
+        return None
+    encodings = accepted_encodings(accept_encoding)
+    if brotli is not None and "br" in encodings:
+        return "br"
+    if "gzip" in encodings:
+        return "gzip"
+    return None
+
+
+def compress(body, encoding):
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6)
+    return body
@@ -0,0 +1,73 @@
+"""Benchmark: isin/.dt.date filter masks (old app.py sidebar) vs the bitmap FilterIndex.
+
+Usage: python benchmarks/bench_filters.py [--sizes 10000 100000 500000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+from filter_index import DATE_COLUMNS, FILTER_DIMENSIONS, FilterIndex
+from issue_table import compact_issue_table
+from normalize import normalize_issues
+from synthetic import generate_issues
+
+
+def random_query(df, rnd):
+    selections = {}
+    for dim in FILTER_DIMENSIONS:
+        if dim not in df.columns:
+            continue
+        values = sorted(df[dim].dropna().unique())
+        # Mostly "everything selected" (the sidebar default), sometimes a subset
+        selections[dim] = values if rnd.random() < 0.5 else rnd.sample(values, max(1, len(values) // 3))
+    # Period of creation or of resolution (the API's date_field)
+    column = rnd.choice(DATE_COLUMNS)
+    start = df['Criado'].min() + pd.Timedelta(days=rnd.randint(0, 400))
+    end = start + pd.Timedelta(days=rnd.randint(1, 300))
+    return selections, column, start.normalize(), end.normalize()
+
+
+def isin_mask(df, selections, column, start, end):
+    mask = (df[column].dt.date >= start.date()) & (df[column].dt.date <= end.date())
+    for dim, values in selections.items():
+        mask &= df[dim].isin(values)
+    return mask.to_numpy()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 500_000])
+    parser.add_argument('--queries', type=int, default=20)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        df = compact_issue_table(normalize_issues(generate_issues(size)))
+        t0 = time.perf_counter()
+        index = FilterIndex(df)
+        build = time.perf_counter() - t0
+
+        rnd = random.Random(7)
+        queries = [random_query(df, rnd) for _ in range(args.queries)]
+        t_isin = t_index = 0.0
+        for selections, column, start, end in queries:
+            t0 = time.perf_counter()
+            expected = isin_mask(df, selections, column, start, end)
+            t_isin += time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            got = index.mask(selections, date_start=start, date_end=end + pd.Timedelta(days=1), date_column=column)
+            t_index += time.perf_counter() - t0
+            assert np.array_equal(expected, got)
+
+        print(f"{size:>8} issues: index build {build * 1000:8.1f} ms | per query: "
+              f"isin {t_isin / len(queries) * 1000:7.2f} ms, bitmap {t_index / len(queries) * 1000:7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark: full Jira ingestion path against the local mock server (no network).
+
+Starts backend/mock_jira.py in-process, then times the paginated fetch on
+the pooled async client (pages in flight 1 vs N) and the normalization of
+the fetched pages.
+
+Usage: python benchmarks/bench_ingestion.py [--issues 20000] [--latency-ms 100] [--error-rate 0]
+"""
+import argparse
+import os
+import socket
+import sys
+import threading
+import time
+
+import uvicorn
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+from jira_client import get_client
+from jira_fetch import fetch_all_issues
+from mock_jira import create_app
+from normalize import normalize_issues
+
+JQL = 'statusCategory != Done OR created >= -730d ORDER BY created DESC'
+FIELDS = "summary,assignee,status,created,project,customfield_10031,customfield_10020,duedate,priority,issuetype,resolutiondate,updated,timeoriginalestimate,timespent,components,labels"
+
+
+def start_mock(args):
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+    app = create_app(args.issues, latency_ms=args.latency_ms, error_rate=args.error_rate)
+    server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=port, log_level='warning'))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, f'http://127.0.0.1:{port}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--issues', type=int, default=20_000)
+    parser.add_argument('--latency-ms', type=int, default=100)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    print(f"Starting mock Jira with {args.issues} issues (latency {args.latency_ms}ms, 429 rate {args.error_rate})...")
+    server, url = start_mock(args)
+
+    client = get_client(url, 'bench', 'bench')
+    for workers in args.workers:
+        t0 = time.perf_counter()
+        raw = client.run(fetch_all_issues(client, JQL, FIELDS, max_concurrency=workers))
+        print(f"  async  inflight={workers:<2} {len(raw):>8} issues {time.perf_counter() - t0:8.2f}s")
+
+    t0 = time.perf_counter()
+    df = normalize_issues(raw)
+    print(f"  normalize           {len(df):>8} rows   {time.perf_counter() - t0:8.2f}s")
+    server.should_exit = True
+
+
+if __name__ == '__main__':
+    main()
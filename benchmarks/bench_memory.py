@@ -0,0 +1,57 @@
+"""Benchmark: memory of the cached issue table, plain strings vs compact categoricals.
+
+Usage: python benchmarks/bench_memory.py [--issues 200000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+import main as backend
+from issue_table import compact_issue_table
+from normalize import normalize_issues
+from synthetic import generate_issues
+
+
+def as_object_strings(df):
+    # What the table looks like with object-dtype strings (pandas < 3 default)
+    return df.astype({col: object for col in df.columns if df[col].dtype.kind in 'OU' or str(df[col].dtype) == 'str'})
+
+
+def mb(df):
+    return df.memory_usage(deep=True).sum() / 1024 / 1024
+
+
+def time_filters(df):
+    projects = list(df['Projeto'].unique())[:3]
+    statuses = list(df['Status'].unique())[:5]
+    t0 = time.perf_counter()
+    for _ in range(20):
+        mask = df['Projeto'].isin(projects) & df['Status'].isin(statuses)
+        df[mask].groupby(['Projeto', 'Status'], observed=True).size()
+    return (time.perf_counter() - t0) / 20 * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--issues', type=int, default=200_000)
+    args = parser.parse_args()
+
+    raw = generate_issues(args.issues)
+    tables = {'app (load_data_jira)': normalize_issues(raw), 'api (get_data)': backend.issues_to_dataframe(raw)}
+    del raw
+
+    print(f"{args.issues} issues")
+    for name, df in tables.items():
+        plain = as_object_strings(df)
+        compact = compact_issue_table(df)
+        print(f"  {name}")
+        print(f"    object strings: {mb(plain):8.1f} MB  filter+groupby {time_filters(plain):7.2f} ms")
+        print(f"    default dtypes: {mb(df):8.1f} MB  filter+groupby {time_filters(df):7.2f} ms")
+        print(f"    compact:        {mb(compact):8.1f} MB  filter+groupby {time_filters(compact):7.2f} ms"
+              f"  ({mb(plain) / mb(compact):.1f}x smaller than object strings)")
+
+
+if __name__ == '__main__':
+    main()
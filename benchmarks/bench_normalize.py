@@ -0,0 +1,104 @@
+"""Benchmark: per-issue Resource loop (old load_data_jira) vs bulk raw-JSON normalization.
+
+The legacy baseline needs the `jira` package, which the dashboard no longer
+depends on; without it only the bulk normalization is timed.
+
+Usage: python benchmarks/bench_normalize.py [--issues 50000]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+import pandas as pd
+
+try:
+    from jira.resources import Issue
+except ImportError:  # Optional: only the legacy baseline uses it
+    Issue = None
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+from normalize import ISSUE_COLUMNS, normalize_issues
+from synthetic import generate_issues
+
+JIRA_OPTIONS = {'server': 'http://localhost', 'rest_path': 'api', 'rest_api_version': '2', 'agile_rest_path': 'agile'}
+
+
+def legacy_normalize(issues):
+    # Copy of the original per-issue loop in app.py:load_data_jira
+    data = []
+    for issue in issues:
+        assignee = issue.fields.assignee.displayName if issue.fields.assignee else 'Não Atribuído'
+        story_points = getattr(issue.fields, 'customfield_10031', 0)
+        if story_points is None: story_points = 0
+        sprint_raw = getattr(issue.fields, 'customfield_10020', None)
+        sprint_name = 'Backlog'
+        if sprint_raw:
+            try:
+                sprint_data = sprint_raw[0]
+                if hasattr(sprint_data, 'name'):
+                    sprint_name = sprint_data.name
+                else:
+                    match = re.search(r'name=([^,]+)', str(sprint_data))
+                    if match:
+                        sprint_name = match.group(1)
+            except Exception:
+                pass
+        created = pd.to_datetime(issue.fields.created).replace(tzinfo=None) if issue.fields.created else None
+        duedate = pd.to_datetime(issue.fields.duedate).replace(tzinfo=None) if issue.fields.duedate else None
+        resolutiondate = pd.to_datetime(issue.fields.resolutiondate).replace(tzinfo=None) if issue.fields.resolutiondate else None
+        updated = pd.to_datetime(issue.fields.updated).replace(tzinfo=None) if issue.fields.updated else None
+        estimate = issue.fields.timeoriginalestimate if hasattr(issue.fields, 'timeoriginalestimate') and issue.fields.timeoriginalestimate else 0
+        spent = issue.fields.timespent if hasattr(issue.fields, 'timespent') and issue.fields.timespent else 0
+        components = [c.name for c in issue.fields.components] if hasattr(issue.fields, 'components') and issue.fields.components else []
+        module = components[0] if components else 'Geral'
+        labels = issue.fields.labels if hasattr(issue.fields, 'labels') and issue.fields.labels else []
+        client_tag = next((l for l in labels if l.startswith('CLI_')), 'Interno')
+        data.append({
+            'Chave': issue.key, 'Resumo': issue.fields.summary, 'Responsável': assignee,
+            'Status': issue.fields.status.name, 'Tipo': issue.fields.issuetype.name,
+            'Prioridade': issue.fields.priority.name if hasattr(issue.fields, 'priority') and issue.fields.priority else 'Medium',
+            'Projeto': issue.fields.project.name, 'Criado': created, 'Resolvido': resolutiondate,
+            'Data Entrega': duedate, 'Atualizado': updated, 'Story Points': story_points, 'Sprint': sprint_name,
+            'Estimativa (s)': estimate, 'Tempo Gasto (s)': spent, 'Módulo': module, 'Cliente': client_tag,
+            'Labels': labels
+        })
+    return pd.DataFrame(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--issues', type=int, default=50_000)
+    args = parser.parse_args()
+
+    raw = generate_issues(args.issues)
+
+    if Issue is None:
+        t0 = time.perf_counter()
+        new = normalize_issues(raw)
+        print(f"{args.issues} issues (jira package not installed: no legacy baseline)")
+        print(f"  bulk normalize_issues (raw JSON):                {time.perf_counter() - t0:8.2f}s")
+        return
+
+    t0 = time.perf_counter()
+    resources = [Issue(JIRA_OPTIONS, None, raw=r) for r in raw]
+    old = legacy_normalize(resources)
+    t_old = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    new = normalize_issues(raw)
+    t_new = time.perf_counter() - t0
+
+    assert list(new.columns) == ISSUE_COLUMNS == list(old.columns)
+    for col in ['Chave', 'Responsável', 'Status', 'Sprint', 'Módulo', 'Cliente', 'Criado', 'Resolvido', 'Atualizado', 'Data Entrega']:
+        pd.testing.assert_series_equal(old[col], new[col], check_dtype=False, check_names=False)
+
+    print(f"{args.issues} issues")
+    print(f"  legacy loop (Resources + per-issue to_datetime): {t_old:8.2f}s")
+    print(f"  bulk normalize_issues (raw JSON):                {t_new:8.2f}s")
+    print(f"  speedup: {t_old / t_new:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
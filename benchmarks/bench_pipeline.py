@@ -0,0 +1,222 @@
+"""Benchmark suite for the dashboard aggregation pipeline.
+
+Runs the stages of backend get_dashboard_data (the real functions from
+backend/main.py) and the tab computations of app.py (the functions it calls
+from backend/tab_metrics.py, since the Streamlit script cannot be imported)
+on synthetic datasets, reporting wall time and peak traced memory per stage.
+
+Results are saved as JSON so runs can be compared and used as a gate:
+
+    python benchmarks/bench_pipeline.py --sizes 10000 100000 500000 --output baseline.json
+    python benchmarks/bench_pipeline.py --sizes 10000 100000 --compare baseline.json --max-regression 0.2
+
+With --compare the exit code is 1 when any stage got slower than allowed.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, 'backend'))
+import main as backend
+from export import REPORT_COLUMNS, write_pdf, write_xlsx
+from filter_index import FilterIndex
+from flow_cube import DONE_STATUSES, FlowCube, burnup_points, monthly_velocity
+from issue_table import compact_issue_table
+from normalize import normalize_issues
+from status_flow import cumulative_flow, flow_window, status_intervals, time_in_status
+from synthetic import generate_issues, issue_changelog
+from tab_metrics import assignee_load, delay_matrix, sidebar_masks, status_grid, with_derived_columns
+from transitions import status_transitions
+import wire_format
+
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+# Differences below this are noise, whatever the ratio
+MIN_REGRESSION_SECONDS = 0.005
+
+
+# --- app.py tab computations (the functions app.py calls, from backend/tab_metrics.py) ---
+
+def app_sidebar_filters(df, index):
+    # Everything selected, over the whole creation range (the app's defaults)
+    selections = {col: sorted(df[col].unique()) for col in ['Cliente', 'Projeto', 'Módulo', 'Status', 'Tipo', 'Responsável']}
+    mask_date, mask_hierarchy = sidebar_masks(index, selections, df['Criado'].min().date(), df['Criado'].max().date())
+    return df[mask_date & mask_hierarchy], df[mask_hierarchy]
+
+
+def app_tab_overview(df_final, df_kanban):
+    return monthly_velocity(FlowCube(df_final, DONE_STATUSES).daily()), status_grid(df_kanban)
+
+
+def app_burnup(df_final):
+    # Worst case: filters the cube can't serve, so the flow is aggregated from df_final
+    return burnup_points(FlowCube(df_final, DONE_STATUSES).daily())
+
+
+def app_team_load(df_kanban):
+    return assignee_load(df_kanban[~df_kanban['Status'].isin(DONE_STATUSES)])
+
+
+def app_risk_heatmap(df_final):
+    return delay_matrix(df_final[df_final['Atrasado']])
+
+
+def app_export_excel(df_final, export_dir):
+    # On demand (download button click), streamed through the write-only workbook
+    return write_xlsx(df_final, np.arange(len(df_final)), list(df_final.columns),
+                      os.path.join(export_dir, f'bench-{len(df_final)}.xlsx'))
+
+
+def app_export_pdf(df_final, export_dir):
+    # Full report (summary + every row), built by the background report job
+    columns = [(col, width) for col, width in REPORT_COLUMNS if col in df_final.columns]
+    return write_pdf(df_final, np.arange(len(df_final)), columns, os.path.join(export_dir, f'bench-{len(df_final)}.pdf'))
+
+
+# --- Runner ---
+
+def measure(fn, *args, repeat=3):
+    """Best-of-`repeat` wall time, then one extra run under tracemalloc for peak memory."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    gc.collect()
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, best, peak / 1024 / 1024
+
+
+def build_stages(api_df, app_df, transitions, export_dir):
+    backend.CACHE["data"] = api_df  # Served snapshot: its filter index and flow cube are cached, as after a sync
+    filters = backend.FilterParams(projects=sorted(api_df['Projeto'].unique())[:5])
+    filtered = backend.apply_filters(api_df, filters)
+    app_df = with_derived_columns(app_df, DONE_STATUSES)
+    index = FilterIndex(app_df)  # Built once per data version by the app
+    df_final, df_kanban = app_sidebar_filters(app_df, index)
+
+    payload = backend.build_dashboard(filtered)
+    intervals = status_intervals(api_df, transitions)
+    start, end = flow_window()
+
+    return [
+        ('api.filters', backend.apply_filters, (api_df, filters)),
+        ('api.kpis', backend.compute_kpis, (filtered,)),
+        ('api.status_by_project', backend.compute_status_by_project, (filtered,)),
+        ('api.burnup', backend.compute_burnup, (filtered,)),
+        ('api.type_distribution', backend.compute_type_distribution, (filtered,)),
+        ('api.team_load', backend.compute_team_load, (filtered,)),
+        ('api.daily_pulse', backend.compute_daily_pulse, (filtered,)),
+        ('api.team_performance', backend.compute_team_performance,
+         (filtered, datetime.now().replace(hour=0, minute=0, second=0, microsecond=0))),
+        ('api.serialization', wire_format.encode_records, (payload,)),
+        ('api.serialization.columns', wire_format.encode_columns, (payload,)),
+        ('api.serialization.arrow', wire_format.encode_arrow, (payload,)),
+        ('api.flow.intervals', status_intervals, (api_df, transitions)),
+        ('api.flow.cfd', cumulative_flow, (intervals, start, end)),
+        ('api.flow.time_in_status', time_in_status, (intervals, start, end)),
+        ('app.derived_columns', with_derived_columns, (app_df, DONE_STATUSES)),
+        ('app.sidebar_filters', app_sidebar_filters, (app_df, index)),
+        ('app.tab_overview', app_tab_overview, (df_final, df_kanban)),
+        ('app.burnup', app_burnup, (df_final,)),
+        ('app.team_load', app_team_load, (df_kanban,)),
+        ('app.risk_heatmap', app_risk_heatmap, (df_final,)),
+        ('app.export_excel', app_export_excel, (df_final, export_dir)),
+        ('app.export_pdf', app_export_pdf, (df_final, export_dir)),
+    ]
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True).strip()
+    except Exception:
+        return None
+
+
+def compare(results, baseline_path, max_regression):
+    with open(baseline_path) as f:
+        baseline = {(r['size'], r['stage']): r for r in json.load(f)['results']}
+    failures = []
+    print(f"\nComparison with {baseline_path} (max regression {max_regression:.0%}):")
+    for r in results:
+        base = baseline.get((r['size'], r['stage']))
+        if not base:
+            continue
+        ratio = r['seconds'] / base['seconds'] if base['seconds'] else float('inf')
+        slower = r['seconds'] - base['seconds'] > MIN_REGRESSION_SECONDS and ratio > 1 + max_regression
+        flag = 'REGRESSION' if slower else ''
+        print(f"  {r['size']:>8} {r['stage']:<24} {base['seconds']:9.4f}s -> {r['seconds']:9.4f}s ({ratio:5.2f}x) {flag}")
+        if slower:
+            failures.append(r)
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 500_000])
+    parser.add_argument('--stages', nargs='*', help="Only run stages whose name starts with one of these prefixes")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help="Results JSON path (default: benchmarks/results/pipeline-<timestamp>.json)")
+    parser.add_argument('--compare', help="Baseline results JSON to compare against")
+    parser.add_argument('--max-regression', type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = []
+    # Exports go to a scratch directory, never into the app's export cache (.cache/exports)
+    export_dir = tempfile.mkdtemp(prefix='bench-exports-')
+    for size in args.sizes:
+        print(f"\n== {size} issues ==")
+        raw = generate_issues(size)
+        api_df = compact_issue_table(backend.issues_to_dataframe(raw))
+        app_df = compact_issue_table(normalize_issues(raw))
+        for issue in raw:
+            issue['changelog'] = {'histories': issue_changelog(issue)}
+        transitions = status_transitions(raw, backend.DEFAULT_SOURCE, tz=backend.TIMEZONE)
+        del raw
+
+        for name, fn, fn_args in build_stages(api_df, app_df, transitions, export_dir):
+            if args.stages and not any(name.startswith(p) for p in args.stages):
+                continue
+            _, seconds, peak_mb = measure(fn, *fn_args, repeat=args.repeat)
+            print(f"  {name:<26} {seconds:9.4f}s  peak {peak_mb:9.1f} MB")
+            results.append({'size': size, 'stage': name, 'seconds': seconds, 'peak_mb': peak_mb})
+    shutil.rmtree(export_dir, ignore_errors=True)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"pipeline-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({
+            'meta': {
+                'timestamp': datetime.now().isoformat(),
+                'git_revision': git_revision(),
+                'python': platform.python_version(),
+                'pandas': pd.__version__,
+                'platform': platform.platform(),
+            },
+            'results': results,
+        }, f, indent=2)
+    print(f"\nResults saved to {output}")
+
+    if args.compare and compare(results, args.compare, args.max_regression):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
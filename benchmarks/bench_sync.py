@@ -0,0 +1,72 @@
+"""Benchmark: delta sync (changed issues + upsert + prune) vs a full re-download, and their parity.
+
+Runs backend/mock_jira.py's JQL engine in-process (no HTTP). The previous
+store is what the window JQL returned `--days-since` days ago; the delta is
+what build_delta_jql() selects now. Upserting the delta and pruning it with
+sync.prune_window() must leave exactly the rows the full-sync JQL returns
+now: the check fails if the prune and the JQL disagree on what 'done' is.
+
+Usage: python benchmarks/bench_sync.py [--issues 50000] [--days-since 30]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+import main as backend
+from issue_table import compact_issue_table
+from mock_jira import IssueStore, search
+from sync import SYNC_WINDOW_DAYS, build_delta_jql, prune_window, upsert_issues
+from synthetic import generate_issues
+
+
+def fetch(store, jql):
+    return [store.issues[i] for i in search(store, jql)]
+
+
+def by_key(df):
+    return df.sort_values('Chave', ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--issues', type=int, default=50_000)
+    parser.add_argument('--days-since', type=int, default=30)
+    args = parser.parse_args()
+
+    store = IssueStore(generate_issues(args.issues))
+    now = datetime.now()
+    last_sync = now - timedelta(days=args.days_since)
+    # Relative dates are evaluated now by the mock: the window's cutoff as of the last sync
+    previous_jql = f'statusCategory != Done OR created >= -{SYNC_WINDOW_DAYS + args.days_since}d ORDER BY created DESC'
+    previous = compact_issue_table(backend.issues_to_dataframe(fetch(store, previous_jql)))
+
+    t0 = time.perf_counter()
+    full = compact_issue_table(backend.issues_to_dataframe(fetch(store, f"{backend.BASE_JQL} ORDER BY created DESC")))
+    t_full = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    changed = backend.issues_to_dataframe(fetch(store, build_delta_jql(last_sync, now)))
+    upserted = upsert_issues(previous, changed)
+    delta = compact_issue_table(prune_window(upserted, now))
+    t_delta = time.perf_counter() - t0
+
+    # What pruning on the dashboard's done statuses would have kept
+    cutoff = now - timedelta(days=SYNC_WINDOW_DAYS)
+    by_done_list = ((upserted['Status_Category'] != 'Done') | (upserted['Criado'] >= cutoff)).sum()
+
+    pd.testing.assert_frame_equal(by_key(delta), by_key(full), check_categorical=False)
+
+    print(f"{args.issues} issues, last synced {args.days_since} days ago")
+    print(f"  full window:               {len(full):>8} rows  {t_full:8.2f}s")
+    print(f"  delta + upsert + prune:    {len(delta):>8} rows  {t_delta:8.2f}s  ({len(changed)} changed)")
+    print(f"  pruned on the done list:   {by_done_list:>8} rows  ({by_done_list - len(full)} stale)")
+    print("  delta store matches the full sync")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,29 +1,39 @@
 import streamlit as st
-from jira import JIRA
 import pandas as pd
 import toml
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+from jira_client import get_client
+from jira_fetch import fetch_all_issues
 
 # Load secrets directly since we are running a standalone script
-secrets = toml.load(".streamlit/secrets.toml")
+# (JIRA_URL/JIRA_USERNAME/JIRA_TOKEN env vars take precedence, e.g. for backend/mock_jira.py)
+if os.environ.get("JIRA_URL"):
+    secrets = {"jira": {"url": os.environ["JIRA_URL"], "username": os.environ.get("JIRA_USERNAME", ""), "token": os.environ.get("JIRA_TOKEN", "")}}
+else:
+    secrets = toml.load(".streamlit/secrets.toml")
 
 def get_jira_counts():
     try:
-        jira = JIRA(server=secrets["jira"]["url"], basic_auth=(secrets["jira"]["username"], secrets["jira"]["token"]))
+        jira = get_client(**secrets["jira"])
         
         # Search for all issues in relevant projects (or all projects)
         jql = 'created >= -730d OR statusCategory != Done' 
         print(f"Executing JQL: {jql}")
         
-        # Try fetching ALL issues using maxResults=0
-        issues = jira.search_issues(jql, maxResults=0, fields="status,summary,project")
+        # Server-side count first, then every page concurrently on the pooled client
+        print(f"Total issues reported by Jira: {jira.run(jira.count(jql))}")
+        issues = jira.run(fetch_all_issues(jira, jql, "status,summary,project"))
         
         print(f"Total issues fetched: {len(issues)}")
         
         # Count by Project and Status
         project_status_counts = {}
         for issue in issues:
-            proj_name = issue.fields.project.name
-            status = issue.fields.status.name
+            proj_name = issue['fields']['project']['name']
+            status = issue['fields']['status']['name']
             
             if proj_name not in project_status_counts:
                 project_status_counts[proj_name] = {}
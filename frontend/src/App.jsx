@@ -1,26 +1,45 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { getFilters, getDashboardData } from './lib/api';
 import Sidebar from './components/Sidebar';
 import Dashboard from './components/Dashboard';
 import { Loader2 } from 'lucide-react';
 
+// Re-check the dashboard this often; between Jira syncs the API answers 304 (no body)
+const POLL_INTERVAL_MS = 60 * 1000;
+
+// Snapshot age sent by the API ("há 3 min")
+const formatAge = (seconds) => {
+  if (seconds == null) return '';
+  if (seconds < 60) return 'agora';
+  if (seconds < 3600) return `há ${Math.floor(seconds / 60)} min`;
+  return `há ${Math.floor(seconds / 3600)} h`;
+};
+
 function App() {
   const [loading, setLoading] = useState(true);
   const [availableFilters, setAvailableFilters] = useState({
     projects: [],
     statuses: [],
     types: [],
-    assignees: []
+    assignees: [],
+    sources: [],
+    periods: []
   });
   
   const [selectedFilters, setSelectedFilters] = useState({
     projects: [],
     statuses: [],
     types: [],
-    period: "Tudo"
+    sources: [],
+    period: "Tudo",
+    start_date: null, // "Personalizado" range (YYYY-MM-DD, both days included)
+    end_date: null,
+    date_field: "created" // Period of creation, or "resolved" (delivered in the period)
   });
 
   const [dashboardData, setDashboardData] = useState(null);
+  const [snapshot, setSnapshot] = useState(null);
+  const etagRef = useRef(null);
 
   // Load initial filters
   useEffect(() => {
@@ -35,21 +54,30 @@ function App() {
     fetchFilters();
   }, []);
 
-  // Load dashboard data when filters change
-  const fetchData = async (forceRefresh = false) => {
-    setLoading(true);
+  // Load dashboard data when filters change (`background` polls without the loading overlay)
+  const fetchData = async (forceRefresh = false, background = false) => {
+    if (!background) setLoading(true);
     try {
-      const data = await getDashboardData({ ...selectedFilters, force_refresh: forceRefresh });
-      setDashboardData(data);
+      const result = await getDashboardData(
+        { ...selectedFilters, force_refresh: forceRefresh },
+        background ? etagRef.current : null
+      );
+      if (result.data) {
+        setDashboardData(result.data);
+        etagRef.current = result.etag;
+      }
+      setSnapshot(result.snapshot);
     } catch (error) {
       console.error("Error fetching dashboard data:", error);
     } finally {
-      setLoading(false);
+      if (!background) setLoading(false);
     }
   };
 
   useEffect(() => {
     fetchData();
+    const timer = setInterval(() => fetchData(false, true), POLL_INTERVAL_MS);
+    return () => clearInterval(timer);
   }, [selectedFilters]);
 
   const handleRefresh = () => {
@@ -80,8 +108,15 @@ function App() {
             <h1 className="text-3xl font-bold text-slate-800 tracking-tight">FFID Dashboard</h1>
             <p className="text-slate-500 mt-1">Visão estratégica e operacional do portfólio</p>
           </div>
-          <div className="text-sm text-slate-400">
-            Atualizado em: {new Date().toLocaleTimeString()}
+          <div className="text-sm text-slate-400 text-right">
+            {snapshot?.last_updated ? (
+              <>Dados de: {new Date(snapshot.last_updated).toLocaleTimeString()} ({formatAge(snapshot.age_seconds)})</>
+            ) : (
+              'Aguardando sincronização'
+            )}
+            {snapshot?.refreshing && (
+              <div className="text-xs text-blue-500">Sincronizando com o Jira...</div>
+            )}
           </div>
         </header>
 
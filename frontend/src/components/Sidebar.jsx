@@ -61,6 +61,76 @@ const Sidebar = ({ availableFilters, selectedFilters, onFilterChange, onRefresh
           Filtros Globais
         </div>
 
+        {/* Period Filter (presets resolved by the API, same as the Streamlit sidebar) */}
+        <div className="mb-6">
+          <label className="block text-sm font-medium text-slate-700 mb-2">Período de Análise</label>
+          <select 
+            className="w-full p-2 border border-slate-200 rounded-lg text-sm focus:ring-2 focus:ring-blue-500 focus:border-blue-500 outline-none bg-slate-50 text-slate-600"
+            value={selectedFilters.period}
+            onChange={(e) => onFilterChange('period', e.target.value)}
+          >
+            {(availableFilters.periods?.length ? availableFilters.periods : ['Tudo']).map(p => (
+              <option key={p} value={p}>{p}</option>
+            ))}
+          </select>
+          {selectedFilters.period === 'Personalizado' && (
+            <div className="grid grid-cols-2 gap-2 mt-2">
+              <input 
+                type="date" 
+                className="p-2 border border-slate-200 rounded-lg text-sm bg-slate-50 text-slate-600"
+                value={selectedFilters.start_date || ''}
+                onChange={(e) => onFilterChange('start_date', e.target.value || null)}
+              />
+              <input 
+                type="date" 
+                className="p-2 border border-slate-200 rounded-lg text-sm bg-slate-50 text-slate-600"
+                value={selectedFilters.end_date || ''}
+                onChange={(e) => onFilterChange('end_date', e.target.value || null)}
+              />
+            </div>
+          )}
+          {selectedFilters.period !== 'Tudo' && (
+            <div className="flex gap-4 mt-2">
+              {[['created', 'Criadas'], ['resolved', 'Resolvidas']].map(([field, label]) => (
+                <label key={field} className="flex items-center gap-2 text-sm text-slate-600 cursor-pointer hover:text-slate-900">
+                  <input 
+                    type="radio" 
+                    className="border-slate-300 text-blue-600 focus:ring-blue-500"
+                    checked={selectedFilters.date_field === field}
+                    onChange={() => onFilterChange('date_field', field)}
+                  />
+                  {label}
+                </label>
+              ))}
+            </div>
+          )}
+        </div>
+
+        {/* Source Filter (only with more than one Jira instance) */}
+        {availableFilters.sources?.length > 1 && (
+          <div className="mb-6">
+            <label className="block text-sm font-medium text-slate-700 mb-2">Fonte Jira</label>
+            <div className="space-y-2">
+              {availableFilters.sources.map(source => (
+                <label key={source} className="flex items-center gap-2 text-sm text-slate-600 cursor-pointer hover:text-slate-900">
+                  <input 
+                    type="checkbox" 
+                    className="rounded border-slate-300 text-blue-600 focus:ring-blue-500"
+                    checked={selectedFilters.sources.includes(source)}
+                    onChange={(e) => {
+                      const newSources = e.target.checked 
+                        ? [...selectedFilters.sources, source]
+                        : selectedFilters.sources.filter(s => s !== source);
+                      onFilterChange('sources', newSources);
+                    }}
+                  />
+                  {source}
+                </label>
+              ))}
+            </div>
+          </div>
+        )}
+
         {/* Project Filter */}
         <div className="mb-6">
           <label className="block text-sm font-medium text-slate-700 mb-2">Projetos</label>
@@ -9,9 +9,41 @@ export const getFilters = async () => {
     return response.data;
 };
 
-export const getDashboardData = async (filters) => {
-    const response = await api.post('/dashboard', filters);
-    return response.data;
+// Snapshot freshness travels in headers too, so a 304 (no body) still updates it
+const snapshotFromHeaders = (headers) => ({
+    last_updated: headers['x-snapshot-updated'] || null,
+    age_seconds: headers['x-snapshot-age'] ? Number(headers['x-snapshot-age']) : null,
+    refreshing: headers['x-snapshot-refreshing'] === 'true'
+});
+
+// The dashboard is requested in the columnar format ({column: [values]} per table, smaller
+// and much cheaper for the API to encode); the components still get one object per row
+const COLUMNS_FORMAT = 'application/vnd.dashboard.columns+json';
+
+const columnsToRecords = (columns) => {
+    const keys = Object.keys(columns);
+    const length = keys.length ? columns[keys[0]].length : 0;
+    return Array.from({ length }, (_, i) => Object.fromEntries(keys.map((key) => [key, columns[key][i]])));
+};
+
+const fromColumns = (data) => ({
+    ...data,
+    charts: Object.fromEntries(Object.entries(data.charts).map(([name, table]) => [name, columnsToRecords(table)])),
+    raw_subset: columnsToRecords(data.raw_subset)
+});
+
+// Pass the ETag of the dashboard you already have: if nothing changed the API answers
+// 304 and `data` is null
+export const getDashboardData = async (filters, etag = null) => {
+    const response = await api.post('/dashboard', filters, {
+        headers: { Accept: COLUMNS_FORMAT, ...(etag ? { 'If-None-Match': etag } : {}) },
+        validateStatus: (status) => (status >= 200 && status < 300) || status === 304
+    });
+    return {
+        data: response.status === 304 ? null : fromColumns(response.data),
+        etag: response.headers['etag'] || null,
+        snapshot: snapshotFromHeaders(response.headers)
+    };
 };
 
 export default api;
\ No newline at end of file